@@ -0,0 +1,65 @@
+"""IVF tabanlı yaklaşık arama ile tüm korpus üzerinde kaba kuvvet cosine_similarity karşılaştırması.
+
+Her n_probe değeri için recall@N ve sorgu başına gecikmeyi raporlar.
+
+Kullanım: python benchmarks/bench_ann.py --size 100000 --probes 1 2 4 8 16 32
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import synthetic_texts
+from x import AIAssistant, SimilarityIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--probes', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    texts = list(synthetic_texts(args.size, seed=args.size))
+    index = SimilarityIndex(AIAssistant().stop_words, ann_min_articles=0, ann_background=False)
+    tf = index.vectorize(texts)
+    index.add_many(None, list(zip(range(1, args.size + 1), texts)))
+
+    started = time.perf_counter()
+    ann = index.build_ann()
+    print(f'{args.size} makale, {len(ann.centroids)} küme, IVF kurulumu {time.perf_counter() - started:.1f}s')
+
+    weighted = index.weigh(tf)
+    rng = np.random.default_rng(1)
+    picks = rng.choice(args.size, size=args.queries, replace=False)
+
+    truth, brute = [], []
+    for i in picks:
+        started = time.perf_counter()
+        scores = cosine_similarity(weighted[i], weighted).ravel()
+        scores[i] = -1.0
+        top = np.argpartition(-scores, args.top_n)[:args.top_n]
+        brute.append(time.perf_counter() - started)
+        truth.append({int(j) + 1 for j in top})
+    print(f'kaba kuvvet cosine_similarity   : p50={np.median(brute) * 1000:7.2f}ms  recall=1.000')
+
+    for n_probe in args.probes:
+        latencies, recalls = [], []
+        for i, expected in zip(picks, truth):
+            started = time.perf_counter()
+            found = index.search(tf[i], args.top_n, min_score=-1.0, exclude=(int(i) + 1,), n_probe=n_probe)
+            latencies.append(time.perf_counter() - started)
+            recalls.append(len(expected & {article_id for article_id, _ in found}) / args.top_n)
+        print(f'IVF n_probe={n_probe:<3}               : p50={np.median(latencies) * 1000:7.2f}ms  '
+              f'recall={np.mean(recalls):.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""WSGI ve ASGI sunum modlarının yük testi: saniyedeki istek ve p50/p99 gecikme.
+
+Geçici bir veritabanı kurulur ve her mod ayrı bir süreçte tek işçiyle başlatılır:
+WSGI için gunicorn (gthread, --threads iş parçacığı; yüklü değilse werkzeug'un
+çok iş parçacıklı sunucusu), ASGI için uvicorn ile x:asgi_app. --clients
+istemci kalıcı bağlantılarla okuma ve yazma rotalarını (ana sayfa, makale
+listesi, arama, profil, beğeni, yorum) çağırırken --ai-clients istemci uzun
+metinlerle /api/summarize gönderir; böylece yavaş yapay zekâ isteklerinin diğer
+rotalara etkisi de ölçülür. Yük üreteci yalnızca standart kütüphaneyi kullanır.
+
+Kullanım: python benchmarks/bench_asgi.py --clients 32 --ai-clients 4 --seconds 10
+"""
+
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import synthetic_texts
+from werkzeug.security import generate_password_hash
+import x
+
+SERVER = '''
+import sys
+import x
+mode, database, port, threads = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+x.app.config['DATABASE'] = database
+if mode == 'ASGI':
+    import uvicorn
+    uvicorn.run(x.asgi_app, host='127.0.0.1', port=port, log_level='warning')
+else:
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        import logging
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        make_server('127.0.0.1', port, x.app, threaded=True).serve_forever()
+    else:
+        class Server(BaseApplication):
+            def load_config(self):
+                for key, value in {'bind': f'127.0.0.1:{port}', 'workers': 1, 'worker_class': 'gthread',
+                                   'threads': threads, 'loglevel': 'warning'}.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                return x.app
+
+        Server().run()
+'''
+
+ROUTES = [
+    ('GET /', 'GET', '/', None),
+    ('GET /articles', 'GET', '/articles', None),
+    ('GET /articles?search', 'GET', '/articles?search=uzay', None),
+    ('GET /profile', 'GET', '/profile/bench', None),
+    ('POST like', 'POST', '/article/{article}/like', None),
+    ('POST comment', 'POST', '/article/{article}/comment', urllib.parse.urlencode({'content': 'Yük testi yorumu'})),
+]
+
+
+def setup_database(articles):
+    database = os.path.join(tempfile.mkdtemp(), 'bench_asgi.db')
+    x.app.config['DATABASE'] = database
+    x.init_db()
+    with x.get_pool().connection() as db:
+        db.execute("INSERT INTO users (username, email, password, user_type) VALUES ('bench', 'b@example.com', ?, 'yazar')",
+                   (generate_password_hash('bench'),))
+        db.executemany('INSERT INTO articles (title, content, author_id, category_id) VALUES (?, ?, 1, ?)',
+                       ((f'Makale {i}', text, i % 5 + 1) for i, text in enumerate(synthetic_texts(articles, seed=1))))
+        x.index_articles_fts(db)
+        x.refresh_rankings(db)
+        db.commit()
+    x.close_pool()
+    return database
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, database, threads):
+    port = free_port()
+    process = subprocess.Popen([sys.executable, '-c', SERVER, mode, database, str(port), str(threads)], cwd=ROOT)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process, port
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError(f'{mode} sunucusu başlatılamadı')
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'{mode} sunucusu {port} portunda yanıt vermedi')
+
+
+def login(port):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request('POST', '/login', body=urllib.parse.urlencode({'username': 'bench', 'password': 'bench'}),
+                 headers={'Content-Type': 'application/x-www-form-urlencoded'})
+    response = conn.getresponse()
+    response.read()
+    conn.close()
+    return response.getheader('Set-Cookie').split(';', 1)[0]
+
+
+def client(port, cookie, deadline, articles, seed, samples, ai_text=None):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+    sent = 0
+    while time.monotonic() < deadline:
+        if ai_text:
+            name, method, path = 'POST /api/summarize', 'POST', '/api/summarize'
+            body = json.dumps({'text': f'{ai_text} {seed} {sent}.'})
+            headers = {'Cookie': cookie, 'Content-Type': 'application/json'}
+        else:
+            name, method, path, body = rng.choice(ROUTES)
+            path = path.format(article=rng.randint(1, articles))
+            headers = {'Cookie': cookie}
+            if body:
+                headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        started = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+            ok = False
+        samples.append((name, time.perf_counter() - started, ok))
+        sent += 1
+    conn.close()
+
+
+def run(mode, database, ai_text, args):
+    process, port = start_server(mode, database, args.threads)
+    try:
+        cookie = login(port)
+        deadline = time.monotonic() + args.seconds
+        samples = []
+        threads = [threading.Thread(target=client, args=(port, cookie, deadline, args.articles, i, samples))
+                   for i in range(args.clients)]
+        threads += [threading.Thread(target=client, args=(port, cookie, deadline, args.articles, 1000 + i, samples, ai_text))
+                    for i in range(args.ai_clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        process.terminate()
+        process.wait()
+
+    groups = {'okuma/yazma': [s for s in samples if s[0] != 'POST /api/summarize'],
+              '/api/summarize': [s for s in samples if s[0] == 'POST /api/summarize']}
+    for group, rows in groups.items():
+        if not rows:
+            continue
+        latencies = np.array([latency for _, latency, _ in rows]) * 1000
+        errors = sum(1 for _, _, ok in rows if not ok)
+        print(f'{mode:>4} {group:<15} {len(rows) / args.seconds:8.1f} istek/sn  p50={np.percentile(latencies, 50):8.1f}ms  '
+              f'p99={np.percentile(latencies, 99):8.1f}ms  hata={errors}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--ai-clients', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--ai-words', type=int, default=20000, help='/api/summarize metninin kelime sayısı')
+    parser.add_argument('--threads', type=int, default=8, help='WSGI işçisinin iş parçacığı sayısı')
+    parser.add_argument('--modes', nargs='+', default=['WSGI', 'ASGI'], choices=['WSGI', 'ASGI'])
+    args = parser.parse_args()
+
+    database = setup_database(args.articles)
+    words = next(synthetic_texts(1, mean_words=args.ai_words, seed=2)).split()
+    ai_text = ' '.join(word + ('.' if i % 12 == 11 else '') for i, word in enumerate(words))
+    for mode in args.modes:
+        if mode == 'ASGI' and importlib.util.find_spec('uvicorn') is None:
+            print('ASGI: uvicorn yüklü değil, atlandı (pip install uvicorn)')
+            continue
+        run(mode, database, ai_text, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Tek belgelik /api/summarize ve /api/suggest_category çağrıları ile toplu uç noktaların karşılaştırması.
+
+Aynı belgeler önce tek tek, sonra tek bir toplu istekle (JSON ve NDJSON)
+gönderilir. Önbellek isabetleri ölçümü bozmasın diye her ölçümden önce AI
+önbelleği temizlenir.
+
+Kullanım: python benchmarks/bench_batch_api.py --documents 100 --words 300
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import synthetic_texts
+import x
+
+
+def documents(n, words, seed=0):
+    """Her 12 kelimede bir noktalı cümlelerden oluşan sentetik belgeler"""
+    texts = []
+    for text in synthetic_texts(n, mean_words=words, seed=seed):
+        tokens = text.split()
+        texts.append(' '.join(token + ('.' if i % 12 == 11 else '') for i, token in enumerate(tokens)))
+    return texts
+
+
+def timed(fn):
+    x.ai_assistant.memo.clear()
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--documents', type=int, default=100)
+    parser.add_argument('--words', type=int, default=300)
+    parser.add_argument('--engines', nargs='+', default=['tfidf', 'textrank'])
+    args = parser.parse_args()
+
+    x.app.config['DATABASE'] = os.path.join(tempfile.mkdtemp(), 'bench_batch_api.db')
+    x.app.config['AI_BATCH_MAX_DOCUMENTS'] = max(args.documents, x.app.config['AI_BATCH_MAX_DOCUMENTS'])
+    x.app.config['AI_BATCH_MAX_BYTES'] = 1024 ** 3
+    x.init_db()
+    with x.get_pool().connection() as db:
+        db.execute("INSERT INTO users (username, email, password, user_type) VALUES ('bench', 'b@example.com', '-', 'yazar')")
+        db.commit()
+    client = x.app.test_client()
+    with client.session_transaction() as sess:
+        sess.update(user_id=1, username='bench', user_type='yazar')
+
+    texts = documents(args.documents, args.words)
+    items = [{'title': f'Belge {i}', 'content': text} for i, text in enumerate(texts)]
+    client.post('/api/summarize/batch', json={'documents': texts[:2]})
+
+    print(f'{len(texts)} belge, ortalama {sum(map(len, texts)) / len(texts):,.0f} karakter')
+    for engine in args.engines:
+        single = timed(lambda: [client.post('/api/summarize', json={'text': text, 'engine': engine}) for text in texts])
+        batch = timed(lambda: client.post('/api/summarize/batch', json={'documents': texts, 'engine': engine}))
+        stream = timed(lambda: client.post('/api/summarize/batch',
+                                           json={'documents': texts, 'engine': engine, 'stream': True}).get_data())
+        print(f'özet {engine:>9}: tek tek {single:7.1f}ms  toplu {batch:7.1f}ms  NDJSON {stream:7.1f}ms')
+    single = timed(lambda: [client.post('/api/suggest_category', json=item) for item in items])
+    batch = timed(lambda: client.post('/api/suggest_category/batch', json={'documents': items}))
+    print(f"kategori ({x.app.config['CATEGORY_ENGINE']}): tek tek {single:7.1f}ms  toplu {batch:7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""suggest_category: eski alt dize taraması ile derlenmiş KeywordMatcher karşılaştırması.
+
+Uzun kitap bölümleri (varsayılan ~150 bin karakter) üretir, içlerine kategori
+anahtar kelimelerini ekli biçimleriyle serpiştirir ve iki yolu aynı metinlerle
+ölçer. Eski yol, kaldırılan koddaki str.lower + her anahtar kelime için `in`
+döngüsüdür. --extra-keywords kategori tablosunun büyüdüğü durumu canlandırmak
+için varsayılan listeye sentetik anahtar kelimeler ekler.
+
+Kullanım: python benchmarks/bench_categorize.py --chapters 50 --extra-keywords 0 200 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import synthetic_texts, vocabulary
+from x import DEFAULT_CATEGORY_KEYWORDS, KeywordMatcher
+
+SUFFIXES = ['', 'lar', 'ları', 'ın', 'da', 'dan', 'ı']
+
+
+def legacy_suggest_category(keywords, title, content):
+    text = (title + ' ' + content).lower()
+    scores = {}
+    for category, words in keywords.items():
+        score = sum(1 for word in words if word in text)
+        if score > 0:
+            scores[category] = score
+    if scores:
+        return max(scores, key=scores.get)
+    return 'Diğer'
+
+
+def chapters(n, words, seed):
+    rng = np.random.default_rng(seed)
+    keywords = [word for words in DEFAULT_CATEGORY_KEYWORDS.values() for word in words]
+    for text in synthetic_texts(n, mean_words=words, seed=seed):
+        tokens = text.split()
+        for position in rng.choice(len(tokens), size=min(len(tokens), 40), replace=False):
+            tokens[position] = keywords[rng.integers(len(keywords))] + SUFFIXES[rng.integers(len(SUFFIXES))]
+        yield ' '.join(tokens)
+
+
+def keyword_table(extra, seed=0):
+    """Varsayılan tabloya sentetik kategoriler ve bölümlerde geçmeyen anahtar kelimeler ekle"""
+    keywords = {category: list(words) for category, words in DEFAULT_CATEGORY_KEYWORDS.items()}
+    rng = np.random.default_rng(seed)
+    words = rng.choice(vocabulary(max(5000, 2 * extra), seed=seed + 1), size=extra, replace=False)
+    for i, word in enumerate(words):
+        keywords.setdefault(f'Sentetik {i % 50}', []).append(f'{word}q')
+    return keywords
+
+
+def timed(fn, texts):
+    samples = []
+    for text in texts:
+        started = time.perf_counter()
+        fn('', text)
+        samples.append(time.perf_counter() - started)
+    return np.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--chapters', type=int, default=50)
+    parser.add_argument('--words', type=int, default=20000)
+    parser.add_argument('--extra-keywords', type=int, nargs='+', default=[0, 200, 1000])
+    args = parser.parse_args()
+
+    texts = list(chapters(args.chapters, args.words, seed=7))
+    print(f'{len(texts)} bölüm, ortalama {np.mean([len(t) for t in texts]):,.0f} karakter')
+    for extra in args.extra_keywords:
+        keywords = keyword_table(extra)
+        started = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        def legacy(title, content):
+            return legacy_suggest_category(keywords, title, content)
+
+        def compiled(title, content):
+            return matcher.best(title + ' ' + content, default='Diğer')
+
+        agree = np.mean([legacy('', t) == compiled('', t) for t in texts])
+        print(f'{sum(len(w) for w in keywords.values()):>5} anahtar kelime: '
+              f'alt dize p50={timed(legacy, texts):7.2f}ms  '
+              f'KeywordMatcher p50={timed(compiled, texts):6.2f}ms '
+              f'(derleme {compile_ms:.1f}ms)  aynı kategori %{agree * 100:.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Eşzamanlı okuyucuların yazıcı tarafından bloklanıp bloklanmadığını ölçen yük testi.
+
+Eski ayarlar (rollback journal, synchronous=FULL) ile varsayılan WAL + synchronous=NORMAL
+ayarlarını aynı iş yüküyle karşılaştırır: gunicorn işçileri gibi ayrı süreçlerdeki okuyucular
+ana sayfa akışını sorgularken tek bir yazıcı süreci sürekli toplu ekleme işlemleri yapar.
+
+Kullanım: python benchmarks/bench_concurrency.py --readers 8 --seconds 5
+"""
+
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import x
+
+MODES = {
+    'rollback journal': {'DB_JOURNAL_MODE': 'DELETE', 'DB_SYNCHRONOUS': 'FULL'},
+    'WAL': {'DB_JOURNAL_MODE': 'WAL', 'DB_SYNCHRONOUS': 'NORMAL'},
+}
+
+
+def reader(stop, results):
+    x.close_pool()
+    samples, errors = [], 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with x.get_pool().connection() as db:
+                x.query_feed(db, 'new', limit=5)
+                x.query_feed(db, 'popular', limit=5)
+        except sqlite3.OperationalError:
+            errors += 1
+        samples.append(time.perf_counter() - started)
+    results.put(('reader', samples, errors))
+
+
+def writer(stop, results, batch):
+    x.close_pool()
+    commits, errors = 0, 0
+    while not stop.is_set():
+        try:
+            with x.get_pool().connection() as db:
+                db.executemany('INSERT INTO articles (title, content, author_id, category_id) VALUES (?, ?, 1, 1)',
+                               (('Yeni', 'içerik ' * 50) for _ in range(batch)))
+                db.execute('UPDATE articles SET views = views + 1 WHERE id % 7 = 0')
+                db.commit()
+                commits += 1
+        except sqlite3.OperationalError:
+            errors += 1
+    results.put(('writer', commits, errors))
+
+
+def run(name, settings, readers, seconds, batch):
+    x.app.config.update(settings)
+    x.app.config['DATABASE'] = os.path.join(tempfile.mkdtemp(), 'bench_concurrency.db')
+    x.init_db()
+    with x.get_pool().connection() as db:
+        db.execute("INSERT INTO users (username, email, password, user_type) VALUES ('bench', 'b@example.com', '-', 'yazar')")
+        db.executemany('INSERT INTO articles (title, content, author_id, category_id) VALUES (?, ?, 1, ?)',
+                       ((f'Makale {i}', 'içerik ' * 50, i % 10 + 1) for i in range(5000)))
+        db.commit()
+
+    stop = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=reader, args=(stop, results)) for _ in range(readers)]
+    processes.append(multiprocessing.Process(target=writer, args=(stop, results, batch)))
+    for process in processes:
+        process.start()
+    time.sleep(seconds)
+    stop.set()
+    latencies, errors, commits = [], 0, 0
+    for _ in processes:
+        kind, samples, failed = results.get()
+        errors += failed
+        if kind == 'reader':
+            latencies.extend(samples)
+        else:
+            commits = samples
+    for process in processes:
+        process.join()
+    x.close_pool()
+
+    samples = np.asarray(latencies) * 1000
+    print(f'{name:<17} okuma {len(samples) / seconds:8.0f}/s  p50={np.percentile(samples, 50):6.2f}ms  '
+          f'p99={np.percentile(samples, 99):7.2f}ms  max={samples.max():7.1f}ms  '
+          f'yazma işlemi={commits:4d}  kilit hatası={errors}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--batch', type=int, default=500)
+    args = parser.parse_args()
+    for name, settings in MODES.items():
+        run(name, settings, args.readers, args.seconds, args.batch)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Koşullu GET ve yanıt sıkıştırmasının aktarılan bayta ve gecikmeye etkisi.
+
+Sentetik bir veritabanında oturum açmış bir okuyucu için sayfalar önce tam
+olarak (Accept-Encoding olmadan, gzip ile, brotli yüklüyse br ile), sonra
+önceki yanıtın ETag'iyle If-None-Match göndererek istenir. 304 yanıtlarında
+view_article şablonu hiç işlenmez; diğer rotalarda gövde yine üretilir ama
+aktarılmaz.
+
+Kullanım: python benchmarks/bench_http_cache.py --articles 500 --requests 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import synthetic_texts
+import x
+
+ROUTES = ['/', '/articles', '/article/1', '/article/1/comments', '/category/1/top', '/api/articles']
+
+
+def setup(articles):
+    x.app.config['DATABASE'] = os.path.join(tempfile.mkdtemp(), 'bench_http_cache.db')
+    x.init_db()
+    with x.get_pool().connection() as db:
+        db.execute("INSERT INTO users (username, email, password, user_type) VALUES ('bench', 'b@example.com', '-', 'yazar')")
+        db.executemany('INSERT INTO articles (title, content, author_id, category_id) VALUES (?, ?, 1, ?)',
+                       ((f'Makale {i}', text, i % 5 + 1) for i, text in enumerate(synthetic_texts(articles, seed=1))))
+        db.executemany('INSERT INTO comments (article_id, user_id, content) VALUES (1, 1, ?)',
+                       ((f'Yorum {i}',) for i in range(50)))
+        x.refresh_rankings(db)
+        db.commit()
+
+
+def timed(client, path, requests, headers):
+    samples, response = [], None
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        response.get_data()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    setup(args.articles)
+    client = x.app.test_client()
+    with client.session_transaction() as sess:
+        sess.update(user_id=1, username='bench', user_type='yazar')
+    encodings = ['identity', 'gzip'] + (['br'] if x.BROTLI_AVAILABLE else [])
+    print(f"{'rota':<22}" + ''.join(f'{encoding + " bayt":>14}' for encoding in encodings)
+          + f"{'tam ms':>9}{'304 ms':>9}{'304 bayt':>10}")
+    for path in ROUTES:
+        sizes = []
+        for encoding in encodings:
+            response = client.get(path, headers={'Accept-Encoding': encoding})
+            sizes.append(len(response.get_data()))
+        full_ms, response = timed(client, path, args.requests, {})
+        etag = response.headers.get('ETag')
+        conditional_ms, conditional = timed(client, path, args.requests, {'If-None-Match': etag} if etag else {})
+        print(f'{path:<22}' + ''.join(f'{size:>14,}' for size in sizes)
+              + f'{full_ms:>9.2f}{conditional_ms:>9.2f}{len(conditional.get_data()):>10,}'
+              + ('' if conditional.status_code == 304 else f'  (durum {conditional.status_code})'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Ölçüm altyapısının (METRICS_ENABLED, SLOW_REQUEST_MS) istek başına maliyeti.
+
+Sentetik bir veritabanında sık kullanılan rotalar test istemcisiyle üç modda
+çağrılır: ölçümler kapalı, açık ve açık + yavaş istek kaydı (eşik hiç
+aşılmayacak kadar yüksek, yalnızca SQL süreleri toplanır). Modlar tur tur
+dönüşümlü çalıştırılır ki ısınma ve gürültü modlar arasında eşit dağılsın.
+Bağlantı sınıfı bağlantı açılırken seçildiği için her mod değişiminde havuz
+kapatılır.
+
+Kullanım: python benchmarks/bench_metrics.py --articles 2000 --rounds 5 --requests 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import synthetic_texts
+import x
+
+ROUTES = ['/', '/articles', '/articles?search=uzay', '/article/{article}', '/article/{article}/comments',
+          '/api/articles', '/profile/bench']
+MODES = {
+    'kapalı': {'METRICS_ENABLED': False, 'SLOW_REQUEST_MS': None},
+    'açık': {'METRICS_ENABLED': True, 'SLOW_REQUEST_MS': None},
+    'açık + yavaş istek': {'METRICS_ENABLED': True, 'SLOW_REQUEST_MS': 60000},
+}
+
+
+def setup(articles):
+    x.app.config['DATABASE'] = os.path.join(tempfile.mkdtemp(), 'bench_metrics.db')
+    x.init_db()
+    with x.get_pool().connection() as db:
+        db.execute("INSERT INTO users (username, email, password, user_type) VALUES ('bench', 'b@example.com', '-', 'yazar')")
+        db.executemany('INSERT INTO articles (title, content, author_id, category_id) VALUES (?, ?, 1, ?)',
+                       ((f'Makale {i}', text, i % 5 + 1) for i, text in enumerate(synthetic_texts(articles, seed=1))))
+        x.index_articles_fts(db)
+        db.executemany('INSERT INTO comments (article_id, user_id, content) VALUES (?, 1, ?)',
+                       ((i % 50 + 1, f'Yorum {i}') for i in range(1000)))
+        x.refresh_rankings(db)
+        db.commit()
+
+
+def run(client, requests, articles):
+    started = time.perf_counter()
+    for i in range(requests):
+        response = client.get(ROUTES[i % len(ROUTES)].format(article=i % min(articles, 50) + 1))
+        assert response.status_code == 200, response.status_code
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=200, help='tur ve mod başına istek sayısı')
+    args = parser.parse_args()
+
+    setup(args.articles)
+    client = x.app.test_client()
+    with client.session_transaction() as sess:
+        sess.update(user_id=1, username='bench', user_type='yazar')
+    samples = {mode: [] for mode in MODES}
+    for round_ in range(args.rounds + 1):
+        for mode, config in MODES.items():
+            x.app.config.update(config)
+            x.close_pool()
+            elapsed = run(client, args.requests, args.articles)
+            if round_:
+                samples[mode].append(elapsed)
+    baseline = statistics.median(samples['kapalı'])
+    print(f'{args.requests} istek x {args.rounds} tur, {len(ROUTES)} rota')
+    for mode, values in samples.items():
+        median = statistics.median(values)
+        print(f'{mode:>20}: {median:8.1f} µs/istek  ({median - baseline:+6.1f} µs, {(median / baseline - 1) * 100:+5.1f}%)')
+    print(f'{len(x.render_metrics().splitlines())} satırlık /metrics çıktısı')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""compute_related toplu komşu hesabının süreç sayısına göre verimi (makale/sn).
+
+Geçici bir veritabanını init_db ile kurar, sentetik makalelerle doldurur ve tüm
+katalog için related_articles tablosunu her süreç sayısıyla yeniden hesaplar.
+
+Kullanım: python benchmarks/bench_related.py --size 50000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import synthetic_texts
+import x
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=50000)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--block-memory', type=int, default=64, help='MiB')
+    args = parser.parse_args()
+
+    x.app.config['DATABASE'] = os.path.join(tempfile.mkdtemp(), 'bench_related.db')
+    x.init_db()
+    with x.get_pool().connection() as db:
+        db.execute("INSERT INTO users (username, email, password, user_type) VALUES ('bench', 'b@example.com', '-', 'yazar')")
+        db.executemany('INSERT INTO articles (title, content, author_id, category_id) VALUES (?, ?, 1, 1)',
+                       ((f'Makale {i}', text) for i, text in enumerate(synthetic_texts(args.size, seed=args.size))))
+        db.commit()
+
+        for workers in dict.fromkeys(args.workers):
+            stats = x.compute_related(db, top_n=args.top_n, workers=workers,
+                                      block_memory=args.block_memory * 1024 * 1024)
+            print(f"{workers:>2} süreç: {stats['seconds']:6.1f}s  {stats['articles_per_second']:8.0f} makale/sn  "
+                  f"({stats['blocks']} blok x {stats['block_size']} satır)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""Rota başına tekrarlanabilir performans ve yük testi; sonuçlar commit başına saklanır.
+
+Sabit tohumlarla sentetik bir veri kümesi (yazar ve okur kullanıcılar, varsayılan
+kategorilere dağılmış, uzunlukları log-normal dağılan makaleler, az sayıda
+makalede yoğunlaşan yorumlar ve beğeniler) init_db ile açılan boş bir
+veritabanına yazılır. Ardından index, articles (aramalı ve aramasız),
+view_article, toggle_like, add_comment, /api/summarize ve
+top_articles_by_category iki aşamada ölçülür:
+
+  1. Flask test istemcisiyle sıralı istekler (ağ ve sunucu olmadan uygulama maliyeti)
+  2. Ayrı süreçte başlatılan sunucuya eşzamanlı HTTP yükü (bench_asgi ile aynı sunucular)
+
+Her rota için saniyedeki istek, p50/p95/p99 ve hata sayısı yazdırılır ve
+benchmarks/results/<commit>.json dosyasına kaydedilir (çalışma ağacı kirliyse
+<commit>-dirty.json). --compare ile önceki bir commit'in sonuçlarıyla fark tablosu
+basılır.
+
+Kullanım: python benchmarks/bench_routes.py --articles 2000 --clients 16 --seconds 10
+          python benchmarks/bench_routes.py --compare a1b2c3d
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_asgi import login, start_server
+from benchmarks.corpus import synthetic_texts, vocabulary
+from werkzeug.security import generate_password_hash
+import x
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+ROUTES = [
+    ('index', 'GET', '/'),
+    ('articles', 'GET', '/articles'),
+    ('articles?search', 'GET', '/articles?search={word}'),
+    ('view_article', 'GET', '/article/{article}'),
+    ('toggle_like', 'POST', '/article/{article}/like'),
+    ('add_comment', 'POST', '/article/{article}/comment'),
+    ('api_summarize', 'POST', '/api/summarize'),
+    ('top_articles_by_category', 'GET', '/category/{category}/top'),
+]
+
+
+def sentences(words, rng):
+    """Kelimeleri 8-20 kelimelik, büyük harfle başlayıp noktayla biten cümlelere böl"""
+    out, start = [], 0
+    while start < len(words):
+        end = start + int(rng.integers(8, 21))
+        out.append(' '.join(words[start:end]).capitalize() + '.')
+        start = end
+    return ' '.join(out)
+
+
+def articles_corpus(n, median_words, seed):
+    """Uzunlukları log-normal dağılan (~median_words, 80-5000 kelime) makale metinleri"""
+    rng = np.random.default_rng(seed)
+    lengths = np.clip(rng.lognormal(np.log(median_words), 0.6, size=n), 80, 5000).astype(int)
+    for length, text in zip(lengths, synthetic_texts(n, mean_words=median_words, seed=seed)):
+        words = text.split()
+        words = (words * (length // len(words) + 1))[:length]
+        yield sentences(words, rng)
+
+
+def setup_database(args):
+    """Sentetik veri kümesini yeni bir veritabanına yaz; (yol, kategori kimlikleri, örnek metinler) döndür"""
+    database = os.path.join(tempfile.mkdtemp(), 'bench_routes.db')
+    x.app.config['DATABASE'] = database
+    x.init_db()
+    rng = np.random.default_rng(args.seed)
+    password = generate_password_hash('bench')
+    authors = max(1, args.users // 10)
+    with x.get_pool().connection() as db:
+        db.execute("INSERT INTO users (username, email, password, user_type) VALUES ('bench', 'bench@example.com', ?, 'yazar')",
+                   (password,))
+        db.executemany('INSERT INTO users (username, email, password, user_type) VALUES (?, ?, ?, ?)',
+                       ((f'kullanici{i}', f'kullanici{i}@example.com', password, 'yazar' if i < authors else 'izleyici')
+                        for i in range(args.users)))
+        categories = [row['id'] for row in db.execute('SELECT id FROM categories ORDER BY id')]
+        now = time.time()
+        samples = []
+
+        def articles():
+            for i, text in enumerate(articles_corpus(args.articles, args.article_words, args.seed)):
+                if len(samples) < 100:
+                    samples.append(text)
+                created = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now - rng.uniform(0, 365 * 86400)))
+                yield (' '.join(text.split()[:6]).rstrip('.'), text, text.split('.', 1)[0] + '.',
+                       int(rng.integers(2, authors + 2)), categories[i % len(categories)], created)
+
+        db.executemany('''INSERT INTO articles (title, content, summary, author_id, category_id, created_at)
+                          VALUES (?, ?, ?, ?, ?, ?)''', articles())
+        x.index_articles_fts(db)
+        # Etkileşimler Zipf dağılımıyla az sayıda popüler makalede yoğunlaşır
+        popular = lambda size: np.minimum(rng.zipf(1.3, size=size), args.articles)
+        users = lambda size: rng.integers(2, args.users + 2, size=size)
+        db.executemany('INSERT INTO comments (article_id, user_id, content) VALUES (?, ?, ?)',
+                       ((int(a), int(u), f'Sentetik yorum {i}.') for i, (a, u) in
+                        enumerate(zip(popular(args.comments), users(args.comments)))))
+        db.executemany('INSERT OR IGNORE INTO likes (user_id, article_id) VALUES (?, ?)',
+                       ((int(u), int(a)) for a, u in zip(popular(args.likes), users(args.likes))))
+        x.reconcile_like_counts(db)
+        db.execute('UPDATE articles SET views = likes * 10 + abs(random() % 100)')
+        x.refresh_rankings(db)
+        db.commit()
+    x.close_pool()
+    return database, categories, samples
+
+
+class Requests:
+    """Rota adından tekrarlanabilir istek (yöntem, yol, gövde, başlıklar) üretir"""
+
+    def __init__(self, seed, articles, categories, samples, words):
+        self.rng = random.Random(seed)
+        self.articles = articles
+        self.categories = categories
+        self.samples = samples
+        self.words = words
+        self.sent = 0
+
+    def build(self, name, method, path):
+        self.sent += 1
+        path = path.format(word=urllib.parse.quote(self.rng.choice(self.words)),
+                           category=self.rng.choice(self.categories),
+                           article=min(int(self.rng.paretovariate(1.2)), self.articles))
+        if name == 'add_comment':
+            return method, path, urllib.parse.urlencode({'content': f'Yük testi yorumu {self.sent}'}), \
+                {'Content-Type': 'application/x-www-form-urlencoded'}
+        if name == 'api_summarize':
+            # Her metin benzersizdir; ölçüm özet önbelleğini değil özetleyiciyi ölçer
+            text = f'{self.rng.choice(self.samples)} Örnek {self.sent}.'
+            return method, path, json.dumps({'text': text}), {'Content-Type': 'application/json'}
+        return method, path, None, {}
+
+
+def summarize(latencies, errors, seconds):
+    values = np.array(latencies) * 1000
+    return {
+        'requests': len(values),
+        'errors': errors,
+        'rps': len(values) / seconds if seconds else 0.0,
+        'mean_ms': float(values.mean()) if len(values) else None,
+        'p50_ms': float(np.percentile(values, 50)) if len(values) else None,
+        'p95_ms': float(np.percentile(values, 95)) if len(values) else None,
+        'p99_ms': float(np.percentile(values, 99)) if len(values) else None,
+    }
+
+
+def run_test_client(args, requests):
+    """Rotaları tek tek, test istemcisiyle sıralı olarak ölç"""
+    client = x.app.test_client()
+    with client.session_transaction() as sess:
+        sess.update(user_id=1, username='bench', user_type='yazar')
+    results = {}
+    for name, method, path in ROUTES:
+        latencies, errors = [], 0
+        for i in range(args.warmup + args.iterations):
+            method_, path_, body, headers = requests.build(name, method, path)
+            started = time.perf_counter()
+            response = client.open(path_, method=method_, data=body, headers=headers)
+            response.get_data()
+            elapsed = time.perf_counter() - started
+            if i >= args.warmup:
+                latencies.append(elapsed)
+                errors += response.status_code >= 400
+        results[name] = summarize(latencies, errors, sum(latencies))
+    return results
+
+
+def http_client(port, cookie, deadline, requests, samples, routes=None):
+    """deadline'a kadar rastgele rotalar çağır; routes verilirse yalnızca onları sırayla bir kez çağır"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+    pending = list(routes) if routes is not None else None
+    while (pending if pending is not None else time.monotonic() < deadline):
+        name, method, path = pending.pop() if pending is not None else requests.rng.choice(ROUTES)
+        method, path, body, headers = requests.build(name, method, path)
+        headers['Cookie'] = cookie
+        started = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+            ok = False
+        samples.append((name, time.perf_counter() - started, ok))
+    conn.close()
+
+
+def run_http(args, database, make_requests):
+    """Rotaları karışık olarak --clients eşzamanlı istemciyle --seconds boyunca yükle"""
+    process, port = start_server(args.mode, database, args.threads)
+    try:
+        cookie = login(port)
+        # Tembel yüklenen modüller ve benzerlik indeksi ölçülen süreye girmesin
+        http_client(port, cookie, None, make_requests(999), [], routes=ROUTES * args.warmup)
+        deadline = time.monotonic() + args.seconds
+        samples = []
+        threads = [threading.Thread(target=http_client, args=(port, cookie, deadline, make_requests(i), samples))
+                   for i in range(args.clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        process.terminate()
+        process.wait()
+    results = {}
+    for name, _, _ in ROUTES:
+        rows = [(latency, ok) for route, latency, ok in samples if route == name]
+        results[name] = summarize([latency for latency, _ in rows], sum(1 for _, ok in rows if not ok), args.seconds)
+    results['total'] = summarize([latency for _, latency, _ in samples],
+                                 sum(1 for _, _, ok in samples if not ok), args.seconds)
+    return results
+
+
+def git_revision():
+    """(kısa commit, çalışma ağacı kirli mi); git yoksa ('unknown', False)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, bool(status.strip())
+
+
+def print_table(phase, results, baseline=None):
+    print(f'\n{phase}')
+    print(f"{'rota':<26}{'istek/sn':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'hata':>6}")
+    for name, row in results.items():
+        if not row['requests']:
+            print(f'{name:<26}{"-":>10}')
+            continue
+        line = (f"{name:<26}{row['rps']:>10.1f}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+                f"{row['p99_ms']:>9.2f}{row['errors']:>6}")
+        old = (baseline or {}).get(name)
+        if old and old.get('p50_ms'):
+            line += (f"   p50 {(row['p50_ms'] / old['p50_ms'] - 1) * 100:+6.1f}%"
+                     f"  p99 {(row['p99_ms'] / old['p99_ms'] - 1) * 100:+6.1f}%")
+        print(line)
+
+
+def load_results(ref):
+    path = ref if os.path.exists(ref) else os.path.join(RESULTS_DIR, f'{ref}.json')
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--article-words', type=int, default=600, help='makale uzunluğunun medyanı (kelime)')
+    parser.add_argument('--comments', type=int, default=20000)
+    parser.add_argument('--likes', type=int, default=20000)
+    parser.add_argument('--iterations', type=int, default=200, help='test istemcisinde rota başına istek')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--mode', default='WSGI', choices=['WSGI', 'ASGI'])
+    parser.add_argument('--threads', type=int, default=8, help='WSGI işçisinin iş parçacığı sayısı')
+    parser.add_argument('--skip-http', action='store_true', help='yalnızca test istemcisi aşamasını çalıştır')
+    parser.add_argument('--compare', help='karşılaştırılacak commit ya da sonuç dosyası')
+    parser.add_argument('--output', help=f'sonuç dosyası (varsayılan {RESULTS_DIR}/<commit>.json)')
+    args = parser.parse_args()
+
+    baseline = load_results(args.compare) if args.compare else {}
+    database, categories, samples = setup_database(args)
+    words = list(vocabulary(seed=args.seed)[:50])
+
+    def make_requests(seed):
+        return Requests(args.seed + seed, args.articles, categories, samples, words)
+
+    commit, dirty = git_revision()
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'environment': {'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+                        'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'args': {key: value for key, value in vars(args).items() if key not in ('compare', 'output')},
+        'phases': {},
+    }
+    report['phases']['test_client'] = run_test_client(args, make_requests(0))
+    print_table('Test istemcisi (sıralı)', report['phases']['test_client'],
+                baseline.get('phases', {}).get('test_client'))
+    if not args.skip_http:
+        phase = f'http_{args.mode.lower()}'
+        report['phases'][phase] = run_http(args, database, lambda i: make_requests(1000 + i))
+        print_table(f'HTTP {args.mode}, {args.clients} istemci, {args.seconds:g} sn', report['phases'][phase],
+                    baseline.get('phases', {}).get(phase))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f'\nSonuçlar: {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""/articles aramasında LIKE '%terim%' taraması ile FTS5 + BM25 yolunun gecikme karşılaştırması.
+
+Geçici bir veritabanını init_db ile kurar, sentetik makalelerle doldurur ve aynı
+terimleri iki yoldan da sorgular.
+
+Kullanım: python benchmarks/bench_search.py --size 50000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import synthetic_texts, vocabulary
+import x
+
+LIKE_QUERY = '''
+    SELECT a.*, u.username, u.full_name, c.name as category_name 
+    FROM articles a 
+    JOIN users u ON a.author_id = u.id 
+    LEFT JOIN categories c ON a.category_id = c.id 
+    WHERE 1=1 AND (a.title LIKE ? OR a.content LIKE ? OR a.tags LIKE ?)
+    ORDER BY a.created_at DESC
+'''
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return np.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    x.app.config['DATABASE'] = os.path.join(tempfile.mkdtemp(), 'bench_search.db')
+    x.init_db()
+    db = x.get_db()
+    db.execute("INSERT INTO users (username, email, password, user_type) VALUES ('bench', 'bench@example.com', '-', 'yazar')")
+    vocab = vocabulary()
+    texts = synthetic_texts(args.size, vocab=vocab)
+    started = time.perf_counter()
+    db.executemany('INSERT INTO articles (title, content, author_id, category_id, tags) VALUES (?, ?, 1, ?, ?)',
+                   ((text[:40], text, i % 10 + 1, text[-20:]) for i, text in enumerate(texts)))
+    x.index_articles_fts(db)
+    db.commit()
+    print(f'{args.size} makale yüklendi ({time.perf_counter() - started:.1f}s, FTS indeksi dahil)')
+
+    for word in (str(vocab[0]), str(vocab[50]), str(vocab[2000]), f'{vocab[10]} {vocab[3000]}'):
+        term = f'%{word}%'
+        like_rows = len(db.execute(LIKE_QUERY, (term, term, term)).fetchall())
+        fts_rows = len(x.query_articles(db, search=word))
+        like = timed(lambda: db.execute(LIKE_QUERY, (term, term, term)).fetchall(), args.repeat)
+        fts = timed(lambda: x.query_articles(db, search=word), args.repeat)
+        print(f'{word!r:28} LIKE {like:8.1f}ms ({like_rows:>6} satır)   FTS5 {fts:8.1f}ms ({fts_rows:>6} satır)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""view_article benzer makale aramasının görüntüleme başına gecikmesini ölçer.
+
+Eski yol (her görüntülemede TfidfVectorizer'ı 11 belge üzerinde yeniden eğitmek) ile
+SimilarityIndex üzerindeki seyrek iç çarpımı karşılaştırır.
+
+Kullanım: python benchmarks/bench_similarity.py --sizes 10000 100000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import synthetic_texts
+from x import AIAssistant, SimilarityIndex
+
+
+def percentiles(samples):
+    samples = np.asarray(samples) * 1000
+    return f'p50={np.percentile(samples, 50):7.2f}ms  p95={np.percentile(samples, 95):7.2f}ms'
+
+
+def refit_similar(stop_words, article_content, all_articles, top_n=5):
+    """Eski AIAssistant.find_similar_articles: her çağrıda TfidfVectorizer'ı yeniden eğitir"""
+    contents = [article_content] + [art['content'] for art in all_articles]
+    tfidf_matrix = TfidfVectorizer(stop_words=list(stop_words)).fit_transform(contents)
+    similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
+    return [{'article': all_articles[idx], 'similarity_score': float(similarities[idx])}
+            for idx in similarities.argsort()[-top_n:][::-1] if similarities[idx] > 0.1]
+
+
+def run(size, views):
+    texts = list(synthetic_texts(size, seed=size))
+    db = sqlite3.connect(':memory:')
+    db.execute('CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, content TEXT)')
+    db.execute('''
+        CREATE TABLE article_vectors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER UNIQUE NOT NULL,
+            terms BLOB NOT NULL,
+            weights BLOB NOT NULL
+        )
+    ''')
+    assistant = AIAssistant()
+    index = SimilarityIndex(assistant.stop_words, sync_interval=float('inf'))
+    index.sync(db)
+
+    started = time.perf_counter()
+    for start in range(0, size, 1000):
+        index.add_many(db, [(i + 1, texts[i]) for i in range(start, min(start + 1000, size))])
+    db.commit()
+    build = time.perf_counter() - started
+    storage = db.execute('SELECT SUM(LENGTH(terms) + LENGTH(weights)) FROM article_vectors').fetchone()[0]
+
+    rng = np.random.default_rng(size)
+    picks = rng.integers(1, size + 1, size=views)
+
+    indexed = []
+    for article_id in picks:
+        started = time.perf_counter()
+        index.most_similar(db, int(article_id), top_n=3)
+        indexed.append(time.perf_counter() - started)
+
+    refit = []
+    for article_id in picks:
+        neighbours = [{'content': texts[j]} for j in rng.integers(0, size, size=10)]
+        started = time.perf_counter()
+        refit_similar(assistant.stop_words, texts[article_id - 1], neighbours, top_n=3)
+        refit.append(time.perf_counter() - started)
+
+    print(f'{size:>7} makale | indeks kurulumu {build:6.1f}s, {storage / 2 ** 20:6.1f} MiB vektör')
+    print(f'        eski yeniden-fit (11 belge) : {percentiles(refit)}')
+    print(f'        SimilarityIndex (tüm korpus): {percentiles(indexed)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--views', type=int, default=200)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.views)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""İşçi açılış süresi: x modülünün içe aktarılmasından ilk isteğe kadar geçen süre.
+
+Her ölçüm temiz bir Python sürecinde yapılır (gunicorn işçisinin açılışı gibi).
+Tembel yükleme (varsayılan) ile AI_PRELOAD=1 (scikit-learn, NLTK ve durak
+kelimelerinin içe aktarma sırasında yüklendiği eski davranış) karşılaştırılır.
+Ölçümler AI_OFFLINE=1 ile yapılır, böylece hiçbir çalıştırma ağa çıkmaz.
+
+Kullanım: python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'tembel': {},
+    'AI_PRELOAD=1': {'AI_PRELOAD': '1'},
+}
+
+SETUP = '''
+import sys
+import x
+x.app.config['DATABASE'] = sys.argv[1]
+x.init_db()
+with x.get_pool().connection() as db:
+    db.execute("INSERT INTO users (username, email, password, user_type) VALUES ('bench', 'b@example.com', '-', 'yazar')")
+    db.execute("INSERT INTO articles (title, content, author_id, category_id) VALUES ('Uzay', 'Robotlar ve uzay gemileri.', 1, 1)")
+    db.commit()
+'''
+
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import x
+imported = time.perf_counter()
+x.app.config['DATABASE'] = sys.argv[1]
+client = x.app.test_client()
+client.get('/login')
+first = time.perf_counter()
+heavy_loaded = 'sklearn' in sys.modules
+client.get('/article/1')
+ai = time.perf_counter()
+print(json.dumps({'import': imported - started, 'first_request': first - imported,
+                  'first_ai_request': ai - first, 'heavy_loaded': heavy_loaded}))
+'''
+
+
+def run_python(code, database, env):
+    result = subprocess.run([sys.executable, '-c', code, database], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    database = os.path.join(tempfile.mkdtemp(), 'bench_startup.db')
+    base_env = dict(os.environ, AI_OFFLINE='1')
+    run_python(SETUP, database, base_env)
+
+    print(f"{'mod':>14} {'import ms':>10} {'ilk istek ms':>13} {'import→ilk istek':>17} {'ilk AI isteği ms':>17}  sklearn yüklü")
+    for name, extra in MODES.items():
+        samples = [json.loads(run_python(PROBE, database, dict(base_env, **extra))) for _ in range(args.runs)]
+        imported = np.median([s['import'] for s in samples]) * 1000
+        first = np.median([s['first_request'] for s in samples]) * 1000
+        ai = np.median([s['first_ai_request'] for s in samples]) * 1000
+        heavy = all(s['heavy_loaded'] for s in samples)
+        print(f'{name:>14} {imported:>10.0f} {first:>13.1f} {imported + first:>17.0f} {ai:>17.0f}  {heavy}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Özet motorlarının 1 KB'tan 10 MB'a kadar belgelerde gecikmesi ve en yüksek bellek kullanımı.
+
+lead (ilk cümleler), tfidf ve textrank motorlarını karşılaştırır. Akış modu
+metni 64 KB'lık parçalar halinde alır ve hiçbir zaman birleştirmez. En yüksek bellek tracemalloc ile ölçülür; belge
+ölçümden önce üretildiği için kendisi sayılmaz.
+
+Kullanım: python benchmarks/bench_summarize.py --sizes 1e3 1e4 1e5 1e6 1e7
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import synthetic_texts, vocabulary
+import x
+
+CHUNK = 64 * 1024
+
+
+def document_chunks(size, seed=0, sentence_words=15):
+    """Yaklaşık size karakterlik, noktalı cümlelerden oluşan metni parça parça üret"""
+    rng = np.random.default_rng(seed)
+    vocab = vocabulary(seed=seed)
+    produced, buffered, buffer = 0, 0, []
+    for text in synthetic_texts(size // 1000 + 1, mean_words=200, seed=seed, vocab=vocab, topics=5):
+        words = text.split()
+        cuts = np.cumsum(rng.integers(sentence_words // 2, sentence_words * 2, size=len(words)))
+        start = 0
+        for cut in cuts:
+            if start >= len(words):
+                break
+            sentence = ' '.join(words[start:cut]).capitalize() + '. '
+            start = cut
+            buffer.append(sentence)
+            produced += len(sentence)
+            buffered += len(sentence)
+            if buffered >= CHUNK or produced >= size:
+                yield ''.join(buffer)
+                buffered, buffer = 0, []
+            if produced >= size:
+                return
+    if buffer:
+        yield ''.join(buffer)
+
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1e3, 1e4, 1e5, 1e6, 1e7])
+    parser.add_argument('--engines', nargs='+', default=list(x.SUMMARY_ENGINES))
+    args = parser.parse_args()
+
+    x.ai_assistant.summarize_stream(document_chunks(1000), engine='tfidf')
+    print(f"{'boyut':>10} {'motor':>9} {'gecikme ms':>11} {'bellek MiB':>11}")
+    for size in map(int, args.sizes):
+        chunks = list(document_chunks(size))
+        for engine in args.engines:
+            elapsed, peak = measure(lambda: x.ai_assistant.summarize_stream(iter(chunks), engine=engine))
+            print(f'{size:>10,} {engine:>9} {elapsed:>11.1f} {peak:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Şablon derleme hattının (build-templates) yanıt boyutuna ve işçi açılışına etkisi.
+
+Modüldeki *_html şablonları geçici dizinlere iki kez yazılır: olduğu gibi (ham)
+ve küçültülüp ortak CSS ile ortak iskelet (_base.html) ayrılarak (derlenmiş).
+Her varyant ayrı bir süreçte çalıştırılır; süreç x'i içe aktarır (içe aktarma
+süresi), sonra rotaları test istemcisiyle birer kez çağırır (ilk işleme süresi,
+yanıt baytı, gzip'li bayt). İşlenen HTML ana şablonla da aynı kalır.
+Üçüncü varyant derlenmiş şablonları build_templates'in doldurduğu Jinja bayt
+kodu önbelleğiyle kullanır. Ortak CSS dosyası tarayıcıda bir kez indirilip
+önbelleklendiği için ayrı raporlanır.
+
+Kullanım: python benchmarks/bench_templates.py --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import synthetic_texts
+import x
+
+ROUTES = ['/', '/articles', '/article/1', '/category/1/top', '/profile/bench', '/article/create', '/login',
+          '/register']
+WORKER = '''
+import gzip, json, sys, time
+started = time.perf_counter()
+import x
+imported = time.perf_counter() - started
+templates, database, bytecode, routes = sys.argv[1], sys.argv[2], sys.argv[3], json.loads(sys.argv[4])
+x.app.template_folder = templates
+x.app.config['DATABASE'] = database
+x.app.jinja_env.bytecode_cache = x.FileSystemBytecodeCache(bytecode) if bytecode else None
+client = x.app.test_client()
+results = {}
+for path in routes:
+    with client.session_transaction() as sess:
+        sess.clear()
+        if path not in ('/login', '/register'):
+            sess.update(user_id=1, username='bench', user_type='yazar')
+    started = time.perf_counter()
+    response = client.get(path)
+    results[path] = {'status': response.status_code, 'bytes': len(response.data),
+                     'gzip': len(gzip.compress(response.data)), 'ms': (time.perf_counter() - started) * 1000}
+print(json.dumps({'import_ms': imported * 1000, 'routes': results}))
+'''
+
+
+def setup_database(directory):
+    x.app.config['DATABASE'] = os.path.join(directory, 'bench_templates.db')
+    x.init_db()
+    with x.get_pool().connection() as db:
+        db.execute("INSERT INTO users (username, email, password, user_type) VALUES ('bench', 'b@example.com', '-', 'yazar')")
+        db.executemany('INSERT INTO articles (title, content, author_id, category_id) VALUES (?, ?, 1, ?)',
+                       ((f'Makale {i}', text, i % 5 + 1) for i, text in enumerate(synthetic_texts(50, seed=1))))
+        x.refresh_rankings(db)
+        db.commit()
+    x.close_pool()
+    return x.app.config['DATABASE']
+
+
+def run(templates, database, bytecode, cwd):
+    output = subprocess.run([sys.executable, '-c', WORKER, templates, database, bytecode, json.dumps(ROUTES)],
+                            cwd=cwd, env=dict(os.environ, PYTHONPATH=ROOT), capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    sources = x.template_sources()
+    if not sources:
+        sys.exit('Modülde *_html şablonu bulunamadı.')
+    directory = tempfile.mkdtemp()
+    database = setup_database(directory)
+    static = os.path.join(directory, 'static')
+    variants = {'ham': (os.path.join(directory, 'raw'), '')}
+    report = {'ham': x.build_templates(sources, variants['ham'][0], static, minify=False)}
+    built = os.path.join(directory, 'built')
+    bytecode = os.path.join(directory, 'bytecode')
+    report['derlenmiş'] = x.build_templates(sources, built, static, shared_css='css/verbum.css',
+                                            bytecode_cache=bytecode, base_template='_base.html')
+    variants['derlenmiş'] = (built, '')
+    variants['derlenmiş + bayt kodu'] = (built, bytecode)
+
+    print(f"{'şablon':<24}{'ham':>10}{'derlenmiş':>11}")
+    for name, (before, after) in sorted(report['derlenmiş']['templates'].items()):
+        print(f'{name:<24}{before:>10,}{after:>11,}')
+    print(f"ortak CSS: {report['derlenmiş']['shared_rules']} kural, {report['derlenmiş']['shared_css']:,} bayt "
+          f'(bir kez indirilir)')
+    print(f"ana şablon: {report['derlenmiş']['extended']} şablon genişletiyor, "
+          f"{report['derlenmiş']['base_template']:,} bayt\n")
+
+    results = {}
+    for variant, (templates, cache) in variants.items():
+        runs = [run(templates, database, cache, directory) for _ in range(args.repeat)]
+        results[variant] = {
+            'import_ms': statistics.median(r['import_ms'] for r in runs),
+            'first_render_ms': statistics.median(sum(route['ms'] for route in r['routes'].values()) for r in runs),
+            'routes': runs[-1]['routes'],
+        }
+    print(f"{'rota':<18}" + ''.join(f'{variant + " bayt/gzip":>31}' for variant in variants))
+    for path in ROUTES:
+        cells = [results[variant]['routes'][path] for variant in variants]
+        print(f'{path:<18}' + ''.join(f"{cell['bytes']:>22,} / {cell['gzip']:>6,}" for cell in cells))
+    print()
+    for variant, result in results.items():
+        print(f"{variant:<24} içe aktarma {result['import_ms']:7.1f}ms  "
+              f"ilk işleme ({len(ROUTES)} rota) {result['first_render_ms']:7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Benchmark betikleri için tekrarlanabilir sentetik Türkçe benzeri metin üreticisi"""
+
+import numpy as np
+
+SYLLABLES = ['ka', 'le', 'mi', 'şa', 'rü', 'ya', 'dı', 'ön', 'ce', 'göz', 'kı', 'lar', 'ler', 'ta', 'nu',
+             'sev', 'gi', 'bil', 'im', 'yol', 'de', 'niz', 'as', 'ır', 'çe', 'ğe', 'ha', 'ber', 'ol', 'ma']
+
+
+def vocabulary(size=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES, size=rng.integers(2, 5))))
+    return np.array(sorted(words))
+
+
+def synthetic_texts(n, mean_words=250, seed=0, vocab=None, topics=50, topic_words=300, topic_share=0.4):
+    """Zipf dağılımlı kelimelerden n adet metin üret
+
+    Her metin bir konuya atanır ve kelimelerinin topic_share kadarı o konunun
+    kelime havuzundan gelir; böylece benzerlik aramasının bulacağı gerçek komşular oluşur.
+    """
+    rng = np.random.default_rng(seed)
+    vocab = vocabulary(seed=seed) if vocab is None else vocab
+    pools = [rng.choice(len(vocab), size=topic_words, replace=False) for _ in range(max(topics, 1))]
+    lengths = np.maximum(20, rng.poisson(mean_words, size=n))
+    for length in lengths:
+        ranks = np.minimum(rng.zipf(1.2, size=length), len(vocab)) - 1
+        if topics:
+            pool = pools[rng.integers(len(pools))]
+            themed = rng.random(length) < topic_share
+            ranks[themed] = pool[np.minimum(rng.zipf(1.5, size=int(themed.sum())), topic_words) - 1]
+        yield ' '.join(vocab[ranks])
@@ -2,37 +2,596 @@
 import os
 import sqlite3
 from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import (Flask, Response, render_template, request, redirect, url_for, session,
+                   flash, jsonify, g, has_app_context, stream_with_context, before_render_template,
+                   template_rendered, send_from_directory)
+import click
+from werkzeug.security import generate_password_hash, check_password_hash, safe_join
+from werkzeug.exceptions import HTTPException
+from jinja2 import FileSystemBytecodeCache, FileSystemLoader, TemplateSyntaxError
+from markupsafe import Markup, escape
+import asyncio
+import atexit
+import base64
+import bisect
+import codecs
+import concurrent.futures
+import contextlib
+import csv
+import difflib
+import gzip
+import hashlib
+import importlib
+import importlib.util
+import itertools
 import json
+import queue
+import shutil
+import tempfile
 import re
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
 
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 
 
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
+class LazyModule:
+    """İlk öznitelik erişiminde içe aktarılan modül vekili
+
+    scikit-learn, SciPy, NumPy ve NLTK yalnızca onları kullanan ilk istekte
+    yüklenir; /login gibi sayfalar işçi açılışında bu maliyeti ödemez.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def load_module(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__dict__['_name'])
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self.load_module(), attr)
+
+
+np = LazyModule('numpy')
+sparse = LazyModule('scipy.sparse')
+sklearn_text = LazyModule('sklearn.feature_extraction.text')
+sklearn_preprocessing = LazyModule('sklearn.preprocessing')
+sklearn_linear_model = LazyModule('sklearn.linear_model')
+joblib = LazyModule('joblib')
+nltk = LazyModule('nltk')
+brotli = LazyModule('brotli')
+BROTLI_AVAILABLE = importlib.util.find_spec('brotli') is not None
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY') or 'yazarlar-platformu-gizli-anahtar'
 app.config['DATABASE'] = 'yazarlar_platformu.db'
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
+app.config['SIMILARITY_FEATURES'] = 2 ** 18
+app.config['SIMILARITY_REFRESH_RATIO'] = 0.1
+app.config['SIMILARITY_SYNC_INTERVAL'] = 5.0
+app.config['SIMILARITY_BACKFILL_BATCH'] = 500
+app.config['SIMILARITY_BACKFILL_INTERVAL'] = 600.0
+app.config['FTS_CATCHUP_INTERVAL'] = 300.0
+app.config['ANN_MIN_ARTICLES'] = 20000
+app.config['ANN_DIM'] = 128
+app.config['ANN_NPROBE'] = 16
+app.config['SEARCH_SNIPPET_LENGTH'] = 200
+app.config['PAGE_SIZE'] = 20
+app.config['PAGE_SIZE_MAX'] = 100
+app.config['FEED_PAGE_SIZE'] = 5
+app.config['SQL_TRACE'] = None
+app.config['DB_POOL_SIZE'] = 8
+app.config['DB_POOL_TIMEOUT'] = 10.0
+app.config['DB_JOURNAL_MODE'] = 'WAL'
+app.config['DB_SYNCHRONOUS'] = 'NORMAL'
+app.config['DB_BUSY_TIMEOUT'] = 5000
+app.config['DB_MMAP_SIZE'] = 256 * 1024 * 1024
+app.config['DB_CACHE_SIZE'] = -64000
+app.config['VIEW_FLUSH_INTERVAL'] = 5.0
+app.config['VIEW_FLUSH_THRESHOLD'] = 500
+app.config['RANKING_WEIGHTS'] = {'likes': 0.3, 'views': 0.7}
+app.config['RANKING_HALF_LIFE_HOURS'] = None
+app.config['RANKING_REFRESH_INTERVAL'] = 600.0
+app.config['LIKES_RECONCILE_INTERVAL'] = 3600.0
+app.config['CACHE_BACKEND'] = None
+app.config['CACHE_MAX_ENTRIES'] = 2048
+app.config['CACHE_DEFAULT_TTL'] = 60.0
+app.config['HOME_CACHE_TTL'] = 30.0
+app.config['CATEGORY_CACHE_TTL'] = 60.0
+app.config['ARTICLE_CACHE_TTL'] = 30.0
+app.config['COMMENT_PAGE_SIZE'] = 20
+app.config['COMMENT_CACHE_TTL'] = 15.0
+app.config['AI_OFFLINE'] = os.environ.get('AI_OFFLINE') == '1'
+app.config['AI_PRELOAD'] = os.environ.get('AI_PRELOAD') == '1'
+app.config['JOB_WORKERS'] = 2
+app.config['JOB_POLL_INTERVAL'] = 2.0
+app.config['JOB_MAX_ATTEMPTS'] = 3
+app.config['JOB_RETRY_DELAY'] = 10.0
+app.config['JOB_LEASE'] = 300.0
+app.config['JOB_RETENTION'] = 7 * 86400.0
+app.config['JOB_PRUNE_INTERVAL'] = 3600.0
+app.config['RELATED_TOP_N'] = 10
+app.config['RELATED_MIN_SCORE'] = 0.1
+app.config['RELATED_WORKERS'] = None
+app.config['RELATED_BLOCK_MEMORY'] = 64 * 1024 * 1024
+app.config['CATEGORY_ENGINE'] = os.environ.get('CATEGORY_ENGINE', 'keywords')
+app.config['CATEGORY_MODEL_PATH'] = 'category_model.joblib'
+app.config['CATEGORY_MIN_CONFIDENCE'] = 0.3
+app.config['CATEGORY_RELOAD_INTERVAL'] = 60.0
+app.config['SUMMARY_ENGINE'] = 'tfidf'
+app.config['SUMMARY_STREAM_CHUNK'] = 64 * 1024
+app.config['AI_MEMO_MAX_ENTRIES'] = 4096
+app.config['AI_MEMO_PERSIST'] = False
+app.config['AI_MEMO_MAX_ROWS'] = 100000
+app.config['AI_MEMO_PRUNE_INTERVAL'] = 3600.0
+app.config['AI_BATCH_MAX_DOCUMENTS'] = 100
+app.config['AI_BATCH_MAX_BYTES'] = 2 * 1024 * 1024
+app.config['AI_BATCH_STREAM_GROUP'] = 16
+app.config['ASGI_IO_WORKERS'] = None
+app.config['ASGI_AI_WORKERS'] = 2
+app.config['ASGI_ARTICLE_WORKERS'] = 4
+app.config['ASGI_WORKERS'] = 8
+app.config['ASGI_SPOOL_SIZE'] = 1024 * 1024
+app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', '1') == '1'
+app.config['SLOW_REQUEST_MS'] = None
+app.config['TEMPLATE_BYTECODE_CACHE'] = os.path.join(app.instance_path, 'jinja-cache')
+app.config['SHARED_CSS'] = 'css/verbum.css'
+app.config['BASE_TEMPLATE'] = '_base.html'
+app.config['CACHE_CONTROL'] = {
+    'index': 'public, max-age=60',
+    'articles': 'public, max-age=30',
+    'api_articles': 'public, max-age=30',
+    'api_feed': 'public, max-age=30',
+    'view_article': 'public, max-age=30',
+    'article_comments': 'public, max-age=15',
+    'top_articles_by_category': 'public, max-age=60',
+    'profile': 'public, max-age=60',
+    'api_profile_articles': 'public, max-age=60',
+    'login': 'public, max-age=300',
+    'register': 'public, max-age=300',
+}
+app.config['CACHE_CONTROL_PRIVATE'] = 'private, no-cache'
+app.config['ASSET_MAX_AGE'] = 365 * 24 * 3600
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_LEVEL'] = 6
+app.config['BROTLI_QUALITY'] = 5
+app.config['COMPRESS_MIMETYPES'] = {'text/html', 'text/css', 'text/plain', 'text/javascript', 'application/json',
+                                    'application/javascript', 'application/x-ndjson', 'image/svg+xml'}
 
 
-def get_db():
-    conn = sqlite3.connect(app.config['DATABASE'])
+WORD_RE = re.compile(r'\w+')
+
+
+def turkish_lower(text):
+    """Türkçe kurallarıyla küçük harfe çevir (I → ı, İ → i)"""
+    return text.replace('I', 'ı').replace('İ', 'i').lower()
+
+
+def fold_for_search(text):
+    """Metni tam metin indeksi için küçük harfe çevir ve durak kelimelerini at"""
+    if not text:
+        return ''
+    stop_words = ai_assistant.stop_words
+    return ' '.join(word for word in WORD_RE.findall(turkish_lower(text)) if word not in stop_words)
+
+
+def index_articles_fts(db, rows=None):
+    """(id, title, tags, content) satırlarını katlayıp articles_fts'e yaz
+
+    Satır verilmezse tam metin indeksinde henüz olmayan tüm makaleler eklenir.
+    Var olan kayıtlar değiştirilir; çağıran commit eder. Yazılan satır sayısını döndürür.
+    """
+    if rows is None:
+        rows = db.execute(f'''
+            SELECT id, title, tags, content FROM articles
+            WHERE id NOT IN (SELECT rowid FROM articles_fts) {FULL_SCAN_OK}
+        ''').fetchall()
+    params = [(row[0], fold_for_search(row[1]), fold_for_search(row[2]), fold_for_search(row[3])) for row in rows]
+    db.executemany('DELETE FROM articles_fts WHERE rowid = ?', [(param[0],) for param in params])
+    db.executemany('INSERT INTO articles_fts (rowid, title, tags, content) VALUES (?, ?, ?, ?)', params)
+    return len(params)
+
+
+def search_terms(search):
+    """Arama kutusundaki metni katlanmış, durak kelimesi içermeyen terimlere ayır"""
+    return fold_for_search(search).split()
+
+
+def fts_query(terms):
+    """Terimleri ön ek eşleşmeli FTS5 MATCH ifadesine dönüştür"""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def make_snippet(text, terms, length=200):
+    """Aranan terimlerin geçtiği bölümü <mark> ile vurgulanmış olarak döndür"""
+    text = text or ''
+    folded = turkish_lower(text)
+    if len(folded) != len(text):
+        folded = ''.join(turkish_lower(char)[:1] for char in text)
+    pattern = re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(term) for term in terms) + r')\w*') if terms else None
+    first = pattern.search(folded) if pattern else None
+    start = max(0, first.start() - length // 4) if first else 0
+    if start:
+        space = text.rfind(' ', 0, start)
+        start = space + 1 if space != -1 else start
+    end = min(len(text), start + length)
+    parts = ['…'] if start else []
+    position = start
+    for match in (pattern.finditer(folded, start, end) if pattern else ()):
+        parts.append(escape(text[position:match.start()]))
+        parts.append(Markup('<mark>%s</mark>') % text[match.start():match.end()])
+        position = match.end()
+    parts.append(escape(text[position:end]))
+    if end < len(text):
+        parts.append('…')
+    return Markup('').join(parts)
+
+
+ARTICLE_LIST_COLUMNS = '''a.id, a.title, a.summary, a.author_id, a.category_id, a.tags,
+               a.views, a.likes, a.comment_count, a.created_at'''
+NEWEST_FIRST = [('a.created_at', 'created_at'), ('a.id', 'id')]
+COMMENTS_NEWEST_FIRST = [('c.created_at', 'created_at'), ('c.id', 'id')]
+FEED_KEYS = {
+    'popular': [('r.score', 'score'), ('r.article_id', 'id')],
+    'new': NEWEST_FIRST,
+}
+SEARCH_RANK = 'bm25(articles_fts, 10.0, 5.0, 1.0)'
+FULL_SCAN_OK = '/* full-scan-ok */'
+
+
+def encode_cursor(values):
+    """Sayfalama anahtarını URL'de taşınabilir bir imlece dönüştür"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size=None):
+    """İmleci çöz; boş, geçersiz veya size uzunluğunda değilse None döndür
+
+    Yalnızca str, int ve float değerler kabul edilir; değerler doğrudan SQL
+    parametresi olarak kullanıldığı için liste ya da sözlük içeren imleçler reddedilir.
+    """
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        return None
+    if not isinstance(values, list) or (size is not None and len(values) != size):
+        return None
+    if not all(isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in values):
+        return None
+    return values
+
+
+def paginate(db, query, params, keys, cursor=None, limit=20, descending=True):
+    """Anahtar kümesi (keyset) sayfalaması uygula
+
+    query bir WHERE koşuluyla bitmelidir; keys (sql ifadesi, sütun adı) çiftleridir
+    ve son anahtar benzersiz olmalıdır. (satırlar, sonraki imleç) döndürür.
+    """
+    params = list(params)
+    values = decode_cursor(cursor, len(keys))
+    if values is not None:
+        columns = ', '.join(expr for expr, _ in keys)
+        placeholders = ', '.join('?' * len(keys))
+        query += f" AND ({columns}) {'<' if descending else '>'} ({placeholders})"
+        params.extend(values)
+    direction = 'DESC' if descending else 'ASC'
+    query += ' ORDER BY ' + ', '.join(f'{expr} {direction}' for expr, _ in keys) + ' LIMIT ?'
+    params.append(limit + 1)
+    rows = db.execute(query, params).fetchall()
+    if len(rows) <= limit:
+        return rows, None
+    return rows[:limit], encode_cursor([rows[limit - 1][column] for _, column in keys])
+
+
+def page_limit(default=None):
+    """İstekteki limit parametresini PAGE_SIZE_MAX ile sınırla"""
+    limit = request.args.get('limit', default or app.config['PAGE_SIZE'], type=int)
+    return max(1, min(limit, app.config['PAGE_SIZE_MAX']))
+
+
+def ranking_score(likes, views, age_hours):
+    """RANKING_WEIGHTS ile puan hesapla; RANKING_HALF_LIFE_HOURS verilmişse yaşa göre sönümle"""
+    weights = app.config['RANKING_WEIGHTS']
+    score = (likes or 0) * weights['likes'] + (views or 0) * weights['views']
+    half_life = app.config['RANKING_HALF_LIFE_HOURS']
+    if half_life and age_hours is not None:
+        score *= 0.5 ** (max(age_hours, 0.0) / half_life)
+    return score
+
+
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+
+def prometheus_labels(names, values):
+    """Etiketleri Prometheus metin biçiminde {ad="değer",...} olarak yaz"""
+    if not names:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+class Histogram:
+    """Etiket değerleri başına kovalı, iş parçacığı güvenli Prometheus histogramı"""
+
+    def __init__(self, name, description, labels=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        with self._lock:
+            snapshot = [(labels, list(counts), total, count)
+                        for labels, (counts, total, count) in self._series.items()]
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} histogram']
+        bounds = [f'{bound:g}' for bound in self.buckets] + ['+Inf']
+        for labels, counts, total, count in sorted(snapshot):
+            cumulative = 0
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{prometheus_labels(self.labels + ("le",), labels + (bound,))} '
+                             f'{cumulative}')
+            lines.append(f'{self.name}_sum{prometheus_labels(self.labels, labels)} {total:.6f}')
+            lines.append(f'{self.name}_count{prometheus_labels(self.labels, labels)} {count}')
+        return lines
+
+
+REQUEST_DURATION = Histogram('verbum_request_duration_seconds', 'İstek işleme süresi',
+                             ('endpoint', 'method', 'status'))
+SQL_DURATION = Histogram('verbum_sql_duration_seconds', 'SQL ifadesi süresi (execute çağrısı)', ('query',))
+SQL_PER_REQUEST = Histogram('verbum_sql_statements_per_request', 'İstek başına SQL ifadesi sayısı',
+                            ('endpoint',), COUNT_BUCKETS)
+AI_DURATION = Histogram('verbum_ai_duration_seconds', 'Yapay zekâ hesaplama süresi (önbellek ıskaları)',
+                        ('operation',))
+TEMPLATE_DURATION = Histogram('verbum_template_render_seconds', 'Şablon işleme süresi', ('template',))
+METRIC_HISTOGRAMS = [REQUEST_DURATION, SQL_DURATION, SQL_PER_REQUEST, AI_DURATION, TEMPLATE_DURATION]
+
+SQL_TABLE_RE = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE)\s+(?!OF\b)(\w+)', re.IGNORECASE)
+_sql_fingerprints = {}
+
+
+def sql_fingerprint(sql):
+    """Sorguyu etiket olarak kullanılabilecek kısa bir biçime indirger: 'SELECT articles,users'
+
+    Parametre sayısı değişen IN (...) sorguları aynı parmak izine düşer; önbellek
+    bu yüzden küçük kalır, yine de 1000 sorguyu aşarsa sıfırlanır.
+    """
+    fingerprint = _sql_fingerprints.get(sql)
+    if fingerprint is None:
+        if len(_sql_fingerprints) >= 1000:
+            _sql_fingerprints.clear()
+        verb = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+        tables = dict.fromkeys(table.lower() for table in SQL_TABLE_RE.findall(sql))
+        fingerprint = _sql_fingerprints[sql] = f"{verb} {','.join(tables)}".strip()
+    return fingerprint
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """execute çağrılarının süresini bağlantısına bildiren imleç"""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.connection.record(sql, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self.connection.record(sql, time.perf_counter() - started)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """SQL ifadelerini sayan ve süreleyen bağlantı; METRICS_ENABLED açıkken connect_db bunu kullanır
+
+    Ölçülen süre execute çağrısıdır (hazırlama ve ilk satır); sayfalı sorgularda
+    işin neredeyse tamamı budur. İstek başına sayaçlar get_db'de sıfırlanır.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.statements = 0
+        self.sql_seconds = 0.0
+        self.timings = []
+
+    def record(self, sql, seconds):
+        fingerprint = sql_fingerprint(sql)
+        SQL_DURATION.observe(seconds, fingerprint)
+        self.statements += 1
+        self.sql_seconds += seconds
+        if app.config['SLOW_REQUEST_MS'] is not None and len(self.timings) < 256:
+            self.timings.append((seconds, fingerprint))
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+@contextlib.contextmanager
+def timed_ai(operation):
+    """Bloğun süresini AI_DURATION'a ve varsa isteğin yavaş istek kaydına ekle"""
+    if not app.config['METRICS_ENABLED']:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        AI_DURATION.observe(elapsed, operation)
+        if has_app_context():
+            g.ai_seconds = g.get('ai_seconds', 0.0) + elapsed
+
+
+def connect_db(database=None):
+    """app.config'teki PRAGMA ayarlarıyla yeni bir SQLite bağlantısı aç"""
+    conn = sqlite3.connect(database or app.config['DATABASE'],
+                           timeout=app.config['DB_BUSY_TIMEOUT'] / 1000,
+                           check_same_thread=False,
+                           factory=InstrumentedConnection if app.config['METRICS_ENABLED'] else sqlite3.Connection)
     conn.row_factory = sqlite3.Row
+    conn.create_function('ranking_score', 3, ranking_score)
+    conn.execute(f"PRAGMA journal_mode = {app.config['DB_JOURNAL_MODE']}")
+    conn.execute(f"PRAGMA synchronous = {app.config['DB_SYNCHRONOUS']}")
+    conn.execute(f"PRAGMA busy_timeout = {int(app.config['DB_BUSY_TIMEOUT'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(app.config['DB_MMAP_SIZE'])}")
+    conn.execute(f"PRAGMA cache_size = {int(app.config['DB_CACHE_SIZE'])}")
     return conn
 
+
+class ConnectionPool:
+    """En fazla max_size bağlantı açan, iş parçacığı güvenli SQLite bağlantı havuzu"""
+
+    def __init__(self, connect, max_size=8, timeout=10.0):
+        self._connect = connect
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self.max_size = max_size
+        self.timeout = timeout
+
+    def acquire(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise RuntimeError('Veritabanı bağlantı havuzunda boş bağlantı kalmadı')
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.set_trace_callback(None)
+        except sqlite3.Error:
+            conn.close()
+        else:
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    @contextlib.contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_db_pools = {}
+_db_pools_lock = threading.Lock()
+
+
+def get_pool(database=None):
+    """Veritabanı dosyası başına tek bir bağlantı havuzu döndür"""
+    database = database or app.config['DATABASE']
+    pool = _db_pools.get(database)
+    if pool is None:
+        with _db_pools_lock:
+            pool = _db_pools.get(database)
+            if pool is None:
+                pool = ConnectionPool(lambda: connect_db(database),
+                                      max_size=app.config['DB_POOL_SIZE'],
+                                      timeout=app.config['DB_POOL_TIMEOUT'])
+                _db_pools[database] = pool
+    return pool
+
+
+def close_pool(database=None):
+    """Havuzdaki boştaki bağlantıları kapat ve havuzu unut"""
+    with _db_pools_lock:
+        pool = _db_pools.pop(database or app.config['DATABASE'], None)
+    if pool is not None:
+        pool.close()
+
+
+def get_db():
+    """İstek boyunca paylaşılan, havuzdan alınmış bağlantıyı döndür
+
+    Uygulama bağlamı dışında çağrılırsa çağıranın kapatması gereken yeni bir bağlantı açar.
+    """
+    if not has_app_context():
+        return connect_db()
+    if 'db' not in g:
+        g.db_pool = get_pool()
+        g.db = g.db_pool.acquire()
+        if isinstance(g.db, InstrumentedConnection):
+            g.db.reset_stats()
+        if app.config.get('SQL_TRACE'):
+            g.db.set_trace_callback(app.config['SQL_TRACE'])
+    return g.db
+
+
+@contextlib.contextmanager
+def caller_connection(db=None):
+    """Çağıranın tuttuğu bağlantıyı kullan; verilmediyse havuzdan bir bağlantı al
+
+    İstek ve iş işleyicileri zaten bir bağlantı tutar; ikinci bir bağlantı
+    beklemek yoğunlukta havuzu tüketip DB_POOL_TIMEOUT'a takılabilir.
+    """
+    if db is not None:
+        yield db
+        return
+    with get_pool().connection() as db:
+        yield db
+
+
+@app.teardown_appcontext
+def close_db(exception=None):
+    db = g.pop('db', None)
+    if db is not None:
+        g.pop('db_pool').release(db)
+
 def init_db():
     with app.app_context():
         db = get_db()
@@ -124,113 +683,2033 @@ def init_db():
             cursor.execute('INSERT OR IGNORE INTO categories (name, description) VALUES (?, ?)', category)
         
         db.commit()
+        migrate(db)
+    ai_assistant.reload_categories()
+
+
+MIGRATIONS = []
+
+
+def migration(version):
+    """Fonksiyonu verilen PRAGMA user_version sürümüne götüren şema göçü olarak kaydet"""
+    def register(fn):
+        MIGRATIONS.append((version, fn))
+        return fn
+    return register
+
+
+def migrate(db):
+    """Bekleyen göçleri sırayla, her birini kendi IMMEDIATE işleminde uygula
+
+    Aynı anda açılan işçiler kilidi sırayla alır; sürüm kilit alındıktan sonra
+    yeniden okunduğu için her göç yalnızca bir kez çalışır.
+    """
+    isolation_level = db.isolation_level
+    db.isolation_level = None
+    try:
+        for version, fn in sorted(MIGRATIONS, key=lambda item: item[0]):
+            if db.execute('PRAGMA user_version').fetchone()[0] >= version:
+                continue
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                if db.execute('PRAGMA user_version').fetchone()[0] < version:
+                    fn(db)
+                    db.execute(f'PRAGMA user_version = {int(version)}')
+                db.execute('COMMIT')
+            except Exception:
+                db.execute('ROLLBACK')
+                raise
+    finally:
+        db.isolation_level = isolation_level
+
+
+@migration(1)
+def create_article_vectors(db):
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS article_vectors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER UNIQUE NOT NULL,
+            terms BLOB NOT NULL,
+            weights BLOB NOT NULL,
+            FOREIGN KEY (article_id) REFERENCES articles (id)
+        )
+    ''')
+
+
+@migration(2)
+def create_articles_fts(db):
+    db.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, tags, content,
+            tokenize = "unicode61 remove_diacritics 0"
+        )
+    ''')
+    # Katlama Python'da yapıldığı için ekleme ve güncellemede index_articles_fts()
+    # çağrılır; silme tetikleyicisi düz SQL olduğundan her bağlantıda çalışır
+    db.execute('''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM articles_fts WHERE rowid = old.id;
+        END
+    ''')
+    db.execute('DELETE FROM articles_fts')
+    index_articles_fts(db)
+
+
+@migration(3)
+def create_hot_query_indexes(db):
+    """Sıcak sorguların filtre ve sıralama sütunları için indeksler
+
+    likes(article_id, user_id) için UNIQUE kısıtının otomatik indeksi zaten vardır.
+    """
+    db.execute('CREATE INDEX IF NOT EXISTS idx_articles_created_at ON articles (created_at)')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_articles_category_created_at ON articles (category_id, created_at)')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_articles_author_created_at ON articles (author_id, created_at)')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_comments_article_created_at ON comments (article_id, created_at)')
+
+
+@migration(4)
+def create_article_rankings(db):
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS article_rankings (
+            article_id INTEGER PRIMARY KEY,
+            category_id INTEGER,
+            score REAL NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (article_id) REFERENCES articles (id),
+            FOREIGN KEY (category_id) REFERENCES categories (id)
+        )
+    ''')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_article_rankings_score ON article_rankings (score)')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_article_rankings_category_score ON article_rankings (category_id, score)')
+    refresh_rankings(db)
+
+
+RANKING_UPSERT = '''
+    INSERT OR REPLACE INTO article_rankings (article_id, category_id, score, updated_at)
+    SELECT id, category_id,
+           ranking_score(likes, views, (julianday('now') - julianday(created_at)) * 24),
+           CURRENT_TIMESTAMP
+    FROM articles
+'''
+
+
+def refresh_rankings(db):
+    """Tüm makalelerin sıralama puanını yeniden hesapla (işlemi çağıran onaylar)"""
+    db.execute(RANKING_UPSERT + FULL_SCAN_OK)
+
+
+def update_rankings(db, article_ids):
+    """Yalnızca verilen makalelerin sıralama puanını güncelle (işlemi çağıran onaylar)"""
+    article_ids = list(article_ids)
+    for start in range(0, len(article_ids), 500):
+        chunk = article_ids[start:start + 500]
+        db.execute(RANKING_UPSERT + f" WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+
+
+@migration(5)
+def create_jobs(db):
+    """Arka plan iş kuyruğu; çalışan işlerde run_after kiranın bitiş zamanıdır"""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending' CHECK(status IN ('pending', 'running', 'done', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            run_after REAL NOT NULL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        )
+    ''')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs (status, run_after)')
+
+
+@migration(6)
+def create_related_articles(db):
+    """compute-related komutunun önceden hesapladığı komşu listeleri"""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS related_articles (
+            article_id INTEGER NOT NULL,
+            rank INTEGER NOT NULL,
+            related_id INTEGER NOT NULL,
+            score REAL NOT NULL,
+            PRIMARY KEY (article_id, rank)
+        ) WITHOUT ROWID
+    ''')
+
+
+DEFAULT_CATEGORY_KEYWORDS = {
+    'Roman': ['roman', 'hikaye', 'kurgu', 'kahraman'],
+    'Şiir': ['şiir', 'dize', 'kafiye', 'nazım'],
+    'Bilim Kurgu': ['uzay', 'gelecek', 'teknoloji', 'robot', 'alien'],
+    'Tarih': ['tarih', 'geçmiş', 'savaş', 'osmanlı', 'cumhuriyet'],
+    'Kişisel Gelişim': ['gelişim', 'başarı', 'motivasyon', 'hedef'],
+}
+
+
+@migration(7)
+def add_category_keywords(db):
+    """suggest_category'nin anahtar kelimeleri koddan categories tablosuna taşınır (virgülle ayrılmış)"""
+    db.execute('ALTER TABLE categories ADD COLUMN keywords TEXT')
+    db.executemany('UPDATE categories SET keywords = ? WHERE name = ?',
+                   [(','.join(words), name) for name, words in DEFAULT_CATEGORY_KEYWORDS.items()])
+
+
+@migration(8)
+def create_ai_memo(db):
+    """AI_MEMO_PERSIST açıkken özet ve kategori sonuçlarının kalıcı kopyası (anahtar: içerik özeti)"""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS ai_memo (
+            key TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            value TEXT NOT NULL,
+            created_at REAL NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    db.execute('CREATE INDEX IF NOT EXISTS idx_ai_memo_created_at ON ai_memo (created_at)')
+
+
+def content_hash(*parts):
+    """Parçaların SHA-256 özeti; uzunluk önekleri farklı bölünmelerin çakışmasını önler"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = str(part).encode('utf-8', 'surrogatepass')
+        digest.update(b'%d:' % len(data))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def reconcile_like_counts(db):
+    """articles.likes sayaçlarını likes tablosundan toplu yeniden say; düzeltilen makale kimliklerini döndür
+
+    Yalnızca sayacı tutmayan satırlar güncellenir (işlemi çağıran onaylar).
+    """
+    rows = db.execute(f'''
+        UPDATE articles SET likes = (SELECT COUNT(*) FROM likes WHERE likes.article_id = articles.id)
+        WHERE likes IS NOT (SELECT COUNT(*) FROM likes WHERE likes.article_id = articles.id) {FULL_SCAN_OK}
+        RETURNING id
+    ''').fetchall()
+    return [row['id'] for row in rows]
+
+
+@migration(9)
+def recount_likes(db):
+    """Eski beğeni akışının kaydırdığı articles.likes sayaçlarını bir kez yeniden say"""
+    update_rankings(db, reconcile_like_counts(db))
+
+
+@migration(10)
+def add_comment_count(db):
+    """articles.comment_count, yorum ekleme ve silmeyle aynı ifadede güncellenir"""
+    db.execute('ALTER TABLE articles ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0')
+    db.execute(f'''
+        UPDATE articles SET comment_count = (SELECT COUNT(*) FROM comments WHERE comments.article_id = articles.id)
+        {FULL_SCAN_OK}
+    ''')
+    db.execute('''
+        CREATE TRIGGER IF NOT EXISTS comments_count_insert AFTER INSERT ON comments BEGIN
+            UPDATE articles SET comment_count = comment_count + 1 WHERE id = NEW.article_id;
+        END
+    ''')
+    db.execute('''
+        CREATE TRIGGER IF NOT EXISTS comments_count_delete AFTER DELETE ON comments BEGIN
+            UPDATE articles SET comment_count = comment_count - 1 WHERE id = OLD.article_id;
+        END
+    ''')
+
+
+@migration(11)
+def clear_summary_memo(db):
+    """lead özetleri artık noktalamayı koruyor ve '...' eklemiyor; eski biçimdeki kayıtlar silinir"""
+    db.execute(f"DELETE FROM ai_memo WHERE kind = 'summary' {FULL_SCAN_OK}")
+
+
+def load_stop_words(language='turkish'):
+    """NLTK durak kelimelerini yükle; AI_OFFLINE açıkken eksik veri indirilmez"""
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        if app.config['AI_OFFLINE']:
+            app.logger.warning('NLTK stopwords verisi yok ve AI_OFFLINE açık; durak kelimesi listesi boş.')
+            return set()
+        nltk.download('stopwords', quiet=True)
+    return set(nltk.corpus.stopwords.words(language))
+
+
+def prefix_tree_regex(words):
+    """Kelimeleri ortak öneklerini paylaşan tek bir düzenli ifadeye (önek ağacı) derle
+
+    re motoru düz bir alternation'daki seçenekleri sırayla dener, yani maliyet
+    kelime sayısıyla büyür; önek ağacında her konumda en fazla en uzun kelime
+    kadar adım atılır. Açgözlü eşleşme aynı konumdaki en uzun kelimeyi seçer.
+    """
+    tree = {}
+    for word in words:
+        node = tree
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = None
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return emit(tree)
+
+
+class KeywordMatcher:
+    """Kategori anahtar kelimelerini tek bir düzenli ifadede birleştirip metni tek geçişte puanlar
+
+    Eşleşme kelime başında aranır: Türkçe ekli biçimler (robot → robotlar) yakalanır,
+    kelime ortasındaki rastlantısal eşleşmeler (ör. "roman" → "kromanyon") yakalanmaz.
+    Metin ve anahtar kelimeler Türkçe kurallarıyla küçük harfe çevrilir.
+    """
+
+    def __init__(self, keywords):
+        self.categories = list(keywords)
+        self.by_keyword = {}
+        for category, words in keywords.items():
+            for word in words:
+                word = turkish_lower(word.strip())
+                if word and category not in self.by_keyword.setdefault(word, []):
+                    self.by_keyword[word].append(category)
+        self.pattern = re.compile(r'\b' + prefix_tree_regex(self.by_keyword)) if self.by_keyword else None
+
+    def scores(self, text):
+        """Kategori başına metinde geçen farklı anahtar kelime sayısı (tablo sırasıyla)"""
+        if self.pattern is None:
+            return {}
+        counts = {}
+        for word in set(self.pattern.findall(turkish_lower(text))):
+            for category in self.by_keyword[word]:
+                counts[category] = counts.get(category, 0) + 1
+        return {category: counts[category] for category in self.categories if category in counts}
+
+    def best(self, text, default=None):
+        scores = self.scores(text)
+        return max(scores, key=scores.get) if scores else default
+
+
+class KeywordEngine:
+    """categories.keywords sütunundan derlenen eşleyiciyle kategori kimliği tahmini
+
+    Güven, en iyi kategorinin eşleşen anahtar kelimeler içindeki payıdır.
+    """
+
+    def __init__(self, matcher, names, version=None):
+        self.matcher = matcher
+        self.names = names
+        self.version = version
+
+    @staticmethod
+    def rows(db):
+        return db.execute('SELECT id, name, keywords FROM categories ORDER BY id').fetchall()
+
+    @staticmethod
+    def version_of(rows):
+        """Kategori adları ve anahtar kelimelerinden türetilen sürüm"""
+        return 'keywords:' + content_hash(*(f"{row['id']}={row['name']}={row['keywords']}" for row in rows))[:16]
+
+    @classmethod
+    def from_rows(cls, rows):
+        return cls(KeywordMatcher({row['id']: row['keywords'].split(',') for row in rows if row['keywords']}),
+                   {row['id']: row['name'] for row in rows},
+                   cls.version_of(rows))
+
+    @classmethod
+    def from_db(cls, db):
+        return cls.from_rows(cls.rows(db))
+
+    def classify(self, texts):
+        results = []
+        for text in texts:
+            scores = self.matcher.scores(text)
+            if not scores:
+                results.append((None, 0.0))
+                continue
+            best = max(scores, key=scores.get)
+            results.append((best, scores[best] / sum(scores.values())))
+        return results
+
+
+class CategoryModel:
+    """Özetlenmiş (hashed) kelime ve kelime ikilisi özellikleri üzerinde doğrusal sınıflandırıcı
+
+    Kategorisi belli makalelerle eğitilip diske yazılır; classify() bir grubun
+    tamamını tek predict_proba çağrısıyla sınıflandırır.
+    """
+
+    def __init__(self, stop_words=(), n_features=2 ** 20):
+        self.vectorizer = sklearn_text.HashingVectorizer(n_features=n_features,
+                                                         preprocessor=turkish_lower,
+                                                         stop_words=sorted(stop_words) or None,
+                                                         ngram_range=(1, 2),
+                                                         alternate_sign=False,
+                                                         dtype=np.float32)
+        self.classifier = None
+        self.samples = 0
+        self.accuracy = None
+        self.trained_at = None
+        self.version = None
+
+    def _classifier(self):
+        return sklearn_linear_model.SGDClassifier(loss='log_loss', alpha=1e-5, max_iter=30, tol=None,
+                                                  random_state=0)
+
+    def fit(self, features, labels, holdout=0.1, seed=0):
+        """Önce ayrılan holdout payında doğruluğu ölç, sonra tüm veriyle yeniden eğit"""
+        labels = np.asarray(labels)
+        if len(np.unique(labels)) < 2:
+            raise ValueError('Eğitim için en az iki kategoride makale gerekli.')
+        if holdout and len(labels) >= 20:
+            order = np.random.default_rng(seed).permutation(len(labels))
+            cut = max(1, int(len(labels) * holdout))
+            test, train = order[:cut], order[cut:]
+            classifier = self._classifier().fit(features[train], labels[train])
+            self.accuracy = float(np.mean(classifier.predict(features[test]) == labels[test]))
+        self.classifier = self._classifier().fit(features, labels)
+        self.samples = len(labels)
+        self.trained_at = datetime.now().isoformat(timespec='seconds')
+        self.version = 'model:' + uuid.uuid4().hex[:16]
+        return self
+
+    def classify(self, texts):
+        probabilities = self.classifier.predict_proba(self.vectorizer.transform(texts))
+        best = probabilities.argmax(axis=1)
+        return [(int(self.classifier.classes_[i]), float(probabilities[row, i])) for row, i in enumerate(best)]
+
+    def save(self, path):
+        temporary = f'{path}.tmp'
+        joblib.dump(self, temporary)
+        os.replace(temporary, path)
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
+
+
+def train_category_model(db, holdout=0.1, batch_size=1000):
+    """Kategorisi belli makalelerden yeni bir CategoryModel eğit (kaydetmez)"""
+    model = CategoryModel(ai_assistant.stop_words)
+    cursor = db.execute(f'''
+        SELECT title, content, category_id {FULL_SCAN_OK}
+        FROM articles WHERE category_id IS NOT NULL
+    ''')
+    features, labels = [], []
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        features.append(model.vectorizer.transform([f'{row[0]} {row[1]}' for row in batch]))
+        labels.extend(row[2] for row in batch)
+    if not features:
+        raise ValueError('Kategorisi belli makale yok.')
+    return model.fit(sparse.vstack(features, format='csr'), labels, holdout)
+
+
+SUMMARY_ENGINES = ('lead', 'tfidf', 'textrank')
+SENTENCE_END_RE = re.compile(r'[.!?]+(?=\s)')
+
+
+def iter_sentences(chunks, max_chars=1000):
+    """Metin parçalarından cümleleri sırayla üret
+
+    Parça sınırında bölünen cümleler birleştirilir; noktalama içermeyen çok uzun
+    metinler max_chars civarında boşluktan bölünür, böylece tampon sınırlı kalır.
+    """
+    tail = ''
+    for chunk in chunks:
+        text = tail + chunk
+        start = 0
+        for match in SENTENCE_END_RE.finditer(text):
+            sentence = text[start:match.end()].strip()
+            start = match.end()
+            if WORD_RE.search(sentence):
+                yield from _split_long_sentence(sentence, max_chars)
+        tail = text[start:]
+        while len(tail) > 2 * max_chars:
+            cut = tail.rfind(' ', 0, max_chars) + 1 or max_chars
+            piece, tail = tail[:cut].strip(), tail[cut:]
+            if WORD_RE.search(piece):
+                yield piece
+    tail = tail.strip()
+    if WORD_RE.search(tail):
+        yield from _split_long_sentence(tail, max_chars)
+
+
+def _split_long_sentence(sentence, max_chars):
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(' ', 0, max_chars) + 1 or max_chars
+        yield sentence[:cut].strip()
+        sentence = sentence[cut:].strip()
+    if sentence:
+        yield sentence
+
+
+class ExtractiveSummarizer:
+    """Cümleleri belgenin TF-IDF merkezine benzerliğiyle (ya da TextRank ile) seçen özetleyici
+
+    Metin parça parça işlenir: terim istatistikleri sabit boyutlu özetlenmiş
+    (hashed) vektörlerde tutulur ve bellekte yalnızca en iyi `candidates` cümle
+    kalır, yani bellek kullanımı metin uzunluğundan bağımsızdır. Her partide
+    adaylar güncel istatistiklerle yeniden puanlanır; textrank yöntemi son
+    aday kümesinin benzerlik grafiği üzerinde PageRank uygular.
+    """
+
+    def __init__(self, method='tfidf', stop_words=(), n_features=2 ** 16, candidates=64, batch_size=256):
+        self.method = method
+        self.candidates = candidates
+        self.batch_size = batch_size
+        self.n_features = n_features
+        self.vectorizer = sklearn_text.HashingVectorizer(n_features=n_features,
+                                                         preprocessor=turkish_lower,
+                                                         stop_words=sorted(stop_words) or None,
+                                                         alternate_sign=False,
+                                                         norm=None,
+                                                         dtype=np.float32)
+
+    def summarize(self, chunks, max_sentences=3):
+        """Metin parçalarından en fazla max_sentences cümlelik özet üret (metindeki sırayla)"""
+        term_totals = np.zeros(self.n_features, dtype=np.float64)
+        df = np.zeros(self.n_features, dtype=np.int64)
+        seen = 0
+        kept_sentences, kept_positions, kept_tf = [], np.zeros(0, dtype=np.int64), None
+        for batch in chunked(iter_sentences(chunks), self.batch_size):
+            tf = self.vectorizer.transform(batch).tocsr()
+            tf.data = (1.0 + np.log(tf.data)).astype(np.float32)
+            df += np.bincount(tf.indices, minlength=self.n_features)
+            term_totals += np.asarray(tf.sum(axis=0)).ravel()
+            positions = np.arange(seen, seen + len(batch))
+            seen += len(batch)
+            if kept_tf is not None:
+                tf = sparse.vstack([kept_tf, tf], format='csr')
+                batch = kept_sentences + batch
+                positions = np.concatenate([kept_positions, positions])
+            if len(batch) > self.candidates:
+                scores = self._centroid_scores(tf, term_totals, df, seen)
+                top = np.sort(np.argpartition(-scores, self.candidates - 1)[:self.candidates])
+                tf, positions, batch = tf[top], positions[top], [batch[i] for i in top]
+            kept_tf, kept_positions, kept_sentences = tf, positions, batch
+        if not kept_sentences:
+            return ''
+        if len(kept_sentences) <= max_sentences:
+            return ' '.join(kept_sentences)
+        if self.method == 'textrank':
+            scores = self._textrank_scores(self._weigh(kept_tf, df, seen))
+        else:
+            scores = self._centroid_scores(kept_tf, term_totals, df, seen)
+        top = np.sort(np.argsort(-scores, kind='stable')[:max_sentences])
+        return ' '.join(kept_sentences[i] for i in top)
+
+    def summarize_many(self, texts, max_sentences=3):
+        """Birden çok metni tek geçişte özetle
+
+        Tüm cümleler tek vektörleştirme çağrısıyla belirteçlenir; her cümle kendi
+        belgesinin istatistikleriyle ağırlıklandırılır ve puanlanır, yani sonuç
+        summarize() ile aynıdır. batch_size'dan uzun metinler summarize() ile
+        akış halinde işlenir.
+        """
+        documents = [list(iter_sentences([text])) for text in texts]
+        summaries = []
+        for text, document in zip(texts, documents):
+            summaries.append(self.summarize([text], max_sentences) if len(document) > self.batch_size else '')
+        short = [i for i, document in enumerate(documents) if 0 < len(document) <= self.batch_size]
+        if not short:
+            return summaries
+        counts = np.array([len(documents[i]) for i in short])
+        tf = self.vectorizer.transform([sentence for i in short for sentence in documents[i]]).tocsr()
+        tf.data = (1.0 + np.log(tf.data)).astype(np.float32)
+        weighted, scores = self._batch_scores(tf, np.repeat(np.arange(len(short)), counts), counts)
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        for j, i in enumerate(short):
+            rows = slice(bounds[j], bounds[j + 1])
+            summaries[i] = self._pick(documents[i], weighted[rows], scores[rows], max_sentences)
+        return summaries
+
+    def _batch_scores(self, tf, owner, counts):
+        """Birden çok belgenin cümleleri için ağırlıklı vektörler ve belge merkezine benzerlik
+
+        owner her satırın belgesi, counts belge başına cümle sayısıdır. (belge,
+        terim) çiftleri tek anahtara indirgenir; df, terim toplamları ve merkez
+        normları bincount ile hepsi için birlikte hesaplanır.
+        """
+        tf = tf.tocoo()
+        documents = owner[tf.row]
+        keys = documents.astype(np.int64) * self.n_features + tf.col
+        unique, inverse = np.unique(keys, return_inverse=True)
+        unique_documents = unique // self.n_features
+        df = np.bincount(inverse)
+        idf = np.log((1.0 + counts[unique_documents]) / (1.0 + df)) + 1.0
+        centroid = np.bincount(inverse, weights=tf.data) * idf
+        centroid_norms = np.sqrt(np.bincount(unique_documents, weights=centroid ** 2, minlength=len(counts)))
+        weights = tf.data * idf[inverse]
+        row_norms = np.sqrt(np.bincount(tf.row, weights=weights ** 2, minlength=tf.shape[0]))
+        weights /= np.where(row_norms > 0, row_norms, 1.0)[tf.row]
+        similarity = weights * centroid[inverse] / np.where(centroid_norms > 0, centroid_norms, 1.0)[documents]
+        scores = np.bincount(tf.row, weights=similarity, minlength=tf.shape[0])
+        weighted = sparse.csr_matrix((weights.astype(np.float32), (tf.row, tf.col)), shape=tf.shape)
+        return weighted, scores
+
+    def _pick(self, sentences, weighted, scores, max_sentences):
+        if len(sentences) <= max_sentences:
+            return ' '.join(sentences)
+        if self.method == 'textrank':
+            if len(sentences) > self.candidates:
+                top = np.sort(np.argpartition(-scores, self.candidates - 1)[:self.candidates])
+                weighted, sentences = weighted[top], [sentences[i] for i in top]
+            scores = self._textrank_scores(weighted)
+        top = np.sort(np.argsort(-scores, kind='stable')[:max_sentences])
+        return ' '.join(sentences[i] for i in top)
+
+    @staticmethod
+    def _idf(df, documents):
+        return (np.log((1.0 + documents) / (1.0 + df)) + 1.0).astype(np.float32)
+
+    def _weigh(self, tf, df, documents):
+        weighted = tf.multiply(self._idf(df, documents)).tocsr()
+        return sklearn_preprocessing.normalize(weighted, copy=False)
+
+    def _centroid_scores(self, tf, term_totals, df, documents):
+        idf = self._idf(df, documents)
+        centroid = (term_totals * idf).astype(np.float32)
+        norm = np.linalg.norm(centroid)
+        if not norm:
+            return np.zeros(tf.shape[0], dtype=np.float32)
+        return np.asarray(self._weigh(tf, df, documents) @ (centroid / norm)).ravel()
+
+    @staticmethod
+    def _textrank_scores(weighted, damping=0.85, iterations=50, tolerance=1e-6):
+        similarity = np.asarray((weighted @ weighted.T).todense(), dtype=np.float64)
+        np.fill_diagonal(similarity, 0.0)
+        totals = similarity.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        transition = similarity / totals
+        n = len(similarity)
+        scores = np.full(n, 1.0 / n)
+        for _ in range(iterations):
+            updated = (1 - damping) / n + damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < tolerance:
+                return updated
+            scores = updated
+        return scores
 
 
 class AIAssistant:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('turkish'))
+    def __init__(self, memo=None):
+        self.memo = memo
+        self._stop_words = None
+        self._keywords = None
+        self._keywords_checked = 0.0
+        self._model = None
+        self._model_mtime = None
+        self._lock = threading.Lock()
+
+    @property
+    def stop_words(self):
+        if self._stop_words is None:
+            with self._lock:
+                if self._stop_words is None:
+                    self._stop_words = load_stop_words()
+        return self._stop_words
         
-    def generate_summary(self, text, max_sentences=3):
-        """Metinden özet oluştur"""
-        try:
-            
-            sentences = re.split(r'[.!?]+', text)
-            sentences = [s.strip() for s in sentences if s.strip()]
-            
-            if len(sentences) <= max_sentences:
-                return ' '.join(sentences)
-            else:
-                return ' '.join(sentences[:max_sentences]) + '...'
-        except:
-            return text[:200] + '...' if len(text) > 200 else text
+    def memoized(self, kind, parts_list, compute, db=None):
+        """Sonuçları memo varsa içerik özetiyle önbellekten ver
+
+        compute, önbellekte bulunmayan sıraların listesiyle bir kez çağrılır ve
+        aynı sırayla sonuç listesi döndürür. ai_memo çağıranın bağlantısıyla (db) kullanılır.
+        """
+        found = self.memo.get_many(kind, parts_list, db) if self.memo is not None else {}
+        missing = [i for i in range(len(parts_list)) if i not in found]
+        if missing:
+            with timed_ai(kind):
+                values = compute(missing)
+            found.update(zip(missing, values))
+            if self.memo is not None:
+                self.memo.set_many(kind, [(parts_list[i], found[i]) for i in missing], db)
+        return [found[i] for i in range(len(parts_list))]
+
+    def generate_summary(self, text, max_sentences=3, engine=None, db=None):
+        """Metinden özet oluştur (engine: lead, tfidf ya da textrank; varsayılan SUMMARY_ENGINE)"""
+        engine = engine or app.config['SUMMARY_ENGINE']
+        return self.memoized('summary', [(engine, max_sentences, text)],
+                             lambda missing: [self._generate_summary(text, max_sentences, engine)], db)[0]
+
+    def generate_summaries(self, texts, max_sentences=3, engine=None, db=None):
+        """Metinlerin özetleri; önbellekte olmayanlar tek vektörleştirme çağrısıyla hesaplanır"""
+        engine = engine or app.config['SUMMARY_ENGINE']
+
+        def compute(missing):
+            if engine == 'lead':
+                return [self._generate_summary(texts[i], max_sentences, engine) for i in missing]
+            summarizer = ExtractiveSummarizer(engine, self.stop_words)
+            return summarizer.summarize_many([texts[i] for i in missing], max_sentences)
+
+        return self.memoized('summary', [(engine, max_sentences, text) for text in texts], compute, db)
+
+    def _generate_summary(self, text, max_sentences, engine):
+        # JSON ve akış yolları aynı cümle bölücüyü ve çıktı biçimini kullanır
+        return self.summarize_stream([text], max_sentences, engine)
     
-    def find_similar_articles(self, article_content, all_articles, top_n=5):
-        """Benzer makaleleri bul"""
+    def summarize_stream(self, chunks, max_sentences=3, engine=None):
+        """Metni parça parça okuyarak özetle; bellek kullanımı metin uzunluğundan bağımsızdır"""
+        engine = engine or app.config['SUMMARY_ENGINE']
+        if engine == 'lead':
+            sentences = list(itertools.islice(iter_sentences(chunks), max_sentences))
+            return ' '.join(sentences)
+        return ExtractiveSummarizer(engine, self.stop_words).summarize(chunks, max_sentences)
+
+    def keyword_engine(self, db=None):
+        """categories tablosundan derlenen anahtar kelime motoru
+
+        Tablo en fazla CATEGORY_RELOAD_INTERVAL saniyede bir, çağıranın
+        bağlantısıyla (db) okunur; sürüm (ad ve anahtar kelimelerin özeti)
+        değiştiyse motor yeniden derlenir.
+        """
+        interval = app.config['CATEGORY_RELOAD_INTERVAL']
+        if self._keywords is None or time.monotonic() - self._keywords_checked >= interval:
+            with self._lock:
+                now = time.monotonic()
+                if self._keywords is None or now - self._keywords_checked >= interval:
+                    with caller_connection(db) as conn:
+                        rows = KeywordEngine.rows(conn)
+                    if self._keywords is None or self._keywords.version != KeywordEngine.version_of(rows):
+                        self._keywords = KeywordEngine.from_rows(rows)
+                    self._keywords_checked = now
+        return self._keywords
+
+    def reload_categories(self):
+        """Kategoriler ya da anahtar kelimeler değiştiğinde motoru bir sonraki çağrıda yeniden derle"""
+        self._keywords = None
+
+    def category_engine(self, db=None):
+        """CATEGORY_ENGINE ayarındaki motor; model dosyası yoksa anahtar kelime motoru
+
+        Model işçi başına bir kez yüklenir; dosya yeniden eğitimle değişirse
+        (değişiklik zamanı farklıysa) bir sonraki çağrıda tekrar okunur.
+        """
+        if app.config['CATEGORY_ENGINE'] == 'model':
+            model = self.load_category_model()
+            if model is not None:
+                return model
+        return self.keyword_engine(db)
+
+    def load_category_model(self):
+        """CATEGORY_MODEL_PATH'teki modeli (değiştiyse yeniden) yükle; dosya yoksa None
+
+        Veritabanına dokunmaz, bu yüzden fork öncesi de çağrılabilir.
+        """
         try:
-           
-            contents = [article_content] + [art['content'] for art in all_articles]
-            
-            
-            vectorizer = TfidfVectorizer(stop_words=list(self.stop_words))
-            tfidf_matrix = vectorizer.fit_transform(contents)
-            
-           
-            cosine_similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
-            
-            
-            similar_indices = cosine_similarities.argsort()[-top_n:][::-1]
-            
-           
-            similar_articles = []
-            for idx in similar_indices:
-                if cosine_similarities[idx] > 0.1: 
-                    similar_articles.append({
-                        'article': all_articles[idx],
-                        'similarity_score': float(cosine_similarities[idx])
-                    })
-            
-            return similar_articles
-        except Exception as e:
-            print(f"AI hatası: {e}")
+            mtime = os.path.getmtime(app.config['CATEGORY_MODEL_PATH'])
+        except OSError:
+            return None
+        if self._model_mtime != mtime:
+            with self._lock:
+                if self._model_mtime != mtime:
+                    self._model = CategoryModel.load(app.config['CATEGORY_MODEL_PATH'])
+                    self._model_mtime = mtime
+        return self._model
+
+    @staticmethod
+    def category_threshold(engine):
+        """CATEGORY_MIN_CONFIDENCE yalnızca model motoruna uygulanır
+
+        Anahtar kelime motoru eşleşme bulduğu her metne kategori önerir.
+        """
+        return app.config['CATEGORY_MIN_CONFIDENCE'] if isinstance(engine, CategoryModel) else 0.0
+
+    def classify_categories(self, items, db=None):
+        """(başlık, içerik) çiftlerini tek çağrıda sınıflandır: [(kategori_id ya da None, güven)]
+
+        Model motorunda güveni CATEGORY_MIN_CONFIDENCE altında kalan tahminler None döner.
+        """
+        if not items:
             return []
-    
-    def suggest_category(self, title, content):
+        engine = self.category_engine(db)
+        results = engine.classify([f'{title} {content}' for title, content in items])
+        threshold = self.category_threshold(engine)
+        return [(category_id if confidence >= threshold else None, confidence)
+                for category_id, confidence in results]
+
+    def predict_categories(self, items, db=None):
+        """classify_categories gibi; sonuçlar motor sürümüyle birlikte önbelleğe alınır"""
+        engine = self.category_engine(db)
+        version = getattr(engine, 'version', None)
+        threshold = self.category_threshold(engine)
+        results = self.memoized('category', [(version, threshold, title, content) for title, content in items],
+                                lambda missing: self.classify_categories([items[i] for i in missing], db), db)
+        return [(category_id, confidence) for category_id, confidence in results]
+
+    def predict_category(self, title, content, db=None):
+        """Tek metin için (kategori_id ya da None, güven)"""
+        return self.predict_categories([(title, content)], db)[0]
+
+    def suggest_category(self, title, content, db=None):
         """İçeriğe göre kategori öner"""
-       
-        keywords = {
-            'roman': ['roman', 'hikaye', 'kurgu', 'kahraman'],
-            'şiir': ['şiir', 'dize', 'kafiye', 'nazım'],
-            'bilim kurgu': ['uzay', 'gelecek', 'teknoloji', 'robot', 'alien'],
-            'tarih': ['tarih', 'geçmiş', 'savaş', 'osmanlı', 'cumhuriyet'],
-            'kişisel gelişim': ['gelişim', 'başarı', 'motivasyon', 'hedef']
+        category_id, _ = self.predict_category(title, content, db)
+        return self.keyword_engine(db).names.get(category_id, 'Diğer')
+
+class AnnIndex:
+    """Rastgele izdüşüm ve kümelenmiş ters listelerle (IVF) yaklaşık en yakın komşu araması"""
+
+    def __init__(self, matrix, dim=128, n_lists=None, n_probe=8, seed=0, train_size=20000, iterations=8):
+        self.source = matrix
+        self.matrix = matrix.tocsr()
+        self.size = self.matrix.shape[0]
+        self.n_probe = n_probe
+        rng = np.random.default_rng(seed)
+        self.projection = self._projection(self.matrix.shape[1], dim, rng)
+        embeddings = self.embed(self.matrix)
+        n_lists = min(n_lists or max(1, int(4 * np.sqrt(self.size))), self.size)
+        self.centroids = self._kmeans(embeddings, n_lists, rng, train_size, iterations)
+        assignments = self._assign(embeddings)
+        self.order = np.argsort(assignments, kind='stable')
+        self.offsets = np.searchsorted(assignments[self.order], np.arange(n_lists + 1))
+
+    @staticmethod
+    def _projection(n_features, dim, rng, per_feature=4):
+        rows = np.repeat(np.arange(n_features), per_feature)
+        cols = rng.integers(0, dim, size=n_features * per_feature)
+        signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=n_features * per_feature)
+        return sparse.csr_matrix((signs, (rows, cols)), shape=(n_features, dim), dtype=np.float32)
+
+    def embed(self, matrix):
+        """Seyrek TF-IDF satırlarını birim uzunlukta yoğun düşük boyutlu vektörlere indir"""
+        embeddings = np.asarray((matrix @ self.projection).todense(), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+
+    def _kmeans(self, embeddings, k, rng, train_size, iterations):
+        sample = embeddings[rng.choice(len(embeddings), size=min(train_size, len(embeddings)), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=k, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            membership = sparse.csr_matrix((np.ones(len(sample), dtype=np.float32), (labels, np.arange(len(sample)))),
+                                           shape=(k, len(sample)))
+            sums = np.asarray(membership @ sample)
+            norms = np.linalg.norm(sums, axis=1)
+            empty = norms == 0
+            centroids[~empty] = sums[~empty] / norms[~empty, None]
+            if empty.any():
+                centroids[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+        return centroids
+
+    def _assign(self, embeddings, chunk=8192):
+        return np.concatenate([np.argmax(embeddings[i:i + chunk] @ self.centroids.T, axis=1)
+                               for i in range(0, len(embeddings), chunk)])
+
+    def search(self, query, n_probe=None):
+        """En yakın n_probe kümedeki adayları tam kosinüs benzerliğiyle puanla"""
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        closeness = self.centroids @ self.embed(query)[0]
+        probes = np.argpartition(-closeness, n_probe - 1)[:n_probe]
+        candidates = np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in probes])
+        if not len(candidates):
+            return candidates, np.zeros(0, dtype=np.float32)
+        scores = np.asarray((self.matrix[candidates] @ query.T).todense(), dtype=np.float32).ravel()
+        return candidates, scores
+
+
+class SimilarityIndex:
+    """Makale vektörlerini yayın anında hesaplayıp saklayan, artımlı güncellenen TF-IDF indeksi"""
+
+    max_blocks = 16
+
+    def __init__(self, stop_words=(), n_features=2 ** 18, refresh_ratio=0.1, sync_interval=5.0,
+                 ann_min_articles=20000, ann_dim=128, n_probe=16, ann_background=True):
+        self.n_features = n_features
+        self.refresh_ratio = refresh_ratio
+        self.sync_interval = sync_interval
+        self.ann_min_articles = ann_min_articles
+        self.ann_dim = ann_dim
+        self.n_probe = n_probe
+        self.ann_background = ann_background
+        self.vectorizer = sklearn_text.HashingVectorizer(n_features=n_features,
+                                            stop_words=sorted(stop_words) or None,
+                                            alternate_sign=False,
+                                            norm=None,
+                                            dtype=np.float32)
+        self._lock = threading.Lock()
+        self._df = np.zeros(n_features, dtype=np.int64)
+        self._docs = 0
+        self._weighted_docs = 0
+        self._idf = np.ones(n_features, dtype=np.float32)
+        self._blocks = ()
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._positions = {}
+        self._last_seq = 0
+        self._last_sync = 0.0
+        self._sync_lock = threading.Lock()
+        self._loaded = False
+        self._ann = None
+        self._ann_building = False
+
+    def __len__(self):
+        return self._docs
+
+    def vectorize(self, texts):
+        """Metinleri logaritmik terim frekansı vektörlerine dönüştür"""
+        tf = self.vectorizer.transform(texts).tocsr()
+        tf.data = (1.0 + np.log(tf.data)).astype(np.float32)
+        return tf
+
+    def unpack(self, rows):
+        """(terms, weights) BLOB çiftlerini CSR matrisine dönüştür"""
+        indices = [np.frombuffer(terms, dtype=np.int32) for terms, _ in rows]
+        data = [np.frombuffer(weights, dtype=np.float32) for _, weights in rows]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(i) for i in indices], out=indptr[1:])
+        return sparse.csr_matrix((np.concatenate(data) if data else np.zeros(0, dtype=np.float32),
+                                  np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+                                  indptr),
+                                 shape=(len(rows), self.n_features))
+
+    def add(self, db, article_id, title, content):
+        """Yeni yayınlanan makalenin vektörünü hesapla, kaydet ve indekse ekle"""
+        self.add_many(db, [(article_id, f'{title} {content}')])
+
+    def add_many(self, db, items):
+        """(article_id, metin) çiftlerini tek seferde vektörleştir ve indekse ekle"""
+        if not items:
+            return
+        ids, tf = self.store(db, items)
+        self._append(ids, tf)
+
+    def store(self, db, items):
+        """Vektörleri yalnızca veritabanına yaz; bellekteki indeksi değiştirmez
+
+        Toplu içe aktarma gibi tek seferlik süreçler için: sunucu işçileri yeni
+        satırları bir sonraki sync() çağrısında yükler.
+        """
+        ids = [article_id for article_id, _ in items]
+        tf = self.vectorize([text for _, text in items])
+        if db is not None:
+            db.executemany('INSERT OR REPLACE INTO article_vectors (article_id, terms, weights) VALUES (?, ?, ?)',
+                           [(article_id,
+                             tf.indices[tf.indptr[i]:tf.indptr[i + 1]].astype(np.int32).tobytes(),
+                             tf.data[tf.indptr[i]:tf.indptr[i + 1]].tobytes())
+                            for i, article_id in enumerate(ids)])
+        return ids, tf
+
+    def sync(self, db, force=False):
+        """Diğer işçilerin eklediği vektörleri veritabanından artımlı olarak yükle
+
+        Yalnızca okur; vektörü olmayan eski makaleler backfill() ile (arka plan
+        görevi ya da backfill-vectors komutu) tamamlanır.
+        """
+        if not force and self._loaded and time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        with self._sync_lock:
+            now = time.monotonic()
+            if not force and self._loaded and now - self._last_sync < self.sync_interval:
+                return
+            rows = db.execute('SELECT id, article_id, terms, weights FROM article_vectors WHERE id > ? ORDER BY id',
+                              (self._last_seq,)).fetchall()
+            if rows:
+                self._append([row[1] for row in rows], self.unpack([(row[2], row[3]) for row in rows]))
+                self._last_seq = rows[-1][0]
+            self._last_sync = now
+            self._loaded = True
+
+    def backfill(self, db, batch_size=500):
+        """Vektörü olmayan makaleleri vektörleştir; her toplu işten sonra commit et
+
+        Yazma kilidi toplu iş başına kısa süre tutulur, böylece istekler
+        'database is locked' hatası almaz. Yeni satırlar bir sonraki sync()
+        çağrısında indekse yüklenir. Vektörlenen makale sayısını döndürür.
+        """
+        done, last_id = 0, 0
+        while True:
+            batch = db.execute('''
+                SELECT a.id, a.title, a.content
+                FROM articles a
+                WHERE a.id > ? AND NOT EXISTS (SELECT 1 FROM article_vectors v WHERE v.article_id = a.id)
+                ORDER BY a.id
+                LIMIT ?
+            ''', (last_id, batch_size)).fetchall()
+            if not batch:
+                return done
+            self.store(db, [(row[0], f'{row[1]} {row[2]}') for row in batch])
+            db.commit()
+            done += len(batch)
+            last_id = batch[-1][0]
+
+    def most_similar(self, db, article_id, top_n=5, min_score=0.1, n_probe=None):
+        """Makaleye en çok benzeyen makaleleri (article_id, skor) olarak döndür"""
+        self.sync(db)
+        row = db.execute('SELECT terms, weights FROM article_vectors WHERE article_id = ?',
+                         (article_id,)).fetchone()
+        if row is None:
+            return []
+        return self.search(self.unpack([(row[0], row[1])]), top_n, min_score,
+                           exclude=(article_id,), n_probe=n_probe)
+
+    def similar_to_text(self, text, top_n=5, min_score=0.1, n_probe=None):
+        """Serbest metne en çok benzeyen makaleleri döndür"""
+        return self.search(self.vectorize([text]), top_n, min_score, n_probe=n_probe)
+
+    def search(self, tf, top_n=5, min_score=0.1, exclude=(), n_probe=None, exact=False):
+        """Ön hesaplanmış vektörlerle en yakın makaleleri bul
+
+        Korpus ann_min_articles eşiğini aştığında ana blok IVF indeksiyle taranır;
+        n_probe büyüdükçe isabet (recall) artar, gecikme de artar. exact=True tüm
+        korpusu seyrek iç çarpımla tarar.
+        """
+        blocks, ids, ann = self._blocks, self._ids, self._ann
+        query = self.weigh(tf)
+        if not blocks or not query.nnz:
+            return []
+        if not exact and ann is not None and ann.source is blocks[0]:
+            positions, scores = ann.search(query, n_probe)
+            if len(blocks) > 1:
+                tail = np.concatenate([block[:, query.indices] @ query.data for block in blocks[1:]])
+                positions = np.concatenate([positions, np.arange(ann.size, ann.size + len(tail))])
+                scores = np.concatenate([scores, tail])
+        else:
+            scores = np.concatenate([block[:, query.indices] @ query.data for block in blocks])
+            positions = np.arange(len(scores))
+        excluded = [self._positions[article_id] for article_id in exclude if article_id in self._positions]
+        if excluded:
+            scores = np.where(np.isin(positions, excluded), -1.0, scores)
+        k = min(top_n, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[positions[i]]), float(scores[i])) for i in top if scores[i] > min_score]
+
+    def build_ann(self):
+        """Ana blok için IVF indeksini kur; blok bu sırada değiştiyse yeniden dene"""
+        while True:
+            blocks = self._blocks
+            if not blocks or blocks[0].shape[0] < self.ann_min_articles:
+                self._ann_building = False
+                return None
+            ann = AnnIndex(blocks[0], dim=self.ann_dim, n_probe=self.n_probe)
+            with self._lock:
+                if self._blocks and self._blocks[0] is blocks[0]:
+                    self._ann = ann
+                    self._ann_building = False
+                    return ann
+
+    def weigh(self, tf):
+        """Terim frekanslarını geçerli IDF ile ağırlıklandırıp birim uzunluğa getir"""
+        weighted = tf.astype(np.float32, copy=True)
+        weighted.data *= self._idf[weighted.indices]
+        return sklearn_preprocessing.normalize(weighted, copy=False)
+
+    def _append(self, ids, tf):
+        with self._lock:
+            keep, seen = [], set()
+            for i, article_id in enumerate(ids):
+                if article_id not in self._positions and article_id not in seen:
+                    keep.append(i)
+                    seen.add(article_id)
+            if not keep:
+                return
+            if len(keep) < len(ids):
+                tf = tf[keep]
+                ids = [ids[i] for i in keep]
+            self._df += np.bincount(tf.indices, minlength=self.n_features)
+            self._docs += len(ids)
+            start = len(self._ids)
+            self._ids = np.concatenate([self._ids, np.asarray(ids, dtype=np.int64)])
+            for offset, article_id in enumerate(ids):
+                self._positions[article_id] = start + offset
+            if self._docs > self._weighted_docs * (1 + self.refresh_ratio):
+                self._reweight(tf)
+            else:
+                blocks = self._blocks + (self.weigh(tf).tocsc(),)
+                if len(blocks) > self.max_blocks:
+                    blocks = (blocks[0], sparse.vstack(blocks[1:], format='csc'))
+                self._blocks = blocks
+
+    def _reweight(self, tf):
+        idf = (np.log((1.0 + self._docs) / (1.0 + self._df)) + 1.0).astype(np.float32)
+        blocks = []
+        if self._blocks:
+            merged = sparse.vstack(self._blocks, format='csc')
+            merged.data *= np.repeat(idf / self._idf, np.diff(merged.indptr))
+            norms = np.sqrt(np.bincount(merged.indices, weights=np.square(merged.data, dtype=np.float64),
+                                        minlength=merged.shape[0]))
+            norms[norms == 0] = 1.0
+            merged.data /= norms[merged.indices].astype(np.float32)
+            blocks.append(merged)
+        self._idf = idf
+        self._weighted_docs = self._docs
+        blocks.append(self.weigh(tf).tocsc())
+        self._blocks = (sparse.vstack(blocks, format='csc'),)
+        self._ann = None
+        if self._docs >= self.ann_min_articles and self.ann_background and not self._ann_building:
+            self._ann_building = True
+            threading.Thread(target=self.build_ann, name='ann-index', daemon=True).start()
+
+    def snapshot(self):
+        """(makale kimlikleri, tüm satırları içeren CSR matris) döndür"""
+        with self._lock:
+            blocks, ids = self._blocks, self._ids
+        if not blocks:
+            return ids, sparse.csr_matrix((0, self.n_features), dtype=np.float32)
+        return ids, sparse.vstack(blocks, format='csr')
+
+
+_related_state = {}
+
+
+def _init_related_worker(ids, matrix):
+    _related_state['ids'] = ids
+    _related_state['matrix'] = matrix
+    _related_state['transposed'] = matrix.T.tocsc()
+
+
+def _related_block(positions, top_n, min_score):
+    """Verilen satırların tüm korpusa karşı en yakın top_n komşusunu hesapla"""
+    ids, matrix = _related_state['ids'], _related_state['matrix']
+    scores = (matrix[positions] @ _related_state['transposed']).toarray()
+    scores[np.arange(len(positions)), positions] = -1.0
+    k = min(top_n, scores.shape[1])
+    if k == 0:
+        return [(int(ids[position]), []) for position in positions]
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    results = []
+    for row, position in enumerate(positions):
+        order = top[row][np.argsort(-scores[row, top[row]])]
+        results.append((int(ids[position]),
+                        [(int(ids[i]), float(scores[row, i])) for i in order if scores[row, i] > min_score]))
+    return results
+
+
+def compute_related(db, article_ids=None, top_n=10, min_score=0.1, workers=None,
+                    block_memory=64 * 1024 * 1024):
+    """Makalelerin komşu listelerini hesaplayıp related_articles tablosuna yaz
+
+    Tüm vektörler tek IDF ile yeniden ağırlıklandırılır. Sorgu satırları,
+    blok başına yoğun skor matrisi block_memory baytı geçmeyecek büyüklükte
+    bloklara bölünür ve süreç havuzuna dağıtılır; aynı anda en fazla
+    2 * workers blok bellekte tutulur. Her blok sonucu kendi işleminde yazılır.
+    """
+    index = SimilarityIndex(ai_assistant.stop_words, n_features=app.config['SIMILARITY_FEATURES'],
+                            refresh_ratio=0.0, sync_interval=float('inf'),
+                            ann_min_articles=float('inf'), ann_background=False)
+    index.sync(db, force=True)
+    ids, matrix = index.snapshot()
+    if article_ids is None:
+        positions = np.arange(len(ids))
+    else:
+        lookup = {int(article_id): position for position, article_id in enumerate(ids)}
+        positions = np.array([lookup[int(i)] for i in article_ids if int(i) in lookup], dtype=np.int64)
+    block_size = max(1, min(len(positions), block_memory // max(1, 4 * len(ids))))
+    blocks = [positions[start:start + block_size] for start in range(0, len(positions), block_size)]
+    workers = workers or os.cpu_count() or 1
+
+    def write(results):
+        chunk = [article_id for article_id, _ in results]
+        db.execute(f"DELETE FROM related_articles WHERE article_id IN ({','.join('?' * len(chunk))})", chunk)
+        db.executemany('INSERT INTO related_articles (article_id, rank, related_id, score) VALUES (?, ?, ?, ?)',
+                       [(article_id, rank, related_id, score)
+                        for article_id, neighbours in results
+                        for rank, (related_id, score) in enumerate(neighbours)])
+        db.commit()
+
+    started = time.perf_counter()
+    if workers == 1 or len(blocks) <= 1:
+        _init_related_worker(ids, matrix)
+        try:
+            for block in blocks:
+                write(_related_block(block, top_n, min_score))
+        finally:
+            _related_state.clear()
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_related_worker,
+                                                    initargs=(ids, matrix)) as executor:
+            pending = set()
+            for block in blocks:
+                if len(pending) >= 2 * workers:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        write(future.result())
+                pending.add(executor.submit(_related_block, block, top_n, min_score))
+            for future in concurrent.futures.as_completed(pending):
+                write(future.result())
+    elapsed = time.perf_counter() - started
+    return {
+        'articles': len(positions),
+        'corpus': len(ids),
+        'blocks': len(blocks),
+        'block_size': block_size,
+        'workers': workers,
+        'seconds': elapsed,
+        'articles_per_second': len(positions) / elapsed if elapsed else 0.0,
+    }
+
+
+class PeriodicTask:
+    """Bir fonksiyonu arka plan iş parçacığında belirli aralıklarla çalıştır"""
+
+    def __init__(self, name, interval, fn):
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def wake(self):
+        """Aralığın dolmasını beklemeden fonksiyonu bir kez çalıştır"""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.fn()
+            except Exception as e:
+                app.logger.warning('%s görevi başarısız: %s', self.name, e)
+
+
+BACKGROUND_TASKS = []
+_background_started = False
+
+
+@app.before_request
+def start_background_tasks():
+    """Periyodik görevleri süreç başına bir kez, ilk istekte (fork sonrasında) başlat"""
+    global _background_started
+    if not _background_started:
+        _background_started = True
+        for task in BACKGROUND_TASKS:
+            task.start()
+
+
+@app.before_request
+def start_request_timer():
+    if app.config['METRICS_ENABLED']:
+        g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """İstek süresini ve SQL sayısını kaydet; SLOW_REQUEST_MS aşılırsa isteğin dökümünü logla"""
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    endpoint = request.endpoint or 'unknown'
+    REQUEST_DURATION.observe(elapsed, endpoint, request.method, str(response.status_code))
+    db = g.get('db')
+    instrumented = isinstance(db, InstrumentedConnection)
+    SQL_PER_REQUEST.observe(db.statements if instrumented else 0, endpoint)
+    threshold = app.config['SLOW_REQUEST_MS']
+    if threshold is not None and elapsed * 1000 >= threshold:
+        slowest = sorted(db.timings, reverse=True)[:5] if instrumented else []
+        app.logger.warning(
+            'Yavaş istek: %s %s (%s) %.1f ms, %d SQL ifadesi %.1f ms, AI %.1f ms, şablon %.1f ms; en yavaş: %s',
+            request.method, request.full_path.rstrip('?'), endpoint, elapsed * 1000,
+            db.statements if instrumented else 0, db.sql_seconds * 1000 if instrumented else 0.0,
+            g.get('ai_seconds', 0.0) * 1000, g.get('template_seconds', 0.0) * 1000,
+            ', '.join(f'{fingerprint} {seconds * 1000:.1f} ms' for seconds, fingerprint in slowest) or '-')
+    return response
+
+
+@before_render_template.connect_via(app)
+def start_template_timer(sender, template, context, **extra):
+    if app.config['METRICS_ENABLED']:
+        g.template_started = time.perf_counter()
+
+
+@template_rendered.connect_via(app)
+def record_template_metrics(sender, template, context, **extra):
+    started = g.pop('template_started', None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        TEMPLATE_DURATION.observe(elapsed, template.name or '<string>')
+        g.template_seconds = g.get('template_seconds', 0.0) + elapsed
+
+
+# Flask after_request işlevlerini kayıt sırasının tersiyle çalıştırır: önce
+# add_cache_headers (ETag, 304), sonra compress_response
+@app.after_request
+def compress_response(response):
+    """Yeterince büyük metin yanıtlarını istemcinin desteklediği br ya da gzip ile sıkıştır"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in app.config['COMPRESS_MIMETYPES']):
+        return response
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < app.config['COMPRESS_MIN_SIZE']:
+        return response
+    accepted = request.accept_encodings
+    if BROTLI_AVAILABLE and accepted['br']:
+        encoding, data = 'br', brotli.compress(data, quality=app.config['BROTLI_QUALITY'])
+    elif accepted['gzip']:
+        encoding, data = 'gzip', gzip.compress(data, compresslevel=app.config['COMPRESS_LEVEL'])
+    else:
+        return response
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+@app.after_request
+def add_cache_headers(response):
+    """CACHE_CONTROL'deki rotaların GET yanıtlarına Cache-Control ve zayıf ETag ekle
+
+    Oturum çerezi olmayan ve oturumu değiştirmeyen istekler paylaşılan
+    önbelleklerde saklanabilir; diğerleri tarayıcıda kalır ve her seferinde
+    ETag ile doğrulanır. ETag, not_modified ile sayfanın girdilerinden
+    üretilmediyse gövdenin özetidir. İstemcinin kopyası güncelse 304 döner.
+    """
+    policy = app.config['CACHE_CONTROL'].get(request.endpoint)
+    if (policy is None or request.method not in ('GET', 'HEAD') or response.status_code not in (200, 304)
+            or response.is_streamed or response.direct_passthrough):
+        return response
+    anonymous = app.config['SESSION_COOKIE_NAME'] not in request.cookies and not session.modified
+    response.headers['Cache-Control'] = policy if anonymous else app.config['CACHE_CONTROL_PRIVATE']
+    response.vary.add('Cookie')
+    etag = g.get('etag') or content_hash(response.get_data())[:32]
+    response.set_etag(etag, weak=True)
+    if g.get('last_modified'):
+        response.last_modified = g.last_modified
+    if response.status_code == 200 and request.if_none_match.contains_weak(etag):
+        response.status_code = 304
+        response.set_data(b'')
+        response.headers.pop('Content-Length', None)
+    return response
+
+
+def not_modified(*parts, last_modified=None):
+    """Sayfanın girdilerinden ETag üret; istemcinin kopyası güncelse şablon işlenmeden 304 döndür
+
+    Üretilen ETag'i add_cache_headers gövde özeti yerine kullanır. Flash
+    mesajı bekleyen isteklerde sayfa girdilerin dışında da değişeceği için
+    None döner.
+    """
+    if '_flashes' in session:
+        return None
+    g.etag = content_hash(request.endpoint, *parts)[:32]
+    g.last_modified = last_modified
+    if request.if_none_match.contains_weak(g.etag):
+        return Response(status=304)
+    return None
+
+
+ASSET_RE = re.compile(r'^(.+)\.([0-9a-f]{12})(\.[^./]+)$')
+_asset_fingerprints = {}
+
+
+def asset_fingerprint(filename):
+    """Statik dosyanın içerik özeti (12 karakter); değiştirilme zamanı aynı kaldıkça önbellekten"""
+    path = safe_join(app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        return None
+    mtime = os.stat(path).st_mtime_ns
+    cached = _asset_fingerprints.get(filename)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'rb') as f:
+            cached = _asset_fingerprints[filename] = (mtime, hashlib.sha256(f.read()).hexdigest()[:12])
+    return cached[1]
+
+
+@app.template_global()
+def asset_url(filename):
+    """Statik dosyanın parmak izli adresi: css/verbum.css → /assets/css/verbum.<özet>.css"""
+    fingerprint = asset_fingerprint(filename)
+    if fingerprint is None:
+        return url_for('static', filename=filename)
+    stem, ext = os.path.splitext(filename)
+    return url_for('asset', filename=f'{stem}.{fingerprint}{ext}')
+
+
+@app.route('/assets/<path:filename>')
+def asset(filename):
+    """Parmak izli statik dosya; içerik değişince adresi de değiştiği için süresiz önbelleklenir"""
+    match = ASSET_RE.match(filename)
+    name = match.group(1) + match.group(3) if match else filename
+    fingerprint = asset_fingerprint(name)
+    if fingerprint is None:
+        return jsonify({'error': 'Dosya bulunamadı'}), 404
+    if not match or match.group(2) != fingerprint:
+        return redirect(asset_url(name))
+    if request.if_none_match.contains_weak(fingerprint):
+        response = Response(status=304)
+    else:
+        response = send_from_directory(app.static_folder, name, etag=False, max_age=app.config['ASSET_MAX_AGE'])
+        if response.mimetype in app.config['COMPRESS_MIMETYPES']:
+            # Dosya belleğe alınır ki compress_response sıkıştırabilsin; varlıklar küçüktür
+            response.direct_passthrough = False
+            response.set_data(response.get_data())
+    response.set_etag(fingerprint, weak=True)
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['ASSET_MAX_AGE']
+    response.cache_control.immutable = True
+    return response
+
+
+class ViewCounter:
+    """Makale görüntülenmelerini bellekte biriktirip tek işlemde toplu yazan sayaç
+
+    Görüntülenme sayıları en fazla flush_interval saniye ya da flush_threshold
+    görüntülenme kadar geriden gelir.
+    """
+
+    def __init__(self, flush_interval=5.0, flush_threshold=500):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._pending_total = 0
+        self.task = PeriodicTask('view-counter', flush_interval, self.flush)
+        self.hits = 0
+        self.flushed_views = 0
+        self.rows_written = 0
+        self.flushes = 0
+
+    def hit(self, article_id):
+        """Bir görüntülenmeyi tampona ekle; eşik aşıldıysa arka plan görevini uyandır
+
+        Yazma her zaman arka plan görevinde yapılır: istek zaten bir bağlantı
+        tutarken ikinci bir bağlantı beklemez, yazma hatası da isteğe yansımaz.
+        """
+        with self._lock:
+            self._pending[article_id] = self._pending.get(article_id, 0) + 1
+            self._pending_total += 1
+            self.hits += 1
+            due = self._pending_total >= self.flush_threshold
+        if due:
+            self.task.wake()
+
+    def pending(self, article_id):
+        """Makalenin henüz veritabanına yazılmamış görüntülenme sayısı"""
+        return self._pending.get(article_id, 0)
+
+    def flush(self):
+        """Biriken farkları tek bir işlemde veritabanına yaz; yazılan satır sayısını döndür"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._pending_total = 0
+            if not pending:
+                return 0
+            try:
+                with get_pool().connection() as db:
+                    db.executemany('UPDATE articles SET views = views + ? WHERE id = ?',
+                                   [(delta, article_id) for article_id, delta in pending.items()])
+                    update_rankings(db, pending)
+                    db.commit()
+            except Exception:
+                with self._lock:
+                    for article_id, delta in pending.items():
+                        self._pending[article_id] = self._pending.get(article_id, 0) + delta
+                        self._pending_total += delta
+                raise
+            views = sum(pending.values())
+            self.flushes += 1
+            self.flushed_views += views
+            self.rows_written += len(pending)
+            app.logger.debug('Görüntülenme tamponu yazıldı: %d görüntülenme, %d satır', views, len(pending))
+            return len(pending)
+
+    def stop(self):
+        """Arka plan görevini durdur ve kalan görüntülenmeleri yaz"""
+        self.task.stop()
+        self.flush()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'pending': self._pending_total,
+            'flushes': self.flushes,
+            'rows_written': self.rows_written,
+            'coalesced_writes': self.flushed_views - self.rows_written,
         }
-        
-        text = (title + ' ' + content).lower()
-        scores = {}
-        
-        for category, words in keywords.items():
-            score = sum(1 for word in words if word in text)
-            if score > 0:
-                scores[category] = score
-        
-        if scores:
-            return max(scores, key=scores.get)
-        return 'Diğer'
 
-ai_assistant = AIAssistant()
+
+
+class LRUCache:
+    """Süre aşımlı (TTL) ve en az kullanılanı çıkaran, iş parçacığı güvenli bellek içi önbellek
+
+    Cache için varsayılan arka uçtur; aynı get/set/delete/clear/stats arayüzünü
+    sağlayan herhangi bir nesne (ör. paylaşılan bir Redis istemcisi sarmalayıcısı)
+    yerine kullanılabilir.
+    """
+
+    def __init__(self, max_entries=2048, default_ttl=60.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """ttl saniye sonra geçersiz olacak değeri yaz; ttl=0 süresiz saklar"""
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class Cache:
+    """Sorgu sonuçları ve işlenmiş HTML parçaları için ad alanlı önbellek
+
+    invalidate() ad alanının sürüm belirtecini yeniler; eski sürümle yazılmış
+    girdiler bir daha okunmaz ve zamanla LRU tarafından atılır. İsabet/ıska
+    sayaçları sürüm belirteci okumalarını saymaz.
+    """
+
+    _missing = object()
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def _version(self, namespace):
+        version = self.backend.get(f'ns:{namespace}')
+        if version is None:
+            version = uuid.uuid4().hex[:8]
+            self.backend.set(f'ns:{namespace}', version, ttl=0)
+        return version
+
+    def _key(self, namespace, key):
+        return f'{namespace}:{self._version(namespace)}:{key}'
+
+    def get(self, namespace, key, default=None):
+        value = self.backend.get(self._key(namespace, key), self._missing)
+        if value is self._missing:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, namespace, key, value, ttl=None):
+        self.backend.set(self._key(namespace, key), value, ttl)
+
+    def delete(self, namespace, key):
+        self.backend.delete(self._key(namespace, key))
+
+    def get_or_set(self, namespace, key, fn, ttl=None):
+        """Önbellekte yoksa fn() ile hesapla ve sakla"""
+        value = self.get(namespace, key, self._missing)
+        if value is self._missing:
+            value = fn()
+            self.set(namespace, key, value, ttl)
+        return value
+
+    def invalidate(self, *namespaces):
+        """Ad alanlarındaki tüm girdileri geçersiz kıl"""
+        for namespace in namespaces:
+            self.backend.set(f'ns:{namespace}', uuid.uuid4().hex[:8], ttl=0)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = dict(self.backend.stats())
+        stats.update(hits=self.hits, misses=self.misses,
+                     hit_rate=self.hits / lookups if lookups else 0.0)
+        return stats
+
+
+class MemoCache:
+    """Yapay zekâ sonuçları için içerik özetiyle anahtarlanan önbellek
+
+    Yazarlar taslak yazarken aynı metni /api/summarize ve /api/suggest_category
+    ile defalarca gönderir; makale kaydedilince arka plan işleri aynı sonucu
+    yeniden ister. Sonuçlar sınırlı bir LRU'da, persist açıksa ai_memo tablosunda
+    da tutulur; böylece işçiler ve yeniden başlatmalar aynı sonuçları paylaşır.
+    Değerler JSON'a çevrilebilir olmalıdır.
+    """
+
+    _missing = object()
+
+    def __init__(self, max_entries=4096, persist=False, max_rows=100000):
+        self.memory = LRUCache(max_entries=max_entries, default_ttl=0)
+        self.persist = persist
+        self.max_rows = max_rows
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind, parts):
+        return f'{kind}:{content_hash(*parts)}'
+
+    def get_many(self, kind, parts_list, db=None):
+        """Önbellekte bulunan sonuçları {sıra: değer} olarak döndür; ai_memo çağıranın bağlantısıyla okunur"""
+        found, missing = {}, {}
+        for i, parts in enumerate(parts_list):
+            key = self.key(kind, parts)
+            value = self.memory.get(key, self._missing)
+            if value is self._missing:
+                missing.setdefault(key, []).append(i)
+            else:
+                found[i] = value
+        memory_hits = len(found)
+        if self.persist and missing:
+            with caller_connection(db) as conn:
+                for keys in chunked(list(missing), 500):
+                    rows = conn.execute(f"SELECT key, value FROM ai_memo WHERE key IN ({','.join('?' * len(keys))})",
+                                        keys).fetchall()
+                    for row in rows:
+                        value = json.loads(row['value'])
+                        self.memory.set(row['key'], value)
+                        for i in missing[row['key']]:
+                            found[i] = value
+        self._count(kind, memory_hits=memory_hits, db_hits=len(found) - memory_hits,
+                    misses=len(parts_list) - len(found))
+        return found
+
+    def set_many(self, kind, items, db=None):
+        """(parçalar, değer) çiftlerini belleğe ve persist açıksa ai_memo tablosuna yaz
+
+        Çağıranın açık bir işlemi varsa satırlar o işlemle birlikte onaylanır;
+        yoksa hemen onaylanır.
+        """
+        rows = []
+        for parts, value in items:
+            key = self.key(kind, parts)
+            self.memory.set(key, value)
+            rows.append((key, kind, json.dumps(value), time.time()))
+        if self.persist and rows:
+            with caller_connection(db) as conn:
+                owned = not conn.in_transaction
+                conn.executemany('INSERT OR REPLACE INTO ai_memo (key, kind, value, created_at) VALUES (?, ?, ?, ?)',
+                                 rows)
+                if owned:
+                    conn.commit()
+
+    def _count(self, kind, **fields):
+        with self._lock:
+            counts = self._counts.setdefault(kind, {'memory_hits': 0, 'db_hits': 0, 'misses': 0})
+            for field, value in fields.items():
+                counts[field] += value
+
+    def prune(self):
+        """ai_memo tablosunda en yeni max_rows satırdan eskilerini sil; silinen satır sayısını döndür"""
+        with get_pool().connection() as db:
+            cursor = db.execute('''
+                DELETE FROM ai_memo WHERE created_at < (
+                    SELECT created_at FROM ai_memo ORDER BY created_at DESC LIMIT 1 OFFSET ?
+                )
+            ''', (self.max_rows - 1,))
+            db.commit()
+        return cursor.rowcount
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self):
+        stats = {'entries': len(self.memory), 'max_entries': self.memory.max_entries,
+                 'evictions': self.memory.evictions, 'persist': self.persist}
+        with self._lock:
+            counts = {kind: dict(values) for kind, values in self._counts.items()}
+        for values in counts.values():
+            lookups = sum(values.values())
+            values['hit_rate'] = (values['memory_hits'] + values['db_hits']) / lookups if lookups else 0.0
+        stats['kinds'] = counts
+        return stats
+
+
+def percentile(values, q):
+    """Sıralanmış değerlerde en yakın sıra yöntemiyle q. yüzdelik (0-100)"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+class JobQueue:
+    """SQLite jobs tablosunu işleyen, yeniden başlatmalara dayanıklı arka plan iş kuyruğu
+
+    İşler çağıranın işleminde eklenir; makale satırıyla birlikte onaylanır ya da
+    geri alınır. İşçi bir işi lease saniyelik kirayla alır, süreç çökerse kira
+    dolduğunda iş yeniden kuyruğa döner. Başarısız işler üstel artan beklemeyle
+    max_attempts kez denenir. Biten ve başarısız işler retention saniye sonra
+    prune() ile silinir.
+    """
+
+    def __init__(self, workers=2, poll_interval=2.0, max_attempts=3, retry_delay=10.0, lease=300.0,
+                 history=1000, retention=7 * 86400.0):
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self.history = history
+        self.retention = retention
+        self.handlers = {}
+        self.tasks = [PeriodicTask(f'jobs-{i}', poll_interval, self.run_pending) for i in range(workers)]
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+
+    def handler(self, kind):
+        """Fonksiyonu verilen iş türünün işleyicisi olarak kaydet: fn(db, payload)"""
+        def register(fn):
+            self.handlers[kind] = fn
+            return fn
+        return register
+
+    def enqueue(self, db, kind, payload, delay=0.0):
+        """İşi çağıranın işlemine ekle; onaydan sonra wake() ile işçileri uyandırın"""
+        if kind not in self.handlers:
+            raise ValueError(f'Bilinmeyen iş türü: {kind}')
+        now = time.time()
+        cursor = db.execute('INSERT INTO jobs (kind, payload, run_after, created_at) VALUES (?, ?, ?, ?)',
+                            (kind, json.dumps(payload), now + delay, now))
+        return cursor.lastrowid
+
+    def wake(self):
+        """Boştaki bir işçiyi kuyruğu hemen işlemesi için uyandır"""
+        for task in self.tasks:
+            if task.running:
+                task.wake()
+                return
+
+    def claim(self, db):
+        """Sırası gelen ilk işi kiralayıp (id, kind, payload, attempts, created_at) döndür
+
+        Kirası dolmuş işler deneme hakkı kaldıysa kuyruğa döner, kalmadıysa
+        başarısız sayılır; böylece işçiyi her seferinde çökerten bir iş sonsuza
+        kadar yeniden denenmez.
+        """
+        now = time.time()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            expired = db.execute('''
+                UPDATE jobs SET status = 'failed', finished_at = ?, last_error = 'kira süresi doldu'
+                WHERE status = 'running' AND run_after <= ? AND attempts >= ?
+                RETURNING id, kind
+            ''', (now, now, self.max_attempts)).fetchall()
+            db.execute("UPDATE jobs SET status = 'pending' WHERE status = 'running' AND run_after <= ?", (now,))
+            job = db.execute('''
+                UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, run_after = ?
+                WHERE id = (SELECT id FROM jobs WHERE status = 'pending' AND run_after <= ?
+                            ORDER BY run_after LIMIT 1)
+                RETURNING id, kind, payload, attempts, created_at
+            ''', (now, now + self.lease, now)).fetchone()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if expired:
+            with self._lock:
+                self.failed += len(expired)
+            for job_id, kind in expired:
+                app.logger.warning('%s işi #%s kira süresi dolduğu için başarısız sayıldı', kind, job_id)
+        return job
+
+    def prune(self):
+        """retention saniyeden önce biten ya da başarısız olan işleri sil; silinen satır sayısını döndür"""
+        with get_pool().connection() as db:
+            cursor = db.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                                (time.time() - self.retention,))
+            db.commit()
+        return cursor.rowcount
+
+    def run_pending(self, limit=None):
+        """Sırası gelmiş işleri kuyruk boşalana (ya da limit dolana) kadar çalıştır"""
+        done = 0
+        with get_pool().connection() as db:
+            while limit is None or done < limit:
+                job = self.claim(db)
+                if job is None:
+                    break
+                self.run_job(db, job)
+                done += 1
+        return done
+
+    def run_job(self, db, job):
+        job_id, kind, payload, attempts, created_at = job
+        started = time.time()
+        try:
+            self.handlers[kind](db, json.loads(payload))
+            db.execute("UPDATE jobs SET status = 'done', finished_at = ?, last_error = NULL WHERE id = ?",
+                       (time.time(), job_id))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            final = attempts >= self.max_attempts
+            now = time.time()
+            db.execute('UPDATE jobs SET status = ?, run_after = ?, last_error = ?, finished_at = ? WHERE id = ?',
+                       ('failed' if final else 'pending', now + self.retry_delay * 2 ** (attempts - 1),
+                        repr(e), now if final else None, job_id))
+            db.commit()
+            with self._lock:
+                if final:
+                    self.failed += 1
+                else:
+                    self.retries += 1
+            app.logger.warning('%s işi #%s başarısız (%s. deneme): %s', kind, job_id, attempts, e)
+            return
+        finished = time.time()
+        with self._lock:
+            self.completed += 1
+            samples = self._latencies.setdefault(kind, [])
+            samples.append((started - created_at, finished - started))
+            del samples[:-self.history]
+
+    def stats(self, db):
+        """Kuyruk derinliği, deneme sayaçları ve iş türü başına bekleme/çalışma süreleri (ms)"""
+        depth = dict(db.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+        retried = db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'pending' AND attempts > 0").fetchone()[0]
+        with self._lock:
+            latencies = {kind: list(samples) for kind, samples in self._latencies.items()}
+            stats = {'completed': self.completed, 'failed': self.failed, 'retries': self.retries}
+        stats['depth'] = {status: depth.get(status, 0) for status in ('pending', 'running', 'done', 'failed')}
+        stats['awaiting_retry'] = retried
+        stats['latency_ms'] = {}
+        for kind, samples in latencies.items():
+            waits = sorted(wait * 1000 for wait, _ in samples)
+            runs = sorted(run * 1000 for _, run in samples)
+            stats['latency_ms'][kind] = {
+                'count': len(samples),
+                'wait_p50': percentile(waits, 50), 'wait_p95': percentile(waits, 95),
+                'run_p50': percentile(runs, 50), 'run_p95': percentile(runs, 95),
+            }
+        return stats
+
+
+def refresh_rankings_job():
+    """Sıralama tablosunu kendi bağlantısıyla baştan hesapla (zaman sönümü için periyodik)"""
+    with get_pool().connection() as db:
+        refresh_rankings(db)
+        db.commit()
+
+
+def reconcile_likes_job():
+    """Kaymış beğeni sayaçlarını düzelt; düzeltilen satır sayısını döndür"""
+    with get_pool().connection() as db:
+        fixed = reconcile_like_counts(db)
+        update_rankings(db, fixed)
+        db.commit()
+    if fixed:
+        app.logger.info('%d makalenin beğeni sayacı düzeltildi', len(fixed))
+        for article_id in fixed:
+            cache.delete('article', article_id)
+        cache.invalidate('home', 'rankings')
+    return len(fixed)
+
+
+def index_articles_fts_job():
+    """Tam metin indeksinde olmayan makaleleri (ör. doğrudan SQL ile eklenenler) indeksle"""
+    with get_pool().connection() as db:
+        done = index_articles_fts(db)
+        db.commit()
+    if done:
+        app.logger.info('%d makale tam metin indeksine eklendi', done)
+    return done
+
+
+def backfill_vectors_job():
+    """Vektörü eksik makaleleri toplu işler halinde vektörleştir; sayısını döndür"""
+    with get_pool().connection() as db:
+        done = get_similarity_index().backfill(db, app.config['SIMILARITY_BACKFILL_BATCH'])
+    if done:
+        app.logger.info('%d makalenin benzerlik vektörü hesaplandı', done)
+    return done
+
+
+_similarity_index = None
+_similarity_index_lock = threading.Lock()
+
+
+def get_similarity_index():
+    """Süreç başına tek benzerlik indeksini ilk kullanımda kur"""
+    global _similarity_index
+    if _similarity_index is None:
+        with _similarity_index_lock:
+            if _similarity_index is None:
+                _similarity_index = SimilarityIndex(ai_assistant.stop_words,
+                                                    n_features=app.config['SIMILARITY_FEATURES'],
+                                                    refresh_ratio=app.config['SIMILARITY_REFRESH_RATIO'],
+                                                    sync_interval=app.config['SIMILARITY_SYNC_INTERVAL'],
+                                                    ann_min_articles=app.config['ANN_MIN_ARTICLES'],
+                                                    ann_dim=app.config['ANN_DIM'],
+                                                    n_probe=app.config['ANN_NPROBE'])
+    return _similarity_index
+
+
+def preload_ai():
+    """Yapay zekâ yığınını hemen yükle
+
+    gunicorn --preload ile ana süreçte (fork öncesi) çağrılırsa işçiler
+    modülleri ve durak kelimelerini kopyala-yaz belleğiyle paylaşır. Veritabanı
+    havuzuna dokunulmaz; bağlantılar fork'tan sonra işçilerde açılır.
+    """
+    for module in (np, sparse, sklearn_text, sklearn_preprocessing, sklearn_linear_model,
+                   joblib, nltk):
+        module.load_module()
+    get_similarity_index()
+    if app.config['CATEGORY_ENGINE'] == 'model':
+        ai_assistant.load_category_model()
+
+
+ai_assistant = AIAssistant(memo=MemoCache(max_entries=app.config['AI_MEMO_MAX_ENTRIES'],
+                                          persist=app.config['AI_MEMO_PERSIST'],
+                                          max_rows=app.config['AI_MEMO_MAX_ROWS']))
+if app.config['AI_MEMO_PERSIST']:
+    BACKGROUND_TASKS.append(PeriodicTask('ai-memo-prune', app.config['AI_MEMO_PRUNE_INTERVAL'],
+                                         ai_assistant.memo.prune))
+view_counter = ViewCounter(flush_interval=app.config['VIEW_FLUSH_INTERVAL'],
+                           flush_threshold=app.config['VIEW_FLUSH_THRESHOLD'])
+atexit.register(view_counter.stop)
+BACKGROUND_TASKS.append(view_counter.task)
+cache = Cache(app.config['CACHE_BACKEND'] or LRUCache(max_entries=app.config['CACHE_MAX_ENTRIES'],
+                                                      default_ttl=app.config['CACHE_DEFAULT_TTL']))
+BACKGROUND_TASKS.append(PeriodicTask('ranking-refresh', app.config['RANKING_REFRESH_INTERVAL'], refresh_rankings_job))
+BACKGROUND_TASKS.append(PeriodicTask('likes-reconcile', app.config['LIKES_RECONCILE_INTERVAL'], reconcile_likes_job))
+BACKGROUND_TASKS.append(PeriodicTask('vector-backfill', app.config['SIMILARITY_BACKFILL_INTERVAL'],
+                                     backfill_vectors_job))
+BACKGROUND_TASKS.append(PeriodicTask('fts-catchup', app.config['FTS_CATCHUP_INTERVAL'], index_articles_fts_job))
+job_queue = JobQueue(workers=app.config['JOB_WORKERS'],
+                     poll_interval=app.config['JOB_POLL_INTERVAL'],
+                     max_attempts=app.config['JOB_MAX_ATTEMPTS'],
+                     retry_delay=app.config['JOB_RETRY_DELAY'],
+                     lease=app.config['JOB_LEASE'],
+                     retention=app.config['JOB_RETENTION'])
+BACKGROUND_TASKS.extend(job_queue.tasks)
+BACKGROUND_TASKS.append(PeriodicTask('jobs-prune', app.config['JOB_PRUNE_INTERVAL'], job_queue.prune))
+if app.config['AI_PRELOAD']:
+    preload_ai()
+
+
+@job_queue.handler('summarize_article')
+def summarize_article_job(db, payload):
+    article = db.execute('SELECT content FROM articles WHERE id = ?', (payload['article_id'],)).fetchone()
+    if article is None:
+        return
+    db.execute('UPDATE articles SET summary = ? WHERE id = ?',
+               (ai_assistant.generate_summary(article['content'], engine=payload.get('engine'), db=db),
+                payload['article_id']))
+    db.commit()
+    cache.delete('article', payload['article_id'])
+
+
+@job_queue.handler('categorize_article')
+def categorize_article_job(db, payload):
+    article = db.execute('SELECT title, content, category_id FROM articles WHERE id = ?',
+                         (payload['article_id'],)).fetchone()
+    if article is None or article['category_id'] is not None:
+        return
+    category_id, _ = ai_assistant.predict_category(article['title'], article['content'], db)
+    if category_id is not None:
+        db.execute('UPDATE articles SET category_id = ? WHERE id = ?', (category_id, payload['article_id']))
+        update_rankings(db, [payload['article_id']])
+        db.commit()
+        cache.delete('article', payload['article_id'])
+        cache.invalidate('rankings')
+
+
+@job_queue.handler('index_article')
+def index_article_job(db, payload):
+    article = db.execute('SELECT title, content FROM articles WHERE id = ?', (payload['article_id'],)).fetchone()
+    if article is None:
+        return
+    get_similarity_index().add(db, payload['article_id'], article['title'], article['content'])
+    db.commit()
+
+
+def load_home_feeds():
+    """Ana sayfa akışlarını ve kategorileri önbelleğe konabilecek biçimde yükle"""
+    db = get_db()
+    limit = app.config['FEED_PAGE_SIZE']
+    popular_articles, popular_cursor = query_feed(db, 'popular', limit=limit)
+    new_articles, new_cursor = query_feed(db, 'new', limit=limit)
+    categories = db.execute('SELECT * FROM categories LIMIT 10').fetchall()
+    return {
+        'popular_articles': [dict(row) for row in popular_articles],
+        'popular_cursor': popular_cursor,
+        'new_articles': [dict(row) for row in new_articles],
+        'new_cursor': new_cursor,
+        'categories': [dict(row) for row in categories],
+    }
 
 
 @app.route('/')
 def index():
     if 'user_id' in session:
-        db = get_db()
-        
-       
-        popular_articles = db.execute('''
-            SELECT a.*, u.username, u.full_name, c.name as category_name 
-            FROM articles a 
-            JOIN users u ON a.author_id = u.id 
-            LEFT JOIN categories c ON a.category_id = c.id 
-            ORDER BY a.views DESC LIMIT 5
-        ''').fetchall()
-        
-        
-        new_articles = db.execute('''
-            SELECT a.*, u.username, u.full_name, c.name as category_name 
-            FROM articles a 
-            JOIN users u ON a.author_id = u.id 
-            LEFT JOIN categories c ON a.category_id = c.id 
-            ORDER BY a.created_at DESC LIMIT 5
-        ''').fetchall()
-        
-        
-        categories = db.execute('SELECT * FROM categories LIMIT 10').fetchall()
-        
-        return render_template('index.html', 
-                             popular_articles=popular_articles,
-                             new_articles=new_articles,
-                             categories=categories,
-                             user_type=session.get('user_type'))
+        feeds = cache.get_or_set('home', 'feeds', load_home_feeds,
+                                 ttl=app.config['HOME_CACHE_TTL'])
+
+        return render_template('index.html',
+                             user_type=session.get('user_type'),
+                             **feeds)
     
     return render_template('welcome.html')
 
@@ -315,30 +2794,29 @@ def create_article():
         content = request.form['content']
         category_id = request.form.get('category_id')
         tags = request.form.get('tags', '')
-        
-       
-        summary = ai_assistant.generate_summary(content)
-        
-       
-        suggested_category = None
-        if not category_id or category_id == '':
-            suggested_category = ai_assistant.suggest_category(title, content)
-            
-            if suggested_category:
-                cat = db.execute('SELECT id FROM categories WHERE name LIKE ?', 
-                               (f'%{suggested_category}%',)).fetchone()
-                if cat:
-                    category_id = cat['id']
+        summary_engine = request.form.get('summary_engine')
+        if summary_engine not in SUMMARY_ENGINES:
+            summary_engine = None
         
         cursor = db.cursor()
         cursor.execute('''
-            INSERT INTO articles (title, content, summary, author_id, category_id, tags)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (title, content, summary, session['user_id'], category_id, tags))
+            INSERT INTO articles (title, content, author_id, category_id, tags)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (title, content, session['user_id'], category_id or None, tags))
         
         article_id = cursor.lastrowid
-        db.commit()
+        index_articles_fts(db, [(article_id, title, tags, content)])
+        update_rankings(db, [article_id])
         
+        # Özet, kategori önerisi ve benzerlik vektörü istek dışında hesaplanır
+        job_queue.enqueue(db, 'summarize_article', {'article_id': article_id, 'engine': summary_engine})
+        if not category_id:
+            job_queue.enqueue(db, 'categorize_article', {'article_id': article_id})
+        job_queue.enqueue(db, 'index_article', {'article_id': article_id})
+        db.commit()
+        job_queue.wake()
+        cache.invalidate('home', 'rankings')
+
         flash('Makaleniz başarıyla oluşturuldu!', 'success')
         return redirect(url_for('view_article', article_id=article_id))
     
@@ -349,12 +2827,17 @@ def create_article():
 
 @app.route('/article/<int:article_id>')
 def view_article(article_id):
+    # Anonim okuyucular aynı sayfayı görür; işlenmiş HTML'i önbellekten ver
+    anonymous = 'user_id' not in session and '_flashes' not in session
+    if anonymous:
+        html = cache.get('article', article_id)
+        if html is not None:
+            view_counter.hit(article_id)
+            return html
+
     db = get_db()
     
    
-    db.execute('UPDATE articles SET views = views + 1 WHERE id = ?', (article_id,))
-    
-   
     article = db.execute('''
         SELECT a.*, u.username, u.full_name, u.profile_image, 
                c.name as category_name, c.id as category_id
@@ -368,36 +2851,37 @@ def view_article(article_id):
         flash('Makale bulunamadı.', 'error')
         return redirect(url_for('index'))
     
+    view_counter.hit(article_id)
+    article = dict(article)
+    article['views'] += view_counter.pending(article_id)
     
-    comments = db.execute('''
-        SELECT c.*, u.username, u.full_name, u.profile_image
-        FROM comments c 
-        JOIN users u ON c.user_id = u.id 
-        WHERE c.article_id = ?
-        ORDER BY c.created_at DESC
-    ''', (article_id,)).fetchall()
+    # Yalnızca ilk yorum sayfası; devamı /article/<id>/comments ile parça parça yüklenir
+    comments = first_comment_page(article_id)
     
    
     similar_articles = []
     if article['content']:
-      
-        same_category_articles = db.execute('''
-            SELECT a.*, u.username, u.full_name 
-            FROM articles a 
-            JOIN users u ON a.author_id = u.id 
-            WHERE a.category_id = ? AND a.id != ?
-            LIMIT 10
-        ''', (article['category_id'], article_id)).fetchall()
-        
-        
-        articles_list = [dict(art) for art in same_category_articles]
-        
-       
-        similar_articles = ai_assistant.find_similar_articles(
-            article['content'], 
-            articles_list,
-            top_n=3
-        )
+        matches = [(row['related_id'], row['score']) for row in db.execute('''
+            SELECT related_id, score FROM related_articles WHERE article_id = ? ORDER BY rank LIMIT 3
+        ''', (article_id,))]
+        if not matches:
+            try:
+                with timed_ai('similar'):
+                    matches = get_similarity_index().most_similar(db, article_id, top_n=3)
+            except Exception:
+                app.logger.exception('Benzer makaleler hesaplanamadı: %s', article_id)
+                matches = []
+        if matches:
+            placeholders = ','.join('?' * len(matches))
+            rows = db.execute(f'''
+                SELECT a.*, u.username, u.full_name 
+                FROM articles a 
+                JOIN users u ON a.author_id = u.id 
+                WHERE a.id IN ({placeholders})
+            ''', [similar_id for similar_id, _ in matches]).fetchall()
+            by_id = {row['id']: dict(row) for row in rows}
+            similar_articles = [{'article': by_id[similar_id], 'similarity_score': score}
+                                for similar_id, score in matches if similar_id in by_id]
     
    
     user_liked = False
@@ -405,51 +2889,203 @@ def view_article(article_id):
         like = db.execute('SELECT id FROM likes WHERE article_id = ? AND user_id = ?', 
                          (article_id, session['user_id'])).fetchone()
         user_liked = like is not None
-    
-    db.commit()
-    return render_template('view_article.html', 
-                         article=article, 
-                         comments=comments,
-                         similar_articles=similar_articles,
-                         user_liked=user_liked)
 
+    # Görüntülenme sayısı doğrulayıcıya girmez; girseydi her ziyaret sayfayı değiştirirdi
+    if not anonymous:
+        try:
+            created_at = datetime.strptime(article['created_at'], '%Y-%m-%d %H:%M:%S')
+        except (TypeError, ValueError):
+            created_at = None
+        inputs = [{k: v for k, v in article.items() if k != 'views'}, comments, similar_articles]
+        response = not_modified(session['user_id'], user_liked, json.dumps(inputs, default=str, sort_keys=True),
+                                last_modified=created_at)
+        if response is not None:
+            return response
 
-@app.route('/articles')
-def articles():
-    category_id = request.args.get('category_id')
-    search = request.args.get('search', '')
-    
-    db = get_db()
-    query = '''
-        SELECT a.*, u.username, u.full_name, c.name as category_name 
+    html = render_template('view_article.html', 
+                         article=article, 
+                         comments=comments['comments'],
+                         comments_cursor=comments['next_cursor'],
+                         similar_articles=similar_articles,
+                         user_liked=user_liked)
+    if anonymous:
+        cache.set('article', article_id, html, ttl=app.config['ARTICLE_CACHE_TTL'])
+    return html
+
+
+def query_articles(db, category_id=None, search='', cursor=None, limit=20):
+    """Makale listesini kategoriye ve tam metin aramasına göre sayfa sayfa getir"""
+    terms = search_terms(search) if search else []
+    query = f'''
+        SELECT {ARTICLE_LIST_COLUMNS}, u.username, u.full_name, c.name as category_name 
+    '''
+    if terms:
+        query += f', a.content, {SEARCH_RANK} AS rank'
+    query += '''
         FROM articles a 
         JOIN users u ON a.author_id = u.id 
         LEFT JOIN categories c ON a.category_id = c.id 
-        WHERE 1=1
     '''
     params = []
     
+    if terms:
+        query += ' JOIN articles_fts ON articles_fts.rowid = a.id'
+    query += ' WHERE 1=1'
+    
     if category_id and category_id != 'all':
         query += ' AND a.category_id = ?'
         params.append(category_id)
     
-    if search:
-        query += ' AND (a.title LIKE ? OR a.content LIKE ? OR a.tags LIKE ?)'
-        search_term = f'%{search}%'
-        params.extend([search_term, search_term, search_term])
+    if not terms:
+        return paginate(db, query, params, NEWEST_FIRST, cursor, limit)
     
-    query += ' ORDER BY a.created_at DESC'
+    query += ' AND articles_fts MATCH ?'
+    params.append(fts_query(terms))
+    rows, next_cursor = paginate(db, query, params, [(SEARCH_RANK, 'rank'), ('a.id', 'id')],
+                                 cursor, limit, descending=False)
+    
+    length = app.config['SEARCH_SNIPPET_LENGTH']
+    results = []
+    for row in rows:
+        article = dict(row)
+        article['snippet'] = make_snippet(article.pop('content'), terms, length)
+        results.append(article)
+    return results, next_cursor
+
+
+def query_feed(db, name, cursor=None, limit=5):
+    """Ana sayfa akışlarından birini ('popular' veya 'new') sayfa sayfa getir
+
+    Popüler akış article_rankings tablosundaki önceden hesaplanmış puanlardan okunur.
+    """
+    if name == 'popular':
+        query = f'''
+            SELECT {ARTICLE_LIST_COLUMNS}, u.username, u.full_name, c.name as category_name, r.score 
+            FROM article_rankings r 
+            JOIN articles a ON a.id = r.article_id 
+            JOIN users u ON a.author_id = u.id 
+            LEFT JOIN categories c ON a.category_id = c.id 
+            WHERE 1=1
+        '''
+        return paginate(db, query, [], FEED_KEYS[name], cursor, limit)
+    query = f'''
+        SELECT {ARTICLE_LIST_COLUMNS}, u.username, u.full_name, c.name as category_name 
+        FROM articles a 
+        JOIN users u ON a.author_id = u.id 
+        LEFT JOIN categories c ON a.category_id = c.id 
+        WHERE 1=1
+    '''
+    return paginate(db, query, [], FEED_KEYS[name], cursor, limit)
+
+
+def query_comments(db, article_id, cursor=None, limit=20):
+    """Makalenin yorumlarını yeniden eskiye sayfa sayfa getir"""
+    query = '''
+        SELECT c.id, c.content, c.created_at, c.user_id, u.username, u.full_name, u.profile_image
+        FROM comments c 
+        JOIN users u ON c.user_id = u.id 
+        WHERE c.article_id = ?
+    '''
+    return paginate(db, query, [article_id], COMMENTS_NEWEST_FIRST, cursor, limit)
+
+
+def load_comment_page(article_id, cursor=None, limit=None):
+    comments, next_cursor = query_comments(get_db(), article_id, cursor, limit or app.config['COMMENT_PAGE_SIZE'])
+    return {'comments': [dict(comment) for comment in comments], 'next_cursor': next_cursor}
+
+
+def first_comment_page(article_id):
+    """İlk yorum sayfası; kısa süreli önbellekten, add_comment'ta geçersiz kılınır"""
+    return cache.get_or_set('comments', article_id, lambda: load_comment_page(article_id),
+                            ttl=app.config['COMMENT_CACHE_TTL'])
+
+
+def query_profile_articles(db, user_id, cursor=None, limit=20):
+    """Yazarın makalelerini yeniden eskiye sayfa sayfa getir"""
+    query = f'''
+        SELECT {ARTICLE_LIST_COLUMNS}, c.name as category_name 
+        FROM articles a 
+        LEFT JOIN categories c ON a.category_id = c.id 
+        WHERE a.author_id = ?
+    '''
+    return paginate(db, query, [user_id], NEWEST_FIRST, cursor, limit)
+
+
+@app.route('/articles')
+def articles():
+    category_id = request.args.get('category_id')
+    search = request.args.get('search', '')
     
-    articles_list = db.execute(query, params).fetchall()
+    db = get_db()
+    articles_list, next_cursor = query_articles(db, category_id, search,
+                                                request.args.get('cursor'), page_limit())
     categories = db.execute('SELECT * FROM categories ORDER BY name').fetchall()
     
     return render_template('articles.html', 
                          articles=articles_list,
+                         next_cursor=next_cursor,
                          categories=categories,
                          selected_category=category_id,
                          search=search)
 
 
+@app.route('/api/articles')
+def api_articles():
+    articles_list, next_cursor = query_articles(get_db(),
+                                                request.args.get('category_id'),
+                                                request.args.get('search', ''),
+                                                request.args.get('cursor'),
+                                                page_limit())
+    return jsonify({'articles': [dict(article) for article in articles_list], 'next_cursor': next_cursor})
+
+
+@app.route('/api/feed/<name>')
+def api_feed(name):
+    if 'user_id' not in session:
+        return jsonify({'error': 'Yetkisiz erişim'}), 401
+    if name not in FEED_KEYS:
+        return jsonify({'error': 'Akış bulunamadı'}), 404
+    
+    feed, next_cursor = query_feed(get_db(), name, request.args.get('cursor'),
+                                   page_limit(app.config['FEED_PAGE_SIZE']))
+    return jsonify({'articles': [dict(article) for article in feed], 'next_cursor': next_cursor})
+
+
+COMMENT_THREAD_HTML = '''{% for comment in comments %}
+<div class="comment">
+    <div class="comment-header">
+        <a href="{{ url_for('profile', username=comment.username) }}">{{ comment.full_name or comment.username }}</a>
+        <span class="comment-date">{{ comment.created_at }}</span>
+    </div>
+    <p>{{ comment.content }}</p>
+</div>
+{% endfor %}
+{% if next_cursor %}
+<a class="load-more-comments" href="{{ url_for('article_comments', article_id=article_id, cursor=next_cursor, format='html') }}">Daha fazla yorum</a>
+{% endif %}'''
+COMMENT_THREAD_TEMPLATE = app.jinja_env.from_string(COMMENT_THREAD_HTML)
+
+
+@app.route('/article/<int:article_id>/comments')
+def article_comments(article_id):
+    """Yorum sayfası: JSON ya da format=html (veya Accept: text/html) ile HTML parçası"""
+    cursor = request.args.get('cursor')
+    limit = page_limit(app.config['COMMENT_PAGE_SIZE'])
+    if cursor or limit != app.config['COMMENT_PAGE_SIZE']:
+        page = load_comment_page(article_id, cursor, limit)
+    else:
+        page = first_comment_page(article_id)
+    
+    if request.args.get('format') == 'html' or request.accept_mimetypes.best_match(
+            ['application/json', 'text/html']) == 'text/html':
+        response = Response(COMMENT_THREAD_TEMPLATE.render(article_id=article_id, **page), mimetype='text/html')
+    else:
+        response = jsonify(page)
+    # Aynı URL Accept'e göre JSON ya da HTML döndürdüğü için (public) önbellekler ayrı saklamalı
+    response.vary.add('Accept')
+    return response
+
+
 @app.route('/article/<int:article_id>/comment', methods=['POST'])
 def add_comment(article_id):
     if 'user_id' not in session:
@@ -465,7 +3101,11 @@ def add_comment(article_id):
         VALUES (?, ?, ?)
     ''', (article_id, session['user_id'], content.strip()))
     db.commit()
-    
+    cache.delete('article', article_id)
+    cache.delete('comments', article_id)
+    # Ana sayfa ve kategori listeleri comment_count gösterir
+    cache.invalidate('home', 'rankings')
+
     return jsonify({'success': True})
 
 
@@ -475,27 +3115,28 @@ def toggle_like(article_id):
         return jsonify({'error': 'Lütfen önce giriş yapın.'}), 401
     
     db = get_db()
+    params = (article_id, session['user_id'])
     
-    existing_like = db.execute('SELECT id FROM likes WHERE article_id = ? AND user_id = ?', 
-                              (article_id, session['user_id'])).fetchone()
-    
-    if existing_like:
-        
-        db.execute('DELETE FROM likes WHERE id = ?', (existing_like['id'],))
-        db.execute('UPDATE articles SET likes = likes - 1 WHERE id = ?', (article_id,))
-        liked = False
-    else:
-        
-        db.execute('INSERT INTO likes (article_id, user_id) VALUES (?, ?)', 
-                  (article_id, session['user_id']))
-        db.execute('UPDATE articles SET likes = likes + 1 WHERE id = ?', (article_id,))
-        liked = True
+    # Beğeni varsa silinir, yoksa eklenir. İlk ifade yazma kilidini alır, yani eşzamanlı
+    # tıklamalar sıraya girer. Yeni sayaç, sayacı güncelleyen UPDATE ... RETURNING'den döner.
+    liked = db.execute('DELETE FROM likes WHERE article_id = ? AND user_id = ? RETURNING id', params).fetchone() is None
+    delta = -1
+    if liked:
+        delta = 0 if db.execute('''
+            INSERT INTO likes (article_id, user_id) VALUES (?, ?)
+            ON CONFLICT (article_id, user_id) DO NOTHING RETURNING id
+        ''', params).fetchone() is None else 1
+    article = db.execute('UPDATE articles SET likes = coalesce(likes, 0) + ? WHERE id = ? RETURNING likes',
+                         (delta, article_id)).fetchone()
+    if article is None:
+        db.rollback()
+        return jsonify({'error': 'Makale bulunamadı.'}), 404
     
+    update_rankings(db, [article_id])
     db.commit()
-    
-   
-    article = db.execute('SELECT likes FROM articles WHERE id = ?', (article_id,)).fetchone()
-    
+    cache.delete('article', article_id)
+    cache.invalidate('home', 'rankings')
+
     return jsonify({'liked': liked, 'likes_count': article['likes']})
 
 
@@ -510,15 +3151,20 @@ def profile(username):
         return redirect(url_for('index'))
     
    
-    articles = db.execute('''
-        SELECT a.*, c.name as category_name 
-        FROM articles a 
-        LEFT JOIN categories c ON a.category_id = c.id 
-        WHERE a.author_id = ? 
-        ORDER BY a.created_at DESC
-    ''', (user['id'],)).fetchall()
+    articles, next_cursor = query_profile_articles(db, user['id'], request.args.get('cursor'), page_limit())
+    
+    return render_template('profile.html', user=user, articles=articles, next_cursor=next_cursor)
+
+
+@app.route('/api/profile/<username>/articles')
+def api_profile_articles(username):
+    db = get_db()
+    user = db.execute('SELECT id FROM users WHERE username = ?', (username,)).fetchone()
+    if not user:
+        return jsonify({'error': 'Kullanıcı bulunamadı.'}), 404
     
-    return render_template('profile.html', user=user, articles=articles)
+    articles, next_cursor = query_profile_articles(db, user['id'], request.args.get('cursor'), page_limit())
+    return jsonify({'articles': [dict(article) for article in articles], 'next_cursor': next_cursor})
 
 
 @app.route('/api/summarize', methods=['POST'])
@@ -526,14 +3172,41 @@ def api_summarize():
     if 'user_id' not in session:
         return jsonify({'error': 'Yetkisiz erişim'}), 401
     
-    data = request.get_json()
-    text = data.get('text', '')
+    # text/plain gövde parça parça okunur; uzun metinler belleğe tümüyle alınmaz
+    if request.mimetype == 'text/plain':
+        engine = request.args.get('engine')
+        chunks = iter_request_text(app.config['SUMMARY_STREAM_CHUNK'])
+    else:
+        data = request.get_json()
+        text = data.get('text', '')
+        if not text:
+            return jsonify({'error': 'Metin gerekli'}), 400
+        engine = data.get('engine') or request.args.get('engine')
+        chunks = None
     
-    if not text:
-        return jsonify({'error': 'Metin gerekli'}), 400
+    if engine is not None and engine not in SUMMARY_ENGINES:
+        return jsonify({'error': f"Geçersiz özet motoru. Seçenekler: {', '.join(SUMMARY_ENGINES)}"}), 400
     
-    summary = ai_assistant.generate_summary(text)
-    return jsonify({'summary': summary})
+    # Akışla gelen metin önbelleğe alınmaz; JSON metni içerik özetiyle önbelleklenir
+    if chunks is None:
+        summary = ai_assistant.generate_summary(text, engine=engine, db=get_db())
+    else:
+        with timed_ai('summary_stream'):
+            summary = ai_assistant.summarize_stream(chunks, engine=engine)
+    if not summary:
+        return jsonify({'error': 'Metin gerekli'}), 400
+    return jsonify({'summary': summary, 'engine': engine or app.config['SUMMARY_ENGINE']})
+
+
+def iter_request_text(chunk_size):
+    """İstek gövdesini karakter kümesine göre çözerek parça parça üret"""
+    decoder = codecs.getincrementaldecoder(request.mimetype_params.get('charset', 'utf-8'))(errors='replace')
+    while True:
+        data = request.stream.read(chunk_size)
+        if not data:
+            break
+        yield decoder.decode(data)
+    yield decoder.decode(b'', final=True)
 
 
 @app.route('/api/suggest_category', methods=['POST'])
@@ -548,40 +3221,133 @@ def api_suggest_category():
     if not title and not content:
         return jsonify({'error': 'Başlık veya içerik gerekli'}), 400
     
-    suggested = ai_assistant.suggest_category(title, content)
-    
     db = get_db()
-    categories = db.execute('SELECT * FROM categories WHERE name LIKE ?', 
-                           (f'%{suggested}%',)).fetchall()
+    category_id, confidence = ai_assistant.predict_category(title, content, db)
+    
+    category = db.execute('SELECT * FROM categories WHERE id = ?', (category_id,)).fetchone()
     
-    if categories:
+    if category:
         return jsonify({
-            'suggested_category': suggested,
-            'categories': [dict(cat) for cat in categories]
+            'suggested_category': category['name'],
+            'category_id': category['id'],
+            'confidence': confidence,
+            'categories': [dict(category)]
         })
     else:
-        return jsonify({'suggested_category': suggested})
+        return jsonify({'suggested_category': 'Diğer', 'category_id': None, 'confidence': confidence})
 
 
-@app.route('/category/<int:category_id>/top')
-def top_articles_by_category(category_id):
-    db = get_db()
+def read_batch():
+    """Toplu API isteğinin gövdesini boyut sınırlarıyla oku: (veri, hata yanıtı)
+
+    Tek bir büyük istek işçiyi uzun süre meşgul etmesin diye gövde boyutu ve
+    belge sayısı AI_BATCH_MAX_BYTES ve AI_BATCH_MAX_DOCUMENTS ile sınırlıdır.
+    """
+    max_bytes = app.config['AI_BATCH_MAX_BYTES']
+    max_documents = app.config['AI_BATCH_MAX_DOCUMENTS']
+    if request.content_length is None or request.content_length > max_bytes:
+        return None, (jsonify({'error': f'İstek gövdesi en fazla {max_bytes} bayt olabilir.'}), 413)
+    data = request.get_json(silent=True)
+    documents = data.get('documents') if isinstance(data, dict) else None
+    if not isinstance(documents, list) or not documents:
+        return None, (jsonify({'error': 'Belge listesi (documents) gerekli'}), 400)
+    if len(documents) > max_documents:
+        return None, (jsonify({'error': f'Bir istekte en fazla {max_documents} belge gönderilebilir.'}), 413)
+    return data, None
+
+
+def batch_response(data, count, process, **extra):
+    """process(sıralar) sonuç listesini JSON ya da istenirse NDJSON akışı olarak döndür
+
+    NDJSON modunda (stream: true ya da Accept: application/x-ndjson) belgeler
+    AI_BATCH_STREAM_GROUP'luk gruplar halinde işlenir ve her grubun sonuçları
+    hazır olur olmaz gönderilir.
+    """
+    ndjson = data.get('stream') or request.accept_mimetypes.best_match(
+        ['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+    if not ndjson:
+        return jsonify(results=process(list(range(count))), **extra)
+
+    def generate():
+        for indices in chunked(range(count), app.config['AI_BATCH_STREAM_GROUP']):
+            for result in process(indices):
+                yield json.dumps(result, ensure_ascii=False) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/api/summarize/batch', methods=['POST'])
+def api_summarize_batch():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Yetkisiz erişim'}), 401
     
-   
+    data, error = read_batch()
+    if error:
+        return error
+    texts = data['documents']
+    if not all(isinstance(text, str) for text in texts):
+        return jsonify({'error': 'Belgeler metin olmalı'}), 400
+    engine = data.get('engine') or request.args.get('engine')
+    if engine is not None and engine not in SUMMARY_ENGINES:
+        return jsonify({'error': f"Geçersiz özet motoru. Seçenekler: {', '.join(SUMMARY_ENGINES)}"}), 400
+    
+    def process(indices):
+        summaries = ai_assistant.generate_summaries([texts[i] for i in indices], engine=engine, db=get_db())
+        return [{'index': i, 'summary': summary} for i, summary in zip(indices, summaries)]
+    
+    return batch_response(data, len(texts), process, engine=engine or app.config['SUMMARY_ENGINE'])
+
+
+@app.route('/api/suggest_category/batch', methods=['POST'])
+def api_suggest_category_batch():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Yetkisiz erişim'}), 401
+    
+    data, error = read_batch()
+    if error:
+        return error
+    documents = data['documents']
+    if not all(isinstance(document, dict) for document in documents):
+        return jsonify({'error': 'Belgeler title ve content alanlı nesneler olmalı'}), 400
+    items = [(str(document.get('title') or ''), str(document.get('content') or '')) for document in documents]
+    
+    def process(indices):
+        db = get_db()
+        names = ai_assistant.keyword_engine(db).names
+        results = ai_assistant.predict_categories([items[i] for i in indices], db)
+        return [{'index': i, 'category_id': category_id, 'suggested_category': names.get(category_id, 'Diğer'),
+                 'confidence': confidence}
+                for i, (category_id, confidence) in zip(indices, results)]
+    
+    return batch_response(data, len(items), process)
+
+
+def load_top_articles(category_id):
+    """Kategoriyi ve en yüksek puanlı 10 makalesini önbelleğe konabilecek biçimde yükle"""
+    db = get_db()
     category = db.execute('SELECT * FROM categories WHERE id = ?', (category_id,)).fetchone()
     if not category:
-        flash('Kategori bulunamadı.', 'error')
-        return redirect(url_for('articles'))
-    
-   
+        return None
     articles = db.execute('''
-        SELECT a.*, u.username, u.full_name 
-        FROM articles a 
+        SELECT a.*, u.username, u.full_name, r.score 
+        FROM article_rankings r 
+        JOIN articles a ON a.id = r.article_id 
         JOIN users u ON a.author_id = u.id 
-        WHERE a.category_id = ?
-        ORDER BY (a.likes * 0.3 + a.views * 0.7) DESC
+        WHERE r.category_id = ?
+        ORDER BY r.score DESC
         LIMIT 10
     ''', (category_id,)).fetchall()
+    return dict(category), [dict(row) for row in articles]
+
+
+@app.route('/category/<int:category_id>/top')
+def top_articles_by_category(category_id):
+    top = cache.get_or_set('rankings', category_id, lambda: load_top_articles(category_id),
+                           ttl=app.config['CATEGORY_CACHE_TTL'])
+    if not top:
+        flash('Kategori bulunamadı.', 'error')
+        return redirect(url_for('articles'))
+    category, articles = top
     
     
     best_article = None
@@ -597,10 +3363,912 @@ def top_articles_by_category(category_id):
                          best_article=best_article)
 
 
-import os
+@app.route('/api/cache/stats')
+def cache_stats():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Lütfen önce giriş yapın.'}), 401
+    return jsonify(dict(cache.stats(), ai_memo=ai_assistant.memo.stats()))
+
+
+@app.route('/api/jobs/stats')
+def job_stats():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Lütfen önce giriş yapın.'}), 401
+    return jsonify(job_queue.stats(get_db()))
+
+
+def prometheus_gauges(prefix, stats, labels=(), values=()):
+    """Sayısal istatistikleri prefix_<ad> gösterge satırlarına çevir"""
+    return [f'{prefix}_{name}{prometheus_labels(labels, values)} {float(value):g}'
+            for name, value in stats.items() if isinstance(value, (int, float))]
+
+
+def render_metrics():
+    """Histogramları ve önbellek/görüntülenme sayaçlarını Prometheus metin biçiminde döndür"""
+    lines = []
+    for histogram in METRIC_HISTOGRAMS:
+        lines.extend(histogram.render())
+    lines.extend(prometheus_gauges('verbum_cache', cache.stats()))
+    memo = ai_assistant.memo.stats() if ai_assistant.memo is not None else {'kinds': {}}
+    lines.extend(prometheus_gauges('verbum_ai_memo', memo))
+    for kind, counts in sorted(memo['kinds'].items()):
+        lines.extend(prometheus_gauges('verbum_ai_memo', counts, ('kind',), (kind,)))
+    lines.extend(prometheus_gauges('verbum_view_counter', view_counter.stats()))
+    return '\n'.join(lines) + '\n'
+
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus kazıyıcıları için ölçümler; METRICS_ENABLED kapalıysa 404"""
+    if not app.config['METRICS_ENABLED']:
+        return jsonify({'error': 'Ölçümler kapalı'}), 404
+    return Response(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+PLAN_SMALL_TABLES = {'categories'}
+PLAN_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?$')
+TABLE_ALIAS_RE = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)'
+                            r'(?:\s+(?:AS\s+)?(?!(?:ON|WHERE|JOIN|LEFT|INNER|ORDER|GROUP|LIMIT)\b)(\w+))?',
+                            re.IGNORECASE)
+
+
+def explain_full_scans(db, sql):
+    """Sorgu planında indeks kullanılmadan taranan tabloların plan satırlarını döndür"""
+    aliases = {}
+    for table, alias in TABLE_ALIAS_RE.findall(sql):
+        aliases[alias or table] = table
+    scans = []
+    for row in db.execute('EXPLAIN QUERY PLAN ' + sql):
+        match = PLAN_SCAN_RE.match(row[3])
+        if match and aliases.get(match.group(1), match.group(1)) not in PLAN_SMALL_TABLES:
+            scans.append(row[3])
+    return scans
+
+
+def check_query_plans():
+    """Tüm rotaları geçici bir veritabanında çalıştırıp yürütülen her sorgunun planını denetle
+
+    (sorgu, tam tarama satırları) listesi döndürür; boş liste regresyon olmadığını gösterir.
+    Bilinçli tam taramalar sorgu metnindeki FULL_SCAN_OK işaretiyle muaf tutulur.
+    """
+    saved = {key: app.config.get(key) for key in ('DATABASE', 'SQL_TRACE', 'TESTING')}
+    directory = tempfile.mkdtemp()
+    app.config.update(DATABASE=os.path.join(directory, 'plans.db'), SQL_TRACE=None, TESTING=True)
+    statements = []
+    cache.clear()
+    ai_assistant.memo.clear()
+    try:
+        init_db()
+        db = connect_db()
+        cursor = db.cursor()
+        cursor.execute("INSERT INTO users (username, email, password, user_type) VALUES ('plan', 'plan@example.com', '-', 'yazar')")
+        author_id = cursor.lastrowid
+        cursor.executemany('INSERT INTO articles (title, content, summary, author_id, category_id, tags) VALUES (?, ?, ?, ?, ?, ?)',
+                           [(f'Deneme {i}', 'Uzay gemisi ve robotlar üzerine bir hikaye. ' * 5, 'Özet', author_id, 1 + i % 3, 'uzay')
+                            for i in range(6)])
+        index_articles_fts(db)
+        cursor.execute('INSERT INTO comments (article_id, user_id, content) VALUES (1, ?, ?)', (author_id, 'Güzel yazı'))
+        cursor.execute('INSERT INTO likes (article_id, user_id) VALUES (2, ?)', (author_id,))
+        db.commit()
+        
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess.update(user_id=author_id, username='plan', user_type='yazar', full_name='')
+        
+        app.config['SQL_TRACE'] = statements.append
+        requests_to_run = [
+            ('get', '/', {}),
+            ('get', '/articles', {}),
+            ('get', '/articles?category_id=1', {}),
+            ('get', '/articles?search=uzay', {}),
+            ('get', '/article/1', {}),
+            ('post', '/article/1/comment', {'data': {'content': 'Çok beğendim'}}),
+            ('post', '/article/2/like', {}),
+            ('post', '/article/2/like', {}),
+            ('get', '/profile/plan', {}),
+            ('get', '/category/1/top', {}),
+            ('get', '/article/create', {}),
+            ('post', '/article/create', {'data': {'title': 'Yeni', 'content': 'Robotlar. Uzay.', 'tags': ''}}),
+            ('get', '/api/jobs/stats', {}),
+            ('post', '/api/summarize', {'json': {'text': 'Bir. İki. Üç. Dört.'}}),
+            ('post', '/api/suggest_category', {'json': {'title': 'Uzay', 'content': 'robot'}}),
+            ('post', '/api/summarize/batch', {'json': {'documents': ['Bir. İki. Üç. Dört.', 'Beş.']}}),
+            ('post', '/api/suggest_category/batch', {'json': {'documents': [{'title': 'Uzay', 'content': 'robot'}]}}),
+            ('post', '/login', {'data': {'username': 'plan', 'password': 'yanlış'}}),
+        ]
+        for url in ('/api/articles', '/api/articles?category_id=1', '/api/articles?search=uzay',
+                    '/api/profile/plan/articles', '/api/feed/popular', '/api/feed/new', '/article/1/comments'):
+            separator = '&' if '?' in url else '?'
+            next_cursor = client.get(f'{url}{separator}limit=1').get_json()['next_cursor']
+            requests_to_run.append(('get', f'{url}{separator}limit=1&cursor={next_cursor}', {}))
+        errors = []
+        for method, url, kwargs in requests_to_run:
+            try:
+                getattr(client, method)(url, **kwargs)
+            except Exception as e:
+                errors.append((f'{method.upper()} {url}', [repr(e)]))
+        app.config['SQL_TRACE'] = None
+        
+        failures = []
+        for sql in dict.fromkeys(statements):
+            words = sql.split(None, 1)
+            if not words or words[0].upper() not in ('SELECT', 'UPDATE', 'DELETE', 'INSERT', 'WITH'):
+                continue
+            if FULL_SCAN_OK in sql:
+                continue
+            scans = explain_full_scans(db, sql)
+            if scans:
+                failures.append((sql, scans))
+        db.close()
+        return errors + failures
+    finally:
+        view_counter.flush()
+        cache.clear()
+        ai_assistant.memo.clear()
+        close_pool(os.path.join(directory, 'plans.db'))
+        app.config.update(saved)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    """Rotaların çalıştırdığı sorgularda tam tablo taraması olmadığını doğrula"""
+    failures = check_query_plans()
+    for sql, scans in failures:
+        click.echo(' '.join(sql.split()))
+        for scan in scans:
+            click.echo(f'    -> {scan}')
+    if failures:
+        raise click.ClickException(f'{len(failures)} sorgu tam tablo taraması yapıyor.')
+    click.echo('Tüm sorgu planları indeks kullanıyor.')
+
+
+@app.cli.command('refresh-rankings')
+def refresh_rankings_command():
+    """Genel ve kategori bazlı sıralama puanlarını yeniden hesapla"""
+    refresh_rankings_job()
+    click.echo('Sıralama tablosu güncellendi.')
+
+
+@app.cli.command('reconcile-likes')
+def reconcile_likes_command():
+    """articles.likes sayaçlarını likes tablosundan yeniden say ve kaymaları düzelt"""
+    click.echo(f'{reconcile_likes_job()} makalenin beğeni sayacı düzeltildi.')
+
+
+@app.cli.command('index-search')
+def index_search_command():
+    """Tam metin arama indeksinde eksik olan makaleleri indeksle"""
+    click.echo(f'{index_articles_fts_job()} makale tam metin indeksine eklendi.')
+
+
+@app.cli.command('backfill-vectors')
+def backfill_vectors_command():
+    """Vektörü olmayan makalelerin benzerlik vektörlerini hesapla"""
+    click.echo(f'{backfill_vectors_job()} makalenin benzerlik vektörü hesaplandı.')
+
+
+@app.cli.command('compute-related')
+@click.argument('article_ids', nargs=-1, type=int)
+@click.option('--top-n', type=int, help='Makale başına komşu sayısı (RELATED_TOP_N).')
+@click.option('--workers', type=int, help='Süreç sayısı (varsayılan: RELATED_WORKERS ya da CPU sayısı).')
+def compute_related_command(article_ids, top_n, workers):
+    """Benzer makale listelerini (verilmezse tüm katalog için) önceden hesapla"""
+    with get_pool().connection() as db:
+        stats = compute_related(db, article_ids or None,
+                                top_n=top_n or app.config['RELATED_TOP_N'],
+                                min_score=app.config['RELATED_MIN_SCORE'],
+                                workers=workers or app.config['RELATED_WORKERS'],
+                                block_memory=app.config['RELATED_BLOCK_MEMORY'])
+    click.echo(f"{stats['articles']} makale / {stats['corpus']} korpus, {stats['blocks']} blok, "
+               f"{stats['workers']} süreç: {stats['seconds']:.1f} sn, "
+               f"{stats['articles_per_second']:.0f} makale/sn")
+
+
+@app.cli.command('train-category-model')
+@click.option('--holdout', default=0.1, show_default=True, help='Doğruluk ölçümü için ayrılan pay.')
+def train_category_model_command(holdout):
+    """Kategori sınıflandırıcısını mevcut makalelerle yeniden eğitip CATEGORY_MODEL_PATH'e yaz"""
+    started = time.perf_counter()
+    with get_pool().connection() as db:
+        try:
+            model = train_category_model(db, holdout)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+    model.save(app.config['CATEGORY_MODEL_PATH'])
+    accuracy = f'%{model.accuracy * 100:.1f}' if model.accuracy is not None else 'ölçülmedi'
+    click.echo(f'{model.samples} makale, {len(model.classifier.classes_)} kategori, '
+               f'holdout doğruluğu {accuracy}, {time.perf_counter() - started:.1f} sn '
+               f"-> {app.config['CATEGORY_MODEL_PATH']}")
+    if app.config['CATEGORY_ENGINE'] != 'model':
+        click.echo("Modeli kullanmak için CATEGORY_ENGINE='model' ayarlayın.")
+
+
+@app.cli.command('run-jobs')
+@click.option('--limit', type=int, help='En fazla çalıştırılacak iş sayısı.')
+def run_jobs_command(limit):
+    """Kuyrukta sırası gelmiş arka plan işlerini bu süreçte çalıştır"""
+    done = job_queue.run_pending(limit)
+    with get_pool().connection() as db:
+        depth = job_queue.stats(db)['depth']
+    click.echo(f"{done} iş çalıştırıldı; bekleyen {depth['pending']}, başarısız {depth['failed']}.")
+
+
+IMPORT_FIELDS = ('title', 'content', 'summary', 'category', 'category_id', 'tags', 'author', 'created_at')
+EXPORT_QUERIES = {
+    'articles': '''
+        SELECT a.id, a.title, a.content, a.summary, u.username AS author, c.name AS category,
+               a.category_id, a.tags, a.views, a.likes, a.created_at
+        FROM articles a
+        JOIN users u ON a.author_id = u.id
+        LEFT JOIN categories c ON a.category_id = c.id
+        ORDER BY a.id
+    ''',
+    'comments': '''
+        SELECT c.id, c.article_id, u.username AS user, c.content, c.created_at
+        FROM comments c
+        JOIN users u ON c.user_id = u.id
+        ORDER BY c.id
+    ''',
+    'likes': '''
+        SELECT l.id, l.article_id, u.username AS user, l.created_at
+        FROM likes l
+        JOIN users u ON l.user_id = u.id
+        ORDER BY l.id
+    ''',
+}
+
+
+def chunked(iterable, size):
+    """Yinelenebilir nesneyi en fazla size elemanlı listeler halinde ver"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_import_rows(stream, fmt):
+    """JSONL ya da CSV akışından satırları tek tek oku; bozuk satırlar None olarak döner"""
+    if fmt == 'csv':
+        csv.field_size_limit(sys.maxsize)
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+class CategoryResolver:
+    """Kategori adlarını ve AI önerilerini tek sorguyla yüklenen tablo üzerinden kimliğe çevir"""
+
+    def __init__(self, db):
+        self.categories = [(row['id'], turkish_lower(row['name']))
+                           for row in db.execute('SELECT id, name FROM categories ORDER BY id')]
+        self._ids = {category_id for category_id, _ in self.categories}
+
+    def by_id(self, category_id):
+        try:
+            category_id = int(category_id)
+        except (TypeError, ValueError):
+            return None
+        return category_id if category_id in self._ids else None
+
+    def by_name(self, name):
+        """create_article'daki "name LIKE %öneri%" eşleşmesinin aynısı"""
+        name = turkish_lower(name or '').strip()
+        if not name:
+            return None
+        for category_id, category_name in self.categories:
+            if category_name == name:
+                return category_id
+        for category_id, category_name in self.categories:
+            if name in category_name:
+                return category_id
+        return None
+
+
+def prepare_import_batch(rows, resolver, authors, default_author_id, db=None):
+    """Bir partinin özetlerini ve kategorilerini hesaplayıp INSERT parametrelerini hazırla
+
+    db verilirse kategori motoru ve ai_memo bu bağlantıyla kullanılır.
+    (parametreler, atlanan satır sayısı) döndürür.
+    """
+    valid = []
+    skipped = 0
+    for row in rows:
+        if row is None or row.get('type', 'article') != 'article':
+            skipped += 1
+            continue
+        title = (row.get('title') or '').strip()
+        content = row.get('content') or ''
+        author_id = authors.get(row['author']) if row.get('author') else default_author_id
+        if not title or not content.strip() or author_id is None:
+            skipped += 1
+            continue
+        valid.append((row, title, content, author_id))
+
+    missing_summaries = [content for row, _, content, _ in valid if not row.get('summary')]
+    summaries = iter(ai_assistant.generate_summaries(missing_summaries, db=db) if missing_summaries else [])
+    uncategorized = [(title, content) for row, title, content, _ in valid
+                     if resolver.by_id(row.get('category_id')) is None and resolver.by_name(row.get('category')) is None]
+    suggestions = iter(ai_assistant.classify_categories(uncategorized, db))
+
+    params = []
+    for row, title, content, author_id in valid:
+        summary = row.get('summary') or next(summaries)
+        category_id = resolver.by_id(row.get('category_id'))
+        if category_id is None:
+            category_id = resolver.by_name(row.get('category'))
+        if category_id is None:
+            category_id, _ = next(suggestions)
+        params.append((title, content, summary, author_id, category_id,
+                       row.get('tags') or '', row.get('created_at') or None))
+    return params, skipped
+
+
+def import_articles(db, rows, default_author_id=None, batch_size=500, progress=None):
+    """Makaleleri partiler halinde ekle; türetilmiş veriyi en sonda bir kez yenile
+
+    Her parti kendi işleminde executemany ile yazılır, böylece yarıda kesilen
+    bir içe aktarma onaylanmış partileri korur. Özet ve kategori yalnızca
+    kaynakta eksik olan satırlar için hesaplanır. Benzerlik vektörleri ve
+    sıralama tablosu tüm partiler bittikten sonra güncellenir.
+    """
+    resolver = CategoryResolver(db)
+    authors = {row['username']: row['id']
+               for row in db.execute("SELECT id, username FROM users WHERE user_type = 'yazar'")}
+    first_id = db.execute('SELECT COALESCE(MAX(id), 0) FROM articles').fetchone()[0]
+    stats = {'imported': 0, 'skipped': 0, 'batches': 0}
+
+    for batch in chunked(rows, batch_size):
+        params, skipped = prepare_import_batch(batch, resolver, authors, default_author_id, db)
+        stats['skipped'] += skipped
+        if params:
+            last_id = db.execute('SELECT COALESCE(MAX(id), 0) FROM articles').fetchone()[0]
+            db.executemany('''
+                INSERT INTO articles (title, content, summary, author_id, category_id, tags, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            ''', params)
+            index_articles_fts(db, db.execute('SELECT id, title, tags, content FROM articles WHERE id > ?',
+                                              (last_id,)).fetchall())
+            db.commit()
+        stats['imported'] += len(params)
+        stats['batches'] += 1
+        if progress:
+            progress(stats)
+
+    if stats['imported']:
+        cursor = db.execute('SELECT id, title, content FROM articles WHERE id > ? ORDER BY id', (first_id,))
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            get_similarity_index().store(db, [(row[0], f'{row[1]} {row[2]}') for row in batch])
+        refresh_rankings(db)
+        db.commit()
+        cache.invalidate('home', 'rankings')
+    return stats
+
+
+def export_rows(db, table, batch_size=1000):
+    """Tablonun satırlarını sözlük olarak tek tek üret; bellekte en fazla bir parti tutulur"""
+    cursor = db.execute(EXPORT_QUERIES[table] + FULL_SCAN_OK)
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            return
+        for row in batch:
+            yield dict(row)
+
+
+def write_export(stream, db, tables, fmt):
+    """Tabloları JSONL (satır başına bir kayıt, 'type' alanıyla) ya da CSV olarak yaz"""
+    counts = {}
+    for table in tables:
+        counts[table] = 0
+        writer = None
+        for row in export_rows(db, table):
+            if fmt == 'csv':
+                if writer is None:
+                    writer = csv.DictWriter(stream, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+            else:
+                stream.write(json.dumps({'type': table[:-1], **row}, ensure_ascii=False) + '\n')
+            counts[table] += 1
+    return counts
+
+
+def detect_format(filename, fmt):
+    if fmt:
+        return fmt
+    return 'csv' if filename.lower().endswith('.csv') else 'jsonl'
+
+
+@app.cli.command('import-articles')
+@click.argument('source', type=click.File('r', encoding='utf-8'))
+@click.option('--format', 'fmt', type=click.Choice(['jsonl', 'csv']), help='Varsayılan: dosya uzantısından.')
+@click.option('--author', help='Satırda "author" alanı yoksa kullanılacak yazar kullanıcı adı.')
+@click.option('--batch-size', default=500, show_default=True, help='Her işlemde eklenecek satır sayısı.')
+def import_articles_command(source, fmt, author, batch_size):
+    """JSONL/CSV dosyasından makaleleri toplu olarak içe aktar (- standart girdi)"""
+    with get_pool().connection() as db:
+        default_author_id = None
+        if author:
+            user = db.execute('SELECT id, user_type FROM users WHERE username = ?', (author,)).fetchone()
+            if not user or user['user_type'] != 'yazar':
+                raise click.ClickException(f'Yazar bulunamadı: {author}')
+            default_author_id = user['id']
+        started = time.perf_counter()
+        rows = read_import_rows(source, detect_format(source.name, fmt))
+        stats = import_articles(db, rows, default_author_id, batch_size,
+                                progress=lambda s: click.echo(f"\r{s['imported']} makale eklendi", nl=False, err=True))
+    click.echo('', err=True)
+    click.echo(f"{stats['imported']} makale içe aktarıldı, {stats['skipped']} satır atlandı "
+               f"({stats['batches']} parti, {time.perf_counter() - started:.1f} sn).")
+
+
+@app.cli.command('export-data')
+@click.argument('target', type=click.File('w', encoding='utf-8'))
+@click.option('--format', 'fmt', type=click.Choice(['jsonl', 'csv']), help='Varsayılan: dosya uzantısından.')
+@click.option('--table', 'tables', multiple=True, type=click.Choice(list(EXPORT_QUERIES)),
+              help='Yalnızca verilen tablolar (tekrarlanabilir). Varsayılan: hepsi.')
+def export_data_command(target, fmt, tables):
+    """Makaleleri, yorumları ve beğenileri yedek için akış halinde dışa aktar (- standart çıktı)"""
+    fmt = detect_format(target.name, fmt)
+    tables = tables or tuple(EXPORT_QUERIES)
+    if fmt == 'csv' and len(tables) != 1:
+        raise click.UsageError('CSV çıktısı için tek bir --table seçin.')
+    with get_pool().connection() as db:
+        counts = write_export(target, db, tables, fmt)
+    click.echo(', '.join(f'{count} {table}' for table, count in counts.items()) + ' dışa aktarıldı.', err=True)
+
+
+STYLE_BLOCK_RE = re.compile(r'<style>(.*?)</style>', re.DOTALL)
+RAW_TEXT_RE = re.compile(r'<(pre|textarea|script)\b.*?</\1>', re.DOTALL | re.IGNORECASE)
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+JINJA_TOKEN_RE = re.compile(r'\{\{|\}\}|\{#|#\}|\{%\s*(end)?(\w+)|%\}')
+JINJA_NESTED_TAGS = {'if', 'for', 'with', 'filter', 'call', 'autoescape', 'trans'}
+JINJA_LAYOUT_RE = re.compile(r'\{%-?\s*(?:extends|block|macro|set|import|from|raw)\b|\{%-|-%\}|\{\{-|-\}\}')
+CSS_STRING_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+CSS_PUNCTUATION_RE = re.compile(r'\s*([{};,>])\s*|(:)\s+')
+CSS_PROPERTY_RE = re.compile(r'[{;]\s*-*([\w-]+)\s*:')
+CSS_SELECTOR_TOKEN_RE = re.compile(r'(#[\w-]+)|(\.[\w-]+|\[[^\]]*\]|:(?!:)[\w-]+)|((?:^|(?<=[\s>+~]))[a-zA-Z][\w-]*|::[\w-]+)')
+
+
+def template_sources():
+    """Modüldeki *_html şablon metinlerini {dosya adı: kaynak} olarak döndür"""
+    return {f'{name[:-len("_html")]}.html': value for name, value in globals().items()
+            if name.endswith('_html') and isinstance(value, str)}
+
+
+def minify_css(css):
+    """Yorumları ve gereksiz boşlukları at; tırnak içindeki metinlere dokunma"""
+    parts = CSS_STRING_RE.split(CSS_COMMENT_RE.sub('', css))
+    for i in range(0, len(parts), 2):
+        parts[i] = CSS_PUNCTUATION_RE.sub(lambda m: m.group(1) or m.group(2), ' '.join(parts[i].split()))
+    return ''.join(parts).replace(';}', '}').strip()
+
+
+def minify_html(html):
+    """Satır başı girintilerini ve boş satırları at; <pre>, <textarea> ve <script> içeriğine dokunma"""
+    parts, position = [], 0
+    for match in itertools.chain(RAW_TEXT_RE.finditer(html), [None]):
+        end = match.start() if match else len(html)
+        parts.append(re.sub(r'\n\s+', '\n', re.sub(r'[ \t]+\n', '\n', html[position:end])))
+        if match:
+            parts.append(match.group(0))
+            position = match.end()
+    return ''.join(parts).strip() + '\n'
+
+
+def css_blocks(css):
+    """Küçültülmüş CSS'i üst düzey kurallara (iç içe @media dahil) böl; ayrıştırılamazsa None"""
+    blocks, depth, start = [], 0, 0
+    for i, char in enumerate(css):
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth < 0:
+                return None
+            if depth == 0:
+                blocks.append(css[start:i + 1])
+                start = i + 1
+    return blocks if depth == 0 and not css[start:].strip() else None
+
+
+def css_families(block):
+    """Kuralın tanımladığı özelliklerin aileleri (margin-top → margin, background-color → background)"""
+    return {prop.split('-')[0] for prop in CSS_PROPERTY_RE.findall(block)}
+
+
+def css_specificities(block):
+    """Kuralın seçicilerinin (id, sınıf, öğe) özgüllükleri; @-kuralları ve :not() gibi seçicilerde None"""
+    selectors = block.split('{', 1)[0]
+    if selectors.startswith('@') or '(' in selectors:
+        return None
+    specificities = set()
+    for selector in selectors.split(','):
+        counts = [0, 0, 0]
+        for match in CSS_SELECTOR_TOKEN_RE.finditer(selector.strip()):
+            counts[match.lastindex - 1] += 1
+        specificities.add(tuple(counts))
+    return specificities
+
+
+def css_conflicts(a, b):
+    """İki kuralın sırası sonucu değiştirebilir mi: aynı özellik ailesi ve eşit özgüllük"""
+    if not css_families(a) & css_families(b):
+        return False
+    specificities_a, specificities_b = css_specificities(a), css_specificities(b)
+    return specificities_a is None or specificities_b is None or bool(specificities_a & specificities_b)
+
+
+def extract_shared_css(templates):
+    """Bütün şablonlarda birebir aynı olan CSS kurallarını ortak dosyaya ayır
+
+    templates {ad: [kural, ...]} eşlemesidir. Ortak dosya satır içi stilden önce
+    yüklendiği için taşınan kural, önünden geçtiği kurallardan biriyle eşit
+    özgüllükte aynı özellik ailesini tanımlıyorsa taşınmaz; böylece kaskad
+    sonucu değişmez. (ortak kurallar, {ad: kalan kurallar}) döndürür.
+    """
+    lists = list(templates.values())
+    if len(lists) < 2:
+        return [], templates
+    shared = [block for block in lists[0]
+              if all(blocks.count(block) == 1 for blocks in lists)]
+    changed = True
+    while changed:
+        changed = False
+        for rank, block in enumerate(shared):
+            for blocks in lists:
+                passed = [other for other in blocks[:blocks.index(block)]
+                          if other not in shared or shared.index(other) > rank]
+                if any(css_conflicts(block, other) for other in passed):
+                    shared.remove(block)
+                    changed = True
+                    break
+            if changed:
+                break
+    return shared, {name: [block for block in blocks if block not in shared] for name, blocks in templates.items()}
+
+
+def template_anchors(lines):
+    """Jinja iç içeliğinin dışında kalan, etiket içermeyen ve ifadesi satırda kapanan satırların indeksleri"""
+    anchors, depth, closer = set(), 0, None
+    for i, line in enumerate(lines):
+        outside = depth == 0 and closer is None and '{%' not in line and '{#' not in line
+        for match in JINJA_TOKEN_RE.finditer(line):
+            token = match.group(0)
+            if closer is not None:
+                if token == closer:
+                    closer = None
+            elif token == '{{':
+                closer = '}}'
+            elif token == '{#':
+                closer = '#}'
+            elif token.startswith('{%'):
+                closer = '%}'
+                if match.group(2) in JINJA_NESTED_TAGS:
+                    depth += -1 if match.group(1) else 1
+        if outside and closer is None:
+            anchors.add(i)
+    return anchors
+
+
+def extract_base_template(templates, base_name, min_lines=5):
+    """Şablonların hepsinde aynı sırada geçen satırları {% extends %} ile ortak bir ana şablona ayır
+
+    templates {ad: küçültülmüş kaynak} eşlemesidir. Ortak satırlar yalnızca
+    Jinja if/for gövdelerinin dışındaysa alınır; aralarında kalan farklı
+    bölümler sırayla b1, b2, ... bloklarına dönüşür, böylece işlenen çıktı
+    bayt bayt aynı kalır. {% set %}, makro, blok ya da boşluk denetimi
+    ({%- -%}) kullanan şablonlar kapsam kuralları değişeceği için dışarıda
+    bırakılır. (ana şablon ya da None, {ad: yeni kaynak}) döndürür.
+    """
+    names = [name for name, source in sorted(templates.items()) if not JINJA_LAYOUT_RE.search(source)]
+    if len(names) < 2:
+        return None, {}
+    lines = {name: templates[name].rstrip('\n').split('\n') for name in names}
+    reference = lines[names[0]]
+    common = template_anchors(reference)
+    positions = {names[0]: {i: i for i in common}}
+    for name in names[1:]:
+        anchors = template_anchors(lines[name])
+        matcher = difflib.SequenceMatcher(None, reference, lines[name], autojunk=False)
+        mapping = {a + k: b + k for a, b, size in matcher.get_matching_blocks() for k in range(size)
+                   if b + k in anchors}
+        common &= mapping.keys()
+        positions[name] = mapping
+    common = sorted(common)
+    if len(common) < min_lines:
+        return None, {}
+
+    def holes(name):
+        edges = [-1] + [positions[name][i] for i in common] + [len(lines[name])]
+        return [''.join(line + '\n' for line in lines[name][start + 1:end]) for start, end in zip(edges, edges[1:])]
+
+    filled = {name: holes(name) for name in names}
+    used = [any(filled[name][k] for name in names) for k in range(len(common) + 1)]
+    base = ''.join(('{%% block b%d %%}{%% endblock %%}' % k if used[k] else '') + reference[i] + '\n'
+                   for k, i in enumerate(common))
+    base += '{%% block b%d %%}{%% endblock %%}' % len(common) if used[-1] else ''
+    children = {name: f'{{% extends "{base_name}" %}}' + ''.join('{%% block b%d %%}%s{%% endblock %%}' % (k, hole)
+                                                                 for k, hole in enumerate(filled[name]) if used[k])
+                for name in names}
+    try:
+        for source in [base, *children.values()]:
+            app.jinja_env.parse(source)
+    except TemplateSyntaxError:
+        return None, {}
+    return base, children
+
+
+def build_templates(sources, template_folder=None, static_folder=None, minify=True, shared_css=None,
+                    bytecode_cache=None, base_template=None):
+    """Şablonları diske bir kez yaz; içeriği değişmeyen dosyalara dokunma
+
+    minify açıkken satır içi CSS ve HTML girintileri küçültülür ve tek <style>
+    bloğu olan şablonların hepsinde aynı olan kurallar static_folder altındaki
+    shared_css dosyasına taşınır. base_template verilirse şablonların ortak
+    iskeleti (head, gezinme çubuğu, alt bilgi) bu ada ayrılır ve şablonlar onu
+    {% extends %} ile genişletir. bytecode_cache dizini verilirse şablonlar
+    derlenip Jinja bayt kodu önbelleğine yazılır. {ad: (önceki, sonraki bayt)},
+    ortak CSS ve ana şablon boyutunu içeren bir rapor döndürür.
+    """
+    template_folder = template_folder or os.path.join(app.root_path, app.template_folder)
+    static_folder = static_folder or app.static_folder
+    built = {name: minify_html(source) if minify else source for name, source in sources.items()}
+    styled = {}
+    if minify:
+        for name, source in built.items():
+            styles = STYLE_BLOCK_RE.findall(source)
+            if len(styles) != 1 or '{{' in styles[0] or '{%' in styles[0]:
+                continue
+            blocks = css_blocks(minify_css(styles[0]))
+            if blocks is not None:
+                styled[name] = blocks
+    shared, remaining = extract_shared_css(styled) if shared_css else ([], styled)
+    for name, blocks in remaining.items():
+        link = ''
+        if shared:
+            link = f'''<link rel="stylesheet" href="{{{{ asset_url('{shared_css}') }}}}">\n'''
+        style = f"<style>{''.join(blocks)}</style>" if blocks else ''
+        built[name] = STYLE_BLOCK_RE.sub(lambda m: link + style, built[name], count=1)
+    base = None
+    if minify and base_template:
+        base, children = extract_base_template(built, base_template)
+        built.update(children)
+
+    def write(path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                if f.read() == content:
+                    return
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    for name, content in built.items():
+        write(os.path.join(template_folder, name), content)
+    if base is not None:
+        write(os.path.join(template_folder, base_template), base)
+    if shared:
+        write(os.path.join(static_folder, shared_css), ''.join(shared) + '\n')
+    if bytecode_cache:
+        os.makedirs(bytecode_cache, exist_ok=True)
+        env = app.jinja_env.overlay(loader=FileSystemLoader(template_folder),
+                                    bytecode_cache=FileSystemBytecodeCache(bytecode_cache))
+        for name in [*built, *([base_template] if base is not None else [])]:
+            env.get_template(name)
+    return {
+        'templates': {name: (len(sources[name].encode()), len(content.encode())) for name, content in built.items()},
+        'shared_css': len(''.join(shared).encode()),
+        'shared_rules': len(shared),
+        'base_template': len(base.encode()) if base is not None else 0,
+        'extended': len(children) if base is not None else 0,
+    }
+
+
+# build-templates çalıştırıldıysa şablonlar her işçide yeniden derlenmez, bayt kodundan yüklenir
+if os.path.isdir(app.config['TEMPLATE_BYTECODE_CACHE']):
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(app.config['TEMPLATE_BYTECODE_CACHE'])
+
+
+@app.cli.command('build-templates')
+@click.option('--minify/--no-minify', default=True, show_default=True,
+              help='Satır içi CSS ve HTML girintilerini küçült, ortak kuralları SHARED_CSS dosyasına taşı.')
+def build_templates_command(minify):
+    """Şablonları dağıtım sırasında bir kez üret ve Jinja bayt kodunu önceden derle"""
+    report = build_templates(template_sources(), minify=minify, shared_css=app.config['SHARED_CSS'],
+                             bytecode_cache=app.config['TEMPLATE_BYTECODE_CACHE'],
+                             base_template=app.config['BASE_TEMPLATE'])
+    for name, (before, after) in sorted(report['templates'].items()):
+        click.echo(f'{name}: {before:,} -> {after:,} bayt')
+    if report['shared_rules']:
+        click.echo(f"{app.config['SHARED_CSS']}: {report['shared_rules']} ortak kural, {report['shared_css']:,} bayt")
+    if report['extended']:
+        click.echo(f"{app.config['BASE_TEMPLATE']}: {report['extended']} şablonun ortak iskeleti, "
+                   f"{report['base_template']:,} bayt")
+    click.echo(f"Bayt kodu önbelleği: {app.config['TEMPLATE_BYTECODE_CACHE']}")
+
+
+ASGI_IO_ENDPOINTS = {'index', 'articles', 'api_articles', 'api_feed', 'profile', 'api_profile_articles',
+                     'article_comments', 'add_comment', 'toggle_like'}
+ASGI_AI_ENDPOINTS = {'api_summarize', 'api_suggest_category', 'api_summarize_batch', 'api_suggest_category_batch'}
+ASGI_ARTICLE_ENDPOINTS = {'view_article'}
+
+
+class AsgiApp:
+    """Uygulamayı bir ASGI sunucusunda çalıştıran adaptör (ör. uvicorn x:asgi_app)
+
+    Bağlantılar, istek gövdesinin okunması ve yanıtın yazılması olay
+    döngüsündedir; görünümler uç noktanın türüne göre ayrı iş parçacığı
+    havuzlarında çalışır. sqlite3'ün bloklamayan bir arayüzü yoktur (aiosqlite
+    de her bağlantıyı kendi iş parçacığında çalıştırır), bu yüzden veritabanı
+    ağırlıklı rotalar (ASGI_IO_ENDPOINTS) bağlantı havuzu boyutundaki bir
+    havuzda çalışır. Bağlantı havuzu diğer yürütücüler, iş kuyruğu ve periyodik
+    görevlerle paylaşıldığından bu rotalar da yoğunlukta DB_POOL_TIMEOUT'a
+    kadar bağlantı bekleyebilir; havuz boyutu yalnızca kendi aralarında
+    bekleşmelerini önler. AIAssistant çağıran uç noktalar (ASGI_AI_ENDPOINTS)
+    kendi küçük havuzlarında sıraya girer; yavaş bir özet ya da sınıflandırma
+    okuma ve yazma rotalarını bekletmez. Makale sayfası (ASGI_ARTICLE_ENDPOINTS)
+    önceden hesaplanmış komşusu yoksa benzerlik indeksine düştüğü için ayrı
+    bir havuzda çalışır: bu yavaş yol ne liste rotalarını ne de özet kuyruğunu
+    bekletir. Diğer rotalar ortak havuzu kullanır.
+    """
+
+    def __init__(self, wsgi_app, io_workers=8, ai_workers=2, workers=8, spool_size=1024 * 1024,
+                 article_workers=4):
+        self.wsgi_app = wsgi_app
+        self.spool_size = spool_size
+        self.executors = {
+            'io': concurrent.futures.ThreadPoolExecutor(io_workers, thread_name_prefix='asgi-io'),
+            'ai': concurrent.futures.ThreadPoolExecutor(ai_workers, thread_name_prefix='asgi-ai'),
+            'article': concurrent.futures.ThreadPoolExecutor(article_workers, thread_name_prefix='asgi-article'),
+            'default': concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='asgi'),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            await send({'type': 'websocket.close'})
+            return
+        body = await self.read_body(receive)
+        try:
+            environ = self.environ(scope, body)
+            loop = asyncio.get_running_loop()
+            messages = asyncio.Queue()
+            response = {'status': 500, 'headers': []}
+            done = loop.run_in_executor(self.executor_for(environ), self.run_wsgi, environ, response,
+                                        lambda message: loop.call_soon_threadsafe(messages.put_nowait, message))
+            started = False
+            while True:
+                chunk = await messages.get()
+                if not started:
+                    await send({'type': 'http.response.start', 'status': response['status'],
+                                'headers': response['headers']})
+                    started = True
+                if chunk is None:
+                    break
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+            await done
+        finally:
+            body.close()
+
+    def executor_for(self, environ):
+        try:
+            endpoint, _ = self.wsgi_app.url_map.bind_to_environ(environ).match()
+        except HTTPException:
+            return self.executors['default']
+        if endpoint in ASGI_IO_ENDPOINTS:
+            return self.executors['io']
+        if endpoint in ASGI_AI_ENDPOINTS:
+            return self.executors['ai']
+        if endpoint in ASGI_ARTICLE_ENDPOINTS:
+            return self.executors['article']
+        return self.executors['default']
+
+    def run_wsgi(self, environ, response, put):
+        """WSGI uygulamasını çalıştır; gövde parçalarını put ile olay döngüsüne aktar (None: son)"""
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                   for name, value in headers]
+            return put
+
+        try:
+            body = self.wsgi_app(environ, start_response)
+            try:
+                for chunk in body:
+                    if chunk:
+                        put(chunk)
+            finally:
+                if hasattr(body, 'close'):
+                    body.close()
+        finally:
+            put(None)
+
+    async def read_body(self, receive):
+        """İstek gövdesini spool_size'a kadar bellekte, sonrasında geçici dosyada biriktir"""
+        body = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            body.write(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        body.seek(0)
+        return body
+
+    @staticmethod
+    def environ(scope, body):
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1] or 80),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.input_terminated': True,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                name = f'HTTP_{name}'
+            if name in environ:
+                value = environ[name] + ('; ' if name == 'HTTP_COOKIE' else ',') + value
+            environ[name] = value
+        if 'CONTENT_LENGTH' not in environ:
+            body.seek(0, os.SEEK_END)
+            environ['CONTENT_LENGTH'] = str(body.tell())
+            body.seek(0)
+        return environ
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for executor in self.executors.values():
+                    executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
 
-if not os.path.exists('templates'):
-    os.makedirs('templates')
+asgi_app = AsgiApp(app,
+                   io_workers=app.config['ASGI_IO_WORKERS'] or app.config['DB_POOL_SIZE'],
+                   ai_workers=app.config['ASGI_AI_WORKERS'],
+                   workers=app.config['ASGI_WORKERS'],
+                   spool_size=app.config['ASGI_SPOOL_SIZE'],
+                   article_workers=app.config['ASGI_ARTICLE_WORKERS'])
 
 
 welcome_html = '''<!DOCTYPE html>